@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+import os
 import re
+import subprocess
 import sys
+import threading
 from pathlib import Path
 from typing import TYPE_CHECKING, Iterable, NamedTuple, Optional
 
-from dl_plus import ytdl
+from dl_plus import packagedir, snapshot, ytdl
 from dl_plus.config import (
     ConfigError, ConfigValue, _Config, get_config_home, get_data_home,
 )
@@ -87,6 +90,8 @@ def parse_backends_config(content: str) -> dict[str, Backend]:
 
 _known_backends: dict[str, Backend] | None = None
 
+_KNOWN_BACKENDS_SNAPSHOT_NAME = 'backends'
+
 
 def get_backends_config_path() -> Optional[Path]:
     path = get_config_home() / 'backends.ini'
@@ -99,11 +104,25 @@ def get_known_backends() -> dict[str, Backend]:
     global _known_backends
     if _known_backends is not None:
         return _known_backends
-    _known_backends = parse_backends_config(DEFAULT_BACKENDS_CONFIG)
     config_path = get_backends_config_path()
+    # the snapshot stores the merged backends as tuples of field values,
+    # the stamp is None if there is no backends.ini
+    stamp = snapshot.get_file_stamp(config_path)
+    cached = snapshot.load(_KNOWN_BACKENDS_SNAPSHOT_NAME, stamp)
+    if cached is not None:
+        _known_backends = {
+            alias: Backend(*fields) for alias, fields in cached.items()}
+        return _known_backends
+    known_backends = parse_backends_config(DEFAULT_BACKENDS_CONFIG)
     if config_path:
         with open(config_path) as fobj:
-            _known_backends.update(parse_backends_config(fobj.read()))
+            known_backends.update(parse_backends_config(fobj.read()))
+    snapshot.save(
+        _KNOWN_BACKENDS_SNAPSHOT_NAME, stamp,
+        {alias: tuple(backend) for alias, backend in known_backends.items()},
+        stamps=(stamp,),
+    )
+    _known_backends = known_backends
     return _known_backends
 
 
@@ -143,6 +162,16 @@ def _is_managed(location: Path) -> bool:
         return False
 
 
+# set by bundles (see `dl_plus.bundle`), the backend is imported
+# from the archive and managed backends are never looked up
+_bundle_mode = False
+
+
+def enable_bundle_mode() -> None:
+    global _bundle_mode
+    _bundle_mode = True
+
+
 def get_backends_dir() -> Path:
     return get_data_home() / 'backends'
 
@@ -151,39 +180,117 @@ def get_backend_dir(backend: str) -> Path:
     return get_backends_dir() / _normalize(backend)
 
 
+def split_backend_string(backend_string: str) -> tuple[str, str | None]:
+    """
+    Split 'backend@version' into the backend and the version,
+    the version is `None` if not specified
+    """
+    backend, sep, version = backend_string.partition(
+        packagedir.VERSION_SEPARATOR)
+    if not sep:
+        return backend_string, None
+    if not backend or not version:
+        raise BackendError(f'invalid backend: {backend_string}')
+    return backend, version
+
+
+def _get_backend_version_dir(
+    backend: str, version: str | None,
+) -> Path | None:
+    backend_dir = get_backend_dir(backend)
+    if version is None:
+        return packagedir.get_active_dir(backend_dir)
+    version_dir = packagedir.get_version_dir(backend_dir, version)
+    if not version_dir:
+        raise BackendError(f'{backend} {version} is not installed')
+    return version_dir
+
+
 def parse_backend_string(backend_string: str) -> tuple[bool, Path | None, str]:
+    # backend_dir is the resolved directory of the active version, so that
+    # the running process is not affected by concurrent updates
     # backend_string is one of:
     #   * alias ([section-name] in the backends.ini, e.g., 'yt-dlp');
     #   * 'import_name', e.g., 'youtube_dl';
     #   * 'project-name/import_name', e.g., 'youtube-dl-nightly/youtube_dl'.
+    # any of them can be followed by '@version' to select an installed
+    # version other than the active one, e.g., 'yt-dlp@2024.10.22'.
     # is_alias is only True if [alias] != project-name, e.g.,
     #   * [yt-dlp] with project-name = yt-dlp -> False
     #   * [yt-dlp-noextras] with project-name = yt-dlp -> True
     is_alias: bool
+    backend_string, version = split_backend_string(backend_string)
+    if _bundle_mode:
+        if version is not None:
+            raise BackendError(
+                f'{backend_string} {version} is not bundled')
+        if '/' in backend_string:
+            _, _, import_name = backend_string.partition('/')
+        elif backend := get_known_backend(backend_string):
+            import_name = backend.import_name
+        else:
+            import_name = backend_string
+        return False, None, _normalize(import_name)
     if '/' in backend_string:
         is_alias = False
         project_name, _, import_name = backend_string.partition('/')
-        backend_dir = get_backend_dir(project_name)
-        if not backend_dir.is_dir():
+        backend_dir = _get_backend_version_dir(project_name, version)
+        if not backend_dir:
             raise BackendError(
-                f'{backend_dir} does not exist or is not a directory')
+                f'{get_backend_dir(project_name)} does not exist '
+                f'or is not a directory'
+            )
     elif backend := get_known_backend(backend_string):
         is_alias = (
             _normalize(backend_string) != _normalize(backend.project_name))
         import_name = backend.import_name
-        backend_dir = get_backend_dir(backend_string)
-        if not backend_dir.is_dir():
-            # in case of backends not managed by dl-plus
-            backend_dir = None
+        # None in case of backends not managed by dl-plus
+        backend_dir = _get_backend_version_dir(backend_string, version)
     else:
         is_alias = False
         import_name = backend_string
-        backend_dir = get_backend_dir(backend_string)
-        if not backend_dir.is_dir():
-            backend_dir = None
+        backend_dir = _get_backend_version_dir(backend_string, version)
     return is_alias, backend_dir, _normalize(import_name)
 
 
+_EXTRACTOR_INDEX_SCRIPT = """
+import json, sys
+sys.path.insert(0, sys.argv[1])
+from dl_plus import ytdl
+ytdl.init(sys.argv[2])
+with open(sys.argv[3], 'w') as fobj:
+    json.dump(ytdl.build_extractor_index(), fobj)
+"""
+
+
+def build_extractor_index(backend_dir: Path, import_name: str) -> None:
+    """
+    Prebuild the index of built-in extractors of the backend installed
+    into the directory, see `dl_plus.ytdl.build_extractor_index()`
+
+    The backend is imported in a subprocess. Errors are ignored,
+    the extractors are discovered at runtime if there is no index.
+    The index is not built by frozen executables (e.g., PyInstaller
+    builds), which cannot run Python code passed in arguments.
+    """
+    if getattr(sys, 'frozen', False):
+        return
+    env = dict(os.environ)
+    # make dl_plus importable in the subprocess
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, sys.path))
+    try:
+        subprocess.run(
+            [
+                sys.executable, '-c', _EXTRACTOR_INDEX_SCRIPT,
+                str(backend_dir), _normalize(import_name),
+                str(backend_dir / ytdl.EXTRACTOR_INDEX_FILENAME),
+            ],
+            env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+    except OSError:
+        pass
+
+
 def _init_backend(backend_string: str) -> Path | None:
     is_alias, backend_dir, package_name = parse_backend_string(backend_string)
     if is_alias and not backend_dir:
@@ -195,13 +302,67 @@ def _init_backend(backend_string: str) -> Path | None:
     return backend_dir
 
 
+_AUTODETECT_SNAPSHOT_NAME = 'autodetect'
+
+
+def _get_autodetect_snapshot_key(candidates: tuple[str, ...]) -> tuple:
+    # the backends directory is modified whenever a managed backend version
+    # is activated or removed, sys.path entries are modified whenever
+    # a package is installed into or removed from them
+    return (
+        candidates,
+        snapshot.get_file_stamp(get_backends_dir()),
+        tuple(
+            (entry, snapshot.get_file_stamp(Path(entry)))
+            for entry in sys.path
+        ),
+    )
+
+
+def _init_autodetected_backend(
+    candidate: str, backend_dir: str | None, import_name: str,
+) -> Path | None:
+    if backend_dir:
+        sys.path.insert(0, backend_dir)
+    try:
+        ytdl.init(import_name)
+    except DLPlusException:
+        if backend_dir:
+            sys.path.remove(backend_dir)
+        raise
+    return Path(backend_dir) if backend_dir else None
+
+
+def invalidate_autodetect_cache() -> None:
+    snapshot.invalidate(_AUTODETECT_SNAPSHOT_NAME)
+
+
 def _autodetect_backend() -> tuple[str, Path | None]:
     candidates = tuple(get_known_backends())
-    for candidate in candidates:
+    key = _get_autodetect_snapshot_key(candidates)
+    # the snapshot stores the last detected candidate, its backend
+    # directory and import name, see `_init_autodetected_backend()`
+    cached = snapshot.load(_AUTODETECT_SNAPSHOT_NAME, key)
+    if cached is not None:
         try:
-            return candidate, _init_backend(candidate)
+            return cached[0], _init_autodetected_backend(*cached)
         except DLPlusException:
             pass
+    for candidate in candidates:
+        try:
+            backend_dir = _init_backend(candidate)
+        except DLPlusException:
+            continue
+        snapshot.save(
+            _AUTODETECT_SNAPSHOT_NAME, key,
+            (
+                candidate,
+                str(backend_dir) if backend_dir else None,
+                ytdl.get_ytdl_module_name(),
+            ),
+            stamps=(key[1], *(stamp for _, stamp in key[2])),
+        )
+        return candidate, backend_dir
     raise AutodetectFailed(candidates)
 
 
@@ -213,9 +374,10 @@ def init_backend(backend_string: str | None = None) -> BackendInfo:
         alias, backend_dir = _autodetect_backend()
     else:
         backend_dir = _init_backend(backend_string)
-        backend = get_known_backend(backend_string)
+        name, _ = split_backend_string(backend_string)
+        backend = get_known_backend(name)
         if backend is not None:
-            alias = backend_string
+            alias = name
         else:
             alias = None
     ytdl_module = ytdl.get_ytdl_module()
@@ -233,3 +395,42 @@ def init_backend(backend_string: str | None = None) -> BackendInfo:
         is_managed=is_managed,
         metadata=metadata,
     )
+
+
+class BackgroundBackendInit:
+    """
+    Initialize the backend in a background thread, see `init_backend()`
+
+    Importing the backend package is the most expensive part of startup,
+    the caller can do other (mostly I/O-bound) work in the meantime,
+    but must not import the backend modules until `result()` returns.
+    """
+
+    def __init__(self, backend_string: str | None = None) -> None:
+        self._backend_string = backend_string
+        self._backend_info: BackendInfo | None = None
+        self._exception: BaseException | None = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            self._backend_info = init_backend(self._backend_string)
+        except BaseException as exc:
+            self._exception = exc
+
+    def join(self) -> None:
+        """Wait for the initialization ignoring errors."""
+        self._thread.join()
+
+    def result(self) -> BackendInfo:
+        """
+        Wait for the initialization and return the backend info
+
+        Exceptions raised by `init_backend()` are re-raised.
+        """
+        self.join()
+        if self._exception is not None:
+            raise self._exception
+        assert self._backend_info is not None
+        return self._backend_info
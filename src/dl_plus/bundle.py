@@ -0,0 +1,138 @@
+"""
+Self-contained bundles
+
+A bundle is a zipapp containing dl-plus itself, a backend (along with its
+dependencies) and extractor plugins, so it can be copied to a machine
+and run without installing anything. The archive is tuned for `zipimport`:
+
+* modules are precompiled to unchecked hash-based `.pyc` files placed next
+  to the sources (`zipimport` does not look into `__pycache__`), so
+  neither compilation nor source validation happen at runtime;
+* the prebuilt extractor index of the backend (see
+  `dl_plus.ytdl.build_extractor_index()`) and the manifest of bundled
+  plugins (zip archives cannot be scanned by the plugin discovery) are
+  stored in the archive;
+* the backend is always imported from the archive, backends managed by
+  dl-plus on the host machine are ignored (see
+  `dl_plus.backend.enable_bundle_mode()`);
+* entries can be stored uncompressed to trade size for decompression time.
+"""
+
+from __future__ import annotations
+
+import compileall
+import json
+import os
+import py_compile
+import shutil
+import tempfile
+import zipapp
+from pathlib import Path
+from typing import Mapping
+
+from dl_plus.const import PLUGINS_PACKAGE
+from dl_plus.exceptions import DLPlusException
+from dl_plus.extractor.machinery import PLUGIN_MANIFEST_FILENAME
+
+
+DEFAULT_INTERPRETER = '/usr/bin/env python3'
+
+_MAIN_TEMPLATE = """\
+import os
+
+os.environ.setdefault('DL_PLUS_BACKEND', {backend!r})
+
+from dl_plus.backend import enable_bundle_mode
+from dl_plus.cli import main
+
+enable_bundle_mode()
+main()
+"""
+
+# dl-plus bookkeeping files of package version directories
+_EXCLUDED_FILES = {'metadata.json', 'dependencies.json', '.keep'}
+
+
+class BundleError(DLPlusException):
+
+    pass
+
+
+def get_dl_plus_source_dir() -> Path:
+    """
+    Return the directory of the running dl-plus package
+
+    :raises BundleError: if dl-plus is not installed as a directory
+        (e.g., it is run from a bundle or a zipapp).
+    """
+    from dl_plus import cli
+    source_dir = Path(cli.__file__).parent.parent
+    if not source_dir.is_dir():
+        raise BundleError(f'{source_dir} is not a directory')
+    return source_dir
+
+
+def _copy_tree(source_dir: Path, target_dir: Path) -> None:
+    # bytecode is compiled from scratch
+    def ignore(directory: str, names: list[str]) -> set[str]:
+        ignored = {
+            name for name in names
+            if name == '__pycache__' or name.endswith(('.pyc', '.pyo'))
+        }
+        if directory == str(source_dir):
+            ignored.update(_EXCLUDED_FILES.intersection(names))
+        return ignored
+
+    # files copied earlier take precedence, e.g., a dependency shared
+    # by the backend and a plugin is taken from the backend directory
+    def copy(source: str, target: str) -> None:
+        if not os.path.exists(target):
+            shutil.copy2(source, target)
+
+    shutil.copytree(
+        source_dir, target_dir, ignore=ignore, copy_function=copy,
+        dirs_exist_ok=True,
+    )
+
+
+def build_bundle(
+    target: Path, backend_dir: Path, backend: str,
+    plugin_dirs: Mapping[str, Path], *,
+    compressed: bool = True, interpreter: str = DEFAULT_INTERPRETER,
+) -> None:
+    """
+    Build the bundle
+
+    :param backend_dir: the backend version directory.
+    :param backend: the backend string used by default, e.g., 'yt_dlp'.
+    :param plugin_dirs: plugin version directories by plugin import paths.
+    :raises BundleError:
+    """
+    dl_plus_dir = get_dl_plus_source_dir()
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory(
+            prefix='.dl-plus-bundle-', dir=target.parent) as tmp_dir:
+        staging_dir = Path(tmp_dir) / 'bundle'
+        staging_dir.mkdir()
+        _copy_tree(dl_plus_dir, staging_dir / 'dl_plus')
+        _copy_tree(backend_dir, staging_dir)
+        for plugin_dir in plugin_dirs.values():
+            _copy_tree(plugin_dir, staging_dir)
+        manifest_path = staging_dir.joinpath(
+            *PLUGINS_PACKAGE.split('.'), PLUGIN_MANIFEST_FILENAME)
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(manifest_path, 'w') as fobj:
+            json.dump(sorted(plugin_dirs), fobj)
+        (staging_dir / '__main__.py').write_text(
+            _MAIN_TEMPLATE.format(backend=backend))
+        compileall.compile_dir(
+            staging_dir, quiet=2, workers=0, legacy=True,
+            stripdir=str(staging_dir), prependdir='',
+            invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH,
+        )
+        tmp_target = Path(tmp_dir) / target.name
+        zipapp.create_archive(
+            staging_dir, tmp_target, interpreter=interpreter,
+            compressed=compressed,
+        )
+        os.replace(tmp_target, target)
@@ -75,3 +75,22 @@ assume_yes_arg = Arg(
     '-y', '--assume-yes', action='store_true',
     help='Automatic yes to prompts.'
 )
+
+
+index_url_arg = Arg(
+    '--index-url', metavar='URL',
+    help=(
+        'Package index to install from: PyPI JSON API base URL (default is '
+        'https://pypi.org/pypi), Simple API URL (ending with /simple), '
+        'or local directory (path or file:// URL) with wheel files.'
+    ),
+)
+
+
+installer_arg = Arg(
+    '--installer', choices=['builtin', 'pip'],
+    help=(
+        'Wheel installer to use. The builtin installer (default) resolves '
+        'and downloads dependencies itself, the pip installer requires pip.'
+    ),
+)
@@ -4,8 +4,8 @@ import sys
 from textwrap import dedent
 from typing import Union
 
-from dl_plus import core, ytdl
-from dl_plus.backend import get_known_backends, init_backend
+from dl_plus import core, resultcache, usage, ytdl
+from dl_plus.backend import BackgroundBackendInit, get_known_backends
 from dl_plus.config import Config
 from dl_plus.const import DL_PLUS_VERSION
 from dl_plus.exceptions import DLPlusException
@@ -63,7 +63,10 @@ def _get_main_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         '--backend',
         metavar='BACKEND',
-        help='youtube-dl backend.',
+        help=_dedent("""
+            youtube-dl backend. An installed version other than the active
+            one can be selected with BACKEND@VERSION.
+        """),
     )
     parser.add_argument(
         '--dlp-version',
@@ -77,6 +80,8 @@ def _get_main_parser() -> argparse.ArgumentParser:
         action='append',
         help=_dedent("""
             Extractor name. Can be specified multiple times: -E foo -E bar.
+            Glob patterns match name parts of the same level: -E 'foo:*'.
+            Names prefixed with ! exclude extractors: -E :builtins: -E '!foo'.
         """),
     )
     extractor_group.add_argument(
@@ -98,42 +103,71 @@ def _main(argv):
         raise DLPlusException('update is not yet supported')
     compat_mode = _detect_compat_mode(argv[0])
     config = Config()
-    backend = None
-    if not compat_mode:
-        if _CMD in args:
-            from .command import run_command
-            run_command(prog=_PROG, cmd_arg=_CMD, args=args)
-            return
-        parser = _get_main_parser()
-        parsed_args, ytdl_args = parser.parse_known_args(args)
-        backend = parsed_args.backend
-        config_file: Union[str, bool, None]
-        if parsed_args.no_dlp_config:
-            config_file = False
+    # the backend is imported in a background thread as soon as
+    # the backend string is known, meanwhile the config is loaded
+    # and extractor plugin directories are looked up
+    backend_init = None
+    try:
+        if not compat_mode:
+            if _CMD in args:
+                from .command import run_command
+                run_command(prog=_PROG, cmd_arg=_CMD, args=args)
+                return
+            parser = _get_main_parser()
+            parsed_args, ytdl_args = parser.parse_known_args(args)
+            if parsed_args.backend:
+                backend_init = BackgroundBackendInit(parsed_args.backend)
+            config_file: Union[str, bool, None]
+            if parsed_args.no_dlp_config:
+                config_file = False
+            else:
+                config_file = parsed_args.dlp_config
+            config.load(config_file)
         else:
-            config_file = parsed_args.dlp_config
-        config.load(config_file)
-    else:
-        ytdl_args = args
-        config.load()
-    if not backend:
-        backend = config.backend
-    init_backend(backend)
-    force_generic_extractor = False
-    extractors = None
-    if not compat_mode:
-        if parsed_args.help:
-            parser.print_help()
-            return
-        force_generic_extractor = parsed_args.force_generic_extractor
-        extractors = parsed_args.extractor
+            ytdl_args = args
+            config.load()
+        if backend_init is None:
+            backend_init = BackgroundBackendInit(config.backend)
+        force_generic_extractor = False
+        extractors = None
+        search_paths = None
+        if not compat_mode:
+            force_generic_extractor = parsed_args.force_generic_extractor
+            extractors = parsed_args.extractor
+        if not force_generic_extractor:
+            if not extractors:
+                extractors = config.extractors
+            search_paths = core.get_extractor_search_paths(extractors)
+    except BaseException:
+        if backend_init is not None:
+            # errors of the main thread take precedence
+            backend_init.join()
+        raise
+    backend_init.result()
+    if not compat_mode and parsed_args.help:
+        parser.print_help()
+        return
+    # invalid option values must not break --help
+    backend_options = config.backend_options
+    record_extractor_usage = config.record_extractor_usage
+    results_cache_ttl = config.results_cache_ttl
+    failures_cache_ttl = config.failures_cache_ttl
+    failure_classes = config.failure_classes
+    page_cache_max_size = config.page_cache_max_size
     if force_generic_extractor:
         ytdl_args.append('--force-generic-extractor')
     else:
-        if not extractors:
-            extractors = config.extractors
-        core.enable_extractors(extractors)
-    backend_options = config.backend_options
+        on_use = None
+        if record_extractor_usage:
+            usage.enable()
+            on_use = usage.record
+        core.enable_extractors(extractors, search_paths, on_use)
+    if page_cache_max_size:
+        from dl_plus.extractor import pagecache
+        pagecache.install(page_cache_max_size)
+    if results_cache_ttl is not None or failures_cache_ttl is not None:
+        resultcache.install(
+            results_cache_ttl, failures_cache_ttl, failure_classes)
     if backend_options is not None:
         ytdl_args = ['--ignore-config'] + backend_options + ytdl_args
     ytdl.run(ytdl_args)
@@ -2,8 +2,12 @@ from dl_plus.cli import args as cli_args
 
 from .backend import BackendCommandGroup
 from .base import CommandGroup
+from .bundle import BundleCommand
 from .config import ConfigCommandGroup
 from .extractor import ExtractorCommandGroup
+from .lock import LockCommand
+from .outdated import OutdatedCommand
+from .sync import SyncCommand
 
 
 class RootCommandGroup(CommandGroup):
@@ -17,4 +21,8 @@ class RootCommandGroup(CommandGroup):
         BackendCommandGroup,
         ExtractorCommandGroup,
         ConfigCommandGroup,
+        LockCommand,
+        OutdatedCommand,
+        SyncCommand,
+        BundleCommand,
     )
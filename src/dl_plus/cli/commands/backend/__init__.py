@@ -1,5 +1,6 @@
 from dl_plus.cli.commands.base import CommandGroup
 
+from .bench import BackendBenchCommand
 from .info import BackendInfoCommand
 from .install import BackendInstallCommand
 from .list import BackendListCommand
@@ -17,4 +18,5 @@ class BackendCommandGroup(CommandGroup):
         BackendInstallCommand,
         BackendUninstallCommand,
         BackendUpdateCommand,
+        BackendBenchCommand,
     )
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, ClassVar
+from functools import partial
+from typing import TYPE_CHECKING, Callable, ClassVar
 
 from dl_plus import backend
 from dl_plus.backend import (
-    Backend, BackendInfo, get_known_backend, init_backend,
-    is_project_name_valid,
+    Backend, BackendInfo, build_extractor_index, get_known_backend,
+    init_backend, is_project_name_valid,
 )
 from dl_plus.config import ConfigValue
 
@@ -55,9 +56,6 @@ class BackendCommandMixin(_base):
         if self.backend_info is None and self.init_backend:
             self.backend_info = init_backend(project_name_or_backend_alias)
 
-
-class BackendInstallUninstallUpdateCommandMixin(BackendCommandMixin):
-
     def get_package_dir(self) -> Path:
         if self.backend_alias is not None:
             _backend = self.backend_alias
@@ -70,3 +68,20 @@ class BackendInstallUninstallUpdateCommandMixin(BackendCommandMixin):
         if short_name is None:
             short_name = self.project_name
         return short_name
+
+
+class BackendInstallUninstallUpdateCommandMixin(BackendCommandMixin):
+
+    def run(self):
+        try:
+            super().run()
+        finally:
+            # the active version of the backend may have changed
+            backend.invalidate_autodetect_cache()
+
+    def get_post_install_hook(self) -> Callable[[Path], None]:
+        if self.backend is not None:
+            import_name = self.backend.import_name
+        else:
+            import_name = self.project_name
+        return partial(build_extractor_index, import_name=import_name)
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import statistics
+import subprocess
+import sys
+import time
+from typing import List, NamedTuple, Optional
+
+from dl_plus import packagedir
+from dl_plus.cli.args import Arg
+from dl_plus.cli.commands.base import Command
+
+from .base import BackendCommandMixin
+
+
+DEFAULT_RUNS = 3
+
+
+class _Result(NamedTuple):
+    version: str
+    is_active: bool
+    # medians in seconds
+    startup: float
+    total: Optional[float]
+
+
+def get_dl_plus_command() -> List[str]:
+    """Return the command running dl-plus the way the process was run."""
+    if getattr(sys, 'frozen', False):
+        # PyInstaller builds, the executable is dl-plus itself
+        return [sys.executable]
+    main_spec = getattr(sys.modules.get('__main__'), '__spec__', None)
+    if main_spec is not None and main_spec.name == 'dl_plus.__main__':
+        # python -m dl_plus
+        return [sys.executable, '-m', 'dl_plus']
+    # the dl-plus script or a zipapp (scripts/build_pyz.py, bundles)
+    return [sys.executable, sys.argv[0]]
+
+
+class BackendBenchCommand(BackendCommandMixin, Command):
+
+    short_description = 'compare installed backend versions'
+
+    long_description = """
+        Run every installed version of the backend (the active one and
+        the ones installed with `backend install --side-by-side`) in a
+        subprocess and report the median startup time (`--version`), and,
+        if URLs are given, the extraction latency per URL and throughput
+        (all URLs are extracted in a single simulated run, `--simulate`).
+        Local fixtures can be passed as file:// URLs if the backend
+        supports them.
+    """
+
+    arguments = (
+        Arg(
+            'name', metavar='NAME',
+            help='Backend name.'
+        ),
+        Arg(
+            'urls', nargs='*', metavar='URL',
+            help='URLs to extract.',
+        ),
+        Arg(
+            '-V', '--version', action='append', dest='versions',
+            metavar='VERSION',
+            help=(
+                'Version to benchmark. Can be specified multiple times. '
+                'Default is all installed versions.'
+            ),
+        ),
+        Arg(
+            '-n', '--runs', type=int, default=DEFAULT_RUNS, metavar='N',
+            help=f'Number of runs per version. Default is {DEFAULT_RUNS}.',
+        ),
+    )
+
+    fallback_to_config = False
+    allow_autodetect = False
+    init_backend = False
+
+    def get_versions(self) -> List[str]:
+        versions: List[str] = []
+        for version_dir in packagedir.get_version_dirs(
+                self.get_package_dir()):
+            version = packagedir.get_version_from_dir_name(version_dir)
+            if version not in versions:
+                versions.append(version)
+        return versions
+
+    def run(self):
+        runs = self.args.runs
+        if runs < 1:
+            self.die('the number of runs must be positive')
+        short_name = self.get_short_name()
+        installed_versions = self.get_versions()
+        versions = self.args.versions or installed_versions
+        for version in versions:
+            if version not in installed_versions:
+                self.die(f'{short_name} {version} is not installed')
+        if not versions:
+            self.die(f'no managed versions of {short_name} are installed')
+        active_dir = packagedir.get_active_dir(self.get_package_dir())
+        active_version = None
+        if active_dir:
+            active_version = packagedir.get_version_from_dir_name(active_dir)
+        self.dl_plus_command = get_dl_plus_command()
+        results = []
+        for version in versions:
+            self.print(f'Benchmarking {short_name} {version}', file=sys.stderr)
+            results.append(self._bench(
+                short_name, version, version == active_version, runs))
+        self._print_results(results)
+
+    def _get_base_args(self, backend_string: str) -> List[str]:
+        args = list(self.dl_plus_command)
+        if getattr(self.args, 'no_dlp_config', False):
+            args.append('--no-dlp-config')
+        elif dlp_config := getattr(self.args, 'dlp_config', None):
+            args.extend(['--dlp-config', dlp_config])
+        args.extend(['--backend', backend_string])
+        return args
+
+    def _time(self, args: List[str]) -> float:
+        start = time.perf_counter()
+        process = subprocess.run(
+            args, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+            text=True,
+        )
+        elapsed = time.perf_counter() - start
+        if process.returncode:
+            error = process.stderr.strip().splitlines()
+            self.die(
+                f'{" ".join(args[len(self.dl_plus_command):])} failed '
+                f'with exit code '
+                f'{process.returncode}' + (f': {error[-1]}' if error else '')
+            )
+        return elapsed
+
+    def _bench(
+        self, short_name: str, version: str, is_active: bool, runs: int,
+    ) -> _Result:
+        base_args = self._get_base_args(
+            f'{short_name}{packagedir.VERSION_SEPARATOR}{version}')
+        urls = self.args.urls
+        startup_times = []
+        total_times = []
+        for _ in range(runs):
+            startup_times.append(self._time([*base_args, '--version']))
+            if urls:
+                total_times.append(self._time([
+                    *base_args, '--simulate', '--quiet', '--no-warnings',
+                    *urls,
+                ]))
+        return _Result(
+            version=version,
+            is_active=is_active,
+            startup=statistics.median(startup_times),
+            total=statistics.median(total_times) if total_times else None,
+        )
+
+    def _print_results(self, results: List[_Result]) -> None:
+        url_count = len(self.args.urls)
+        header = ['VERSION', 'STARTUP']
+        if url_count:
+            header.extend(['LATENCY', 'THROUGHPUT'])
+        rows = [header]
+        for result in results:
+            version = result.version
+            if result.is_active:
+                version = f'{version} (active)'
+            row = [version, f'{result.startup:.3f}s']
+            if result.total is not None:
+                latency = max(result.total - result.startup, 0) / url_count
+                row.extend([
+                    f'{latency:.3f}s/URL',
+                    f'{url_count / result.total:.2f} URL/s',
+                ])
+            rows.append(row)
+        self.print_table(rows)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from dl_plus.cli.args import Arg
+from dl_plus.cli.args import Arg, index_url_arg, installer_arg
 from dl_plus.cli.commands.base import BaseInstallCommand
 
 from .base import BackendInstallUninstallUpdateCommandMixin
@@ -25,6 +25,16 @@ class BackendInstallCommand(
             '-f', '--force', action='store_true',
             help='Force installation if the same version is already installed.'
         ),
+        Arg(
+            '--side-by-side', action='store_true',
+            help=(
+                'Install the version without activating it. The version is '
+                'kept until uninstalled with `--version` and can be selected '
+                'with `--backend NAME@VERSION`.'
+            ),
+        ),
+        index_url_arg,
+        installer_arg,
     )
 
     fallback_to_config = False
@@ -41,3 +51,6 @@ class BackendInstallCommand(
 
     def get_force_flag(self) -> bool:
         return self.args.force
+
+    def get_side_by_side_flag(self) -> bool:
+        return self.args.side_by_side
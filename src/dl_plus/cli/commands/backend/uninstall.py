@@ -1,3 +1,4 @@
+from dl_plus import packagedir, store
 from dl_plus.cli.args import Arg, assume_yes_arg
 from dl_plus.cli.commands.base import BaseUninstallCommand
 
@@ -15,6 +16,10 @@ class BackendUninstallCommand(
             'name', metavar='NAME',
             help='Backend plugin name.'
         ),
+        Arg(
+            '-V', '--version', metavar='VERSION',
+            help='Uninstall only the version installed side by side.',
+        ),
         assume_yes_arg,
     )
 
@@ -26,6 +31,32 @@ class BackendUninstallCommand(
         super().init()
         package_dir = self.get_package_dir()
         assert self.backend_info is not None
-        if not package_dir.exists() and not self.backend_info.is_managed:
+        if (
+            not packagedir.get_active_dir(package_dir)
+            and not self.backend_info.is_managed
+        ):
             name = self.get_short_name()
             self.die(f'{name} is not managed by dl-plus, unable to uninstall')
+
+    def run(self):
+        version = self.args.version
+        if version is None:
+            super().run()
+            return
+        package_dir = self.get_package_dir()
+        short_name = self.get_short_name()
+        version_dir = packagedir.get_version_dir(package_dir, version)
+        if not version_dir:
+            self.die(f'{short_name} {version} is not installed')
+        if version_dir == packagedir.get_active_dir(package_dir):
+            self.die(
+                f'{short_name} {version} is the active version, '
+                f'uninstall {short_name} without `--version` instead'
+            )
+        if not self.confirm(f'Uninstall {short_name} {version}?'):
+            self.print('Aborted')
+            return
+        with packagedir.get_lock(package_dir):
+            packagedir.remove_version(package_dir, version)
+        store.collect_garbage()
+        self.print('Uninstalled')
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from dl_plus.cli.args import Arg
+from dl_plus.cli.args import Arg, index_url_arg, installer_arg
 from dl_plus.cli.commands.base import BaseUpdateCommand
 
 from .base import BackendInstallUninstallUpdateCommandMixin
@@ -17,6 +17,8 @@ class BackendUpdateCommand(
             'name', nargs='?', metavar='NAME',
             help='Backend plugin name.'
         ),
+        index_url_arg,
+        installer_arg,
     )
 
     fallback_to_config = True
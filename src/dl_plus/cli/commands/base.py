@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import shutil
 import sys
 from argparse import Namespace
 from collections.abc import Iterable
@@ -8,12 +7,14 @@ from functools import cached_property
 from pathlib import Path
 from textwrap import dedent
 from typing import (
-    TYPE_CHECKING, ClassVar, Dict, List, NoReturn, Optional, Sequence, Tuple,
-    Type, Union,
+    TYPE_CHECKING, Callable, ClassVar, Dict, List, NoReturn, Optional,
+    Sequence, Tuple, Type, Union,
 )
 
+from dl_plus import installed, packagedir, store
 from dl_plus.config import Config, ConfigError, get_config_path
 from dl_plus.exceptions import DLPlusException
+from dl_plus.httpclient import HTTPClient
 from dl_plus.pypi import PyPIClient, Wheel, WheelInstaller, load_metadata
 
 
@@ -104,6 +105,14 @@ class Command(_CommandBase):
 
     print = print
 
+    def print_table(self, rows: Sequence[Sequence[str]]) -> None:
+        """Print rows (the first one is the header) as aligned columns."""
+        widths = [max(map(len, column)) for column in zip(*rows)]
+        for row in rows:
+            self.print('  '.join(
+                cell.ljust(width) for cell, width in zip(row, widths)
+            ).rstrip())
+
     def confirm(self, message: str) -> bool:
         try:
             assume_yes = self.args.assume_yes
@@ -158,7 +167,17 @@ class CommandError(DLPlusException):
     pass
 
 
-class BaseInstallUpdateCommand(Command):
+class BaseIndexCommand(Command):
+    """Base class of commands querying the package index"""
+
+    def get_index_url(self) -> Optional[str]:
+        index_url = getattr(self.args, 'index_url', None)
+        if index_url is None:
+            index_url = self.config.index_url
+        return index_url
+
+
+class BaseInstallUpdateCommand(BaseIndexCommand):
     client: PyPIClient
     wheel_installer: WheelInstaller
 
@@ -172,14 +191,29 @@ class BaseInstallUpdateCommand(Command):
     def get_extras(self) -> Optional[Iterable[str]]:
         return None
 
+    def get_installer(self) -> Optional[str]:
+        return getattr(self.args, 'installer', None)
+
+    def get_post_install_hook(self) -> Optional[Callable[[Path], None]]:
+        """
+        Return a callable to be called with the installed (not yet
+        activated) version directory
+        """
+        return None
+
     def init(self) -> None:
-        self.client = PyPIClient()
-        self.wheel_installer = WheelInstaller()
+        # the same connection pool is shared by metadata requests
+        # and wheel downloads
+        http_client = HTTPClient()
+        self.client = PyPIClient(http_client, self.get_index_url())
+        self.wheel_installer = WheelInstaller(
+            self.client, self.get_installer())
 
     def load_installed_metadata(self, package_dir: Path) -> Optional[Metadata]:
-        if not package_dir.exists():
+        active_dir = packagedir.get_active_dir(package_dir)
+        if not active_dir:
             return None
-        return load_metadata(package_dir)
+        return load_metadata(active_dir)
 
 
 class BaseInstallCommand(BaseInstallUpdateCommand):
@@ -190,12 +224,18 @@ class BaseInstallCommand(BaseInstallUpdateCommand):
     def get_force_flag(self) -> bool:
         return False
 
+    def get_side_by_side_flag(self) -> bool:
+        return False
+
     def run(self):
         name, version = self.get_project_name_version_tuple()
         wheel = self.client.fetch_wheel_info(name, version)
         self.print(f'Found remote version: {wheel.name} {wheel.version}')
 
         package_dir = self.get_package_dir()
+        if self.get_side_by_side_flag():
+            self.install_side_by_side(wheel, package_dir)
+            return
         installed_metadata = self.load_installed_metadata(package_dir)
         if not installed_metadata:
             self.install(wheel, package_dir)
@@ -235,7 +275,26 @@ class BaseInstallCommand(BaseInstallUpdateCommand):
     def install(self, wheel: Wheel, package_dir: Path) -> None:
         self.print('Installing')
         self.print(f'Using {self.wheel_installer.identifier} installer')
-        self.wheel_installer.install(wheel, package_dir, self.get_extras())
+        self.wheel_installer.install(
+            wheel, package_dir, self.get_extras(),
+            post_install=self.get_post_install_hook(),
+        )
+        self.print('Installed')
+
+    def install_side_by_side(self, wheel: Wheel, package_dir: Path) -> None:
+        version_dir = packagedir.get_version_dir(package_dir, wheel.version)
+        if version_dir and not self.get_force_flag():
+            with packagedir.get_lock(package_dir):
+                packagedir.keep(version_dir)
+            self.print('The same version is already installed, keeping it')
+            self.print('Use `--force` to reinstall')
+            return
+        self.print('Installing side by side')
+        self.print(f'Using {self.wheel_installer.identifier} installer')
+        self.wheel_installer.install(
+            wheel, package_dir, self.get_extras(),
+            post_install=self.get_post_install_hook(), activate=False,
+        )
         self.print('Installed')
 
 
@@ -273,7 +332,10 @@ class BaseUpdateCommand(BaseInstallUpdateCommand):
     def update(self, wheel: Wheel, package_dir: Path) -> None:
         self.print('Updating')
         self.print(f'Using {self.wheel_installer.identifier} installer')
-        self.wheel_installer.install(wheel, package_dir, self.get_extras())
+        self.wheel_installer.install(
+            wheel, package_dir, self.get_extras(),
+            post_install=self.get_post_install_hook(),
+        )
         self.print('Updated')
 
 
@@ -289,7 +351,7 @@ class BaseUninstallCommand(Command):
     def run(self):
         package_dir = self.get_package_dir()
         short_name = self.get_short_name()
-        if not package_dir.exists():
+        if not packagedir.get_active_dir(package_dir):
             self.die(f'{short_name} is not installed')
         if self.confirm(f'Uninstall {short_name}?'):
             self.uninstall(package_dir)
@@ -297,5 +359,8 @@ class BaseUninstallCommand(Command):
             self.print('Aborted')
 
     def uninstall(self, package_dir: Path) -> None:
-        shutil.rmtree(package_dir)
-        self.print('Unistalled')
+        with packagedir.get_lock(package_dir):
+            packagedir.remove(package_dir)
+            installed.remove(package_dir)
+        store.collect_garbage()
+        self.print('Uninstalled')
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from dl_plus import packagedir
+from dl_plus.backend import BackendError, parse_backend_string
+from dl_plus.bundle import DEFAULT_INTERPRETER, build_bundle
+from dl_plus.cli.args import Arg
+from dl_plus.cli.commands.base import Command
+from dl_plus.config import ConfigValue
+from dl_plus.core import get_extractor_plugin_dir, get_extractor_plugins_dir
+from dl_plus.extractor.peqn import PEQN
+
+
+class BundleCommand(Command):
+
+    short_description = 'build self-contained bundle'
+
+    long_description = """
+        Build a zipapp containing dl-plus, the backend and extractor plugins
+        with precompiled bytecode. The bundle can be copied to another
+        machine and run as is. The bundled backend is used by default
+        (`DL_PLUS_BACKEND` environment variable is respected).
+    """
+
+    arguments = (
+        Arg('path', metavar='PATH', help='Bundle path.'),
+        Arg(
+            '--backend', metavar='BACKEND',
+            help='Backend to bundle. Default is the configured backend.',
+        ),
+        Arg(
+            '-p', '--plugin', action='append', dest='plugins',
+            metavar='NS/PLUGIN',
+            help=(
+                'Extractor plugin to bundle. Can be specified multiple '
+                'times. Default is all installed plugins.'
+            ),
+        ),
+        Arg(
+            '--no-compress', action='store_true',
+            help='Store files uncompressed (larger, but faster to import).',
+        ),
+        Arg(
+            '--python', metavar='INTERPRETER', default=DEFAULT_INTERPRETER,
+            help=f'Interpreter for the shebang line. '
+                 f'Default is {DEFAULT_INTERPRETER}.',
+        ),
+    )
+
+    def get_backend_dir(self) -> tuple[Path, str]:
+        backend = self.args.backend
+        if backend is None:
+            backend = self.config.backend
+        if backend == ConfigValue.Backend.AUTODETECT:
+            self.die(f'{backend} is not allowed, specify backend explicitly')
+        try:
+            _, backend_dir, import_name = parse_backend_string(backend)
+        except BackendError as exc:
+            self.die(str(exc))
+        if not backend_dir:
+            self.die(f'{backend} is not managed by dl-plus, install it first')
+        return backend_dir, import_name
+
+    def get_plugin_dirs(self) -> dict[str, Path]:
+        if self.args.plugins is None:
+            plugin_dirs = packagedir.iter_package_dirs(
+                get_extractor_plugins_dir())
+        else:
+            plugin_dirs = []
+            for plugin in self.args.plugins:
+                try:
+                    peqn = PEQN.from_string(plugin)
+                except ValueError:
+                    self.die(f'invalid extractor plugin name: {plugin}')
+                plugin_dirs.append(
+                    get_extractor_plugin_dir(peqn.ns, peqn.plugin))
+        version_dirs = {}
+        for plugin_dir in plugin_dirs:
+            ns, _, plugin = plugin_dir.name.partition('-')
+            version_dir = packagedir.get_active_dir(plugin_dir)
+            if not version_dir:
+                self.die(f'{ns}/{plugin} is not installed')
+            version_dirs[PEQN(ns, plugin).plugin_import_path] = version_dir
+        return version_dirs
+
+    def run(self):
+        backend_dir, backend = self.get_backend_dir()
+        plugin_dirs = self.get_plugin_dirs()
+        self.print(f'Bundling {backend_dir.name}')
+        for plugin_dir in plugin_dirs.values():
+            self.print(f'Bundling {plugin_dir.name}')
+        build_bundle(
+            Path(self.args.path), backend_dir, backend, plugin_dirs,
+            compressed=not self.args.no_compress,
+            interpreter=self.args.python,
+        )
+        self.print('Bundled')
@@ -2,6 +2,7 @@ from dl_plus.cli.commands.base import CommandGroup
 
 from .install import ExtractorInstallCommand
 from .list import ExtractorListCommand
+from .optimize import ExtractorOptimizeCommand
 from .uninstall import ExtractorUninstallCommand
 from .update import ExtractorUpdateCommand
 
@@ -15,4 +16,5 @@ class ExtractorCommandGroup(CommandGroup):
         ExtractorInstallCommand,
         ExtractorUninstallCommand,
         ExtractorUpdateCommand,
+        ExtractorOptimizeCommand,
     )
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import Optional, Tuple
 
-from dl_plus.cli.args import Arg
+from dl_plus.cli.args import Arg, index_url_arg, installer_arg
 from dl_plus.cli.commands.base import BaseInstallCommand
 
 from .base import ExtractorInstallUninstallUpdateCommandMixin
@@ -27,6 +27,8 @@ class ExtractorInstallCommand(
             '-f', '--force', action='store_true',
             help='Force installation if the same version is already installed.'
         ),
+        index_url_arg,
+        installer_arg,
     )
 
     def get_project_name_version_tuple(self) -> Tuple[str, Optional[str]]:
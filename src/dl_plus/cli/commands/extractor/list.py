@@ -2,12 +2,12 @@ from __future__ import annotations
 
 import sys
 
+from dl_plus import installed, packagedir
 from dl_plus.backend import init_backend
 from dl_plus.cli.args import Arg
 from dl_plus.cli.commands.base import Command
 from dl_plus.core import get_extractor_plugins_dir
 from dl_plus.extractor.machinery import load_extractors_by_peqn
-from dl_plus.pypi import load_metadata
 
 
 class ExtractorListCommand(Command):
@@ -21,33 +21,42 @@ class ExtractorListCommand(Command):
         ),
     )
 
+    _backend_initialized = False
+
     def run(self):
-        extractor_plugins_dir = get_extractor_plugins_dir()
-        if not extractor_plugins_dir.exists():
-            return
         plugin: str
-        version: str | None = None
-        extractors: list[str] | None = None
+        version: str | None
+        extractors: list[str | None] | None
         short = self.args.short
-        if not short:
-            init_backend(self.config.backend)
-        for extractor_plugin_dir in sorted(extractor_plugins_dir.iterdir()):
-            plugin = extractor_plugin_dir.name.replace('-', '/')
-            if not short:
-                if metadata := load_metadata(extractor_plugin_dir):
-                    version = metadata.version
-                else:
-                    version = None
-                sys.path.insert(0, str(extractor_plugin_dir))
-                peqns = [ie.IE_NAME for ie in load_extractors_by_peqn(plugin)]
-                if len(peqns) == 1 and ':' not in peqns[0]:
-                    extractors = None
-                else:
-                    extractors = [peqn.partition(':')[2] for peqn in peqns]
+        for record in installed.get_packages(installed.EXTRACTORS):
+            plugin = record['dir'].replace('-', '/')
+            if short:
+                self.print(plugin)
+                continue
+            version = record['version']
+            extractors = record['extractors']
+            if extractors is None:
+                # the names cannot be determined without importing the plugin
+                extractors = self._load_extractor_names(plugin, record['dir'])
             if version is None:
                 self.print(plugin)
             else:
                 self.print(f'{plugin} {version}')
-            if extractors:
+            if extractors != [None]:
                 for extractor in extractors:
-                    self.print(' ', extractor)
+                    self.print(' ', extractor or '')
+
+    def _load_extractor_names(
+        self, plugin: str, dir_name: str,
+    ) -> list[str | None]:
+        if not self._backend_initialized:
+            init_backend(self.config.backend)
+            self._backend_initialized = True
+        active_dir = packagedir.get_active_dir(
+            get_extractor_plugins_dir() / dir_name)
+        assert active_dir
+        sys.path.insert(0, str(active_dir))
+        return [
+            ie.IE_NAME.partition(':')[2] or None
+            for ie in load_extractors_by_peqn(plugin)
+        ]
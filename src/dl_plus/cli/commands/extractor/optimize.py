@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import re
+
+from dl_plus import core, usage, ytdl
+from dl_plus.backend import init_backend
+from dl_plus.cli.args import Arg
+from dl_plus.cli.commands.base import Command
+from dl_plus.config import ConfigValue, Option, Section, get_config_home
+
+
+# the same as configparser.ConfigParser.SECTCRE
+_SECTION_HEADER_REGEX = re.compile(r'\[(?P<header>.+)\]')
+
+
+def _replace_section(
+    content: str, names: tuple[str, ...], section: str,
+) -> str:
+    """Replace the sections (or append if missing) with the section text."""
+    lines = []
+    replaced = False
+    skip = False
+    for line in content.splitlines(keepends=True):
+        match = _SECTION_HEADER_REGEX.match(line)
+        if match:
+            skip = match['header'].strip() in names
+            if skip and not replaced:
+                lines.append(section + '\n')
+                replaced = True
+        if not skip:
+            lines.append(line)
+    if not replaced:
+        if lines:
+            lines.append('\n')
+        lines.append(section)
+    return ''.join(lines).rstrip('\n') + '\n'
+
+
+class ExtractorOptimizeCommand(Command):
+
+    short_description = 'build minimal extractor list from usage statistics'
+
+    long_description = """
+        Build the `[extractors]` config section containing only the
+        extractors used so far, in the order they are currently enabled
+        (so the same extractor handles the same URL), followed by the
+        generic extractor. Usage is recorded if `record-extractor-usage`
+        is enabled in the `[main]` config section.
+    """
+
+    arguments = (
+        Arg(
+            '--min-count', type=int, default=1, metavar='N',
+            help=(
+                'Skip extractors used in fewer than N runs. Default is 1.'
+            ),
+        ),
+        Arg(
+            '-w', '--write', action='store_true',
+            help=(
+                'Replace the [extractors] section of the config file '
+                'instead of printing it.'
+            ),
+        ),
+        Arg(
+            '--reset', action='store_true',
+            help='Clear usage statistics.',
+        ),
+    )
+
+    def get_used_names(self) -> set[str]:
+        return {
+            name for name, record in usage.load().items()
+            if record['count'] >= self.args.min_count
+        }
+
+    def get_section_names(self, used: set[str]) -> list[str]:
+        init_backend(self.config.backend)
+        names: list[str] = []
+        has_generic = False
+        for extractor in core.get_extractors(self.config.extractors):
+            name = ytdl.get_extractor_name(extractor)
+            if name == ConfigValue.Extractor.GENERIC:
+                has_generic = True
+            elif name in used and name not in names:
+                names.append(name)
+        section_names = []
+        for name in names:
+            # built-in extractor names also match subextractors,
+            # e.g., 'youtube' matches 'youtube:tab'
+            if (
+                '/' not in name
+                and len(ytdl.get_extractors_by_name(name)) > 1
+            ):
+                name = f'{name}:_'
+            section_names.append(name)
+        if has_generic:
+            section_names.append(ConfigValue.Extractor.GENERIC)
+        return section_names
+
+    def write(self, section: str) -> None:
+        path = self.config_path
+        if path is None:
+            path = get_config_home() / 'config.ini'
+            path.parent.mkdir(parents=True, exist_ok=True)
+            content = ''
+        else:
+            content = path.read_text()
+        content = _replace_section(
+            content,
+            (Section.EXTRACTORS, Section.DEPRECATED_EXTRACTORS),
+            section,
+        )
+        path.write_text(content)
+        self.print(f'Written to {path}')
+
+    def run(self):
+        if self.args.reset:
+            usage.clear()
+            self.print('Cleared')
+            return
+        used = self.get_used_names()
+        if not used:
+            option = Option.RECORD_EXTRACTOR_USAGE
+            self.die(
+                f'no extractor usage recorded, enable `{option}` '
+                f'in the [{Section.MAIN}] config section'
+            )
+        section = '\n'.join(
+            [f'[{Section.EXTRACTORS}]', *self.get_section_names(used)])
+        if self.args.write:
+            self.write(section + '\n')
+        else:
+            self.print(section)
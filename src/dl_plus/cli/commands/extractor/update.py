@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from dl_plus.cli.args import Arg
+from dl_plus.cli.args import Arg, index_url_arg, installer_arg
 from dl_plus.cli.commands.base import BaseUpdateCommand
 
 from .base import ExtractorInstallUninstallUpdateCommandMixin
@@ -17,6 +17,8 @@ class ExtractorUpdateCommand(
             'name', metavar='NAME',
             help='Extractor plugin name.'
         ),
+        index_url_arg,
+        installer_arg,
     )
 
     def get_project_name(self) -> str:
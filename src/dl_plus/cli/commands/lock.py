@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import sys
+
+from dl_plus import lockfile
+from dl_plus.cli.args import Arg
+from dl_plus.cli.commands.base import Command
+
+
+class LockCommand(Command):
+
+    short_description = 'write lockfile of installed packages'
+
+    long_description = """
+        Write the exact versions, wheel URLs and sha256 digests of installed
+        backends and extractor plugins (including their dependencies)
+        to the lockfile. The lockfile can be installed on another machine
+        with the `sync` command.
+    """
+
+    arguments = (
+        Arg(
+            'path', nargs='?', metavar='PATH',
+            help='Lockfile path. Default is stdout.',
+        ),
+    )
+
+    def run(self):
+        packages = lockfile.get_installed_packages()
+        for package in packages:
+            if package.dependencies is None:
+                self.print(
+                    f'warning: dependencies of {package.wheel.name} are '
+                    f'not known, they will be resolved by sync',
+                    file=sys.stderr,
+                )
+        if self.args.path is None:
+            lockfile.dump(packages, sys.stdout)
+            return
+        with open(self.args.path, 'w') as fobj:
+            lockfile.dump(packages, fobj)
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, NamedTuple, Optional
+
+from dl_plus import installed
+from dl_plus.cli.args import Arg, index_url_arg
+from dl_plus.cli.commands.base import BaseIndexCommand
+from dl_plus.httpclient import HTTPClient
+from dl_plus.pypi import DownloadError, PyPIClient, get_metadata_cache_dir
+from dl_plus.version import parse_version
+
+
+DEFAULT_JOBS = 8
+
+_HEADER = ('PACKAGE', 'TYPE', 'INSTALLED', 'LATEST', 'STATUS')
+
+_KINDS = {
+    installed.BACKENDS: 'backend',
+    installed.EXTRACTORS: 'extractor',
+}
+
+
+class _Result(NamedTuple):
+    name: str
+    kind: str
+    installed_version: str
+    latest_version: Optional[str]
+    error: Optional[str]
+
+    @property
+    def status(self) -> str:
+        if self.error is not None:
+            return 'error'
+        installed_version = parse_version(self.installed_version)
+        latest_version = parse_version(self.latest_version or '')
+        if installed_version is None or latest_version is None:
+            # not PEP 440 versions, they cannot be ordered
+            if self.latest_version == self.installed_version:
+                return 'up to date'
+            return 'unknown'
+        if latest_version > installed_version:
+            return 'outdated'
+        return 'up to date'
+
+
+class OutdatedCommand(BaseIndexCommand):
+
+    short_description = 'list outdated packages'
+
+    long_description = """
+        Compare installed versions of managed backends and extractor plugins
+        with the latest versions available in the package index and print
+        the results as a table. The index is queried concurrently,
+        responses are cached and revalidated with conditional requests.
+    """
+
+    arguments = (
+        Arg(
+            '-j', '--jobs', type=int, default=DEFAULT_JOBS, metavar='N',
+            help=f'Maximum number of concurrent requests. '
+                 f'Default is {DEFAULT_JOBS}.',
+        ),
+        index_url_arg,
+    )
+
+    def run(self):
+        jobs = self.args.jobs
+        if jobs < 1:
+            self.die('the number of jobs must be positive')
+        records = [
+            record
+            for kind in _KINDS
+            for record in installed.get_packages(kind)
+            # packages not installed by dl-plus have no version
+            if record['version'] is not None
+        ]
+        if not records:
+            return
+        with HTTPClient(max_idle_per_host=jobs) as http_client:
+            client = PyPIClient(
+                http_client, self.get_index_url(), get_metadata_cache_dir())
+            with ThreadPoolExecutor(jobs) as executor:
+                results = list(executor.map(
+                    lambda record: self._check(client, record), records))
+        self._print_table(results)
+        errors = [result.error for result in results if result.error]
+        for error in errors:
+            self.print(f'error: {error}', file=sys.stderr)
+        if errors:
+            self.die(f'failed to check {len(errors)} package(s)')
+
+    def _check(self, client: PyPIClient, record: installed.Record) -> _Result:
+        latest_version: Optional[str] = None
+        error: Optional[str] = None
+        try:
+            latest_version = client.fetch_wheel_info(record['name']).version
+        except DownloadError as exc:
+            error = str(exc)
+        return _Result(
+            name=record['name'],
+            kind=_KINDS[record['kind']],
+            installed_version=record['version'],
+            latest_version=latest_version,
+            error=error,
+        )
+
+    def _print_table(self, results: List[_Result]) -> None:
+        self.print_table([_HEADER] + [
+            (
+                result.name,
+                result.kind,
+                result.installed_version,
+                result.latest_version or '-',
+                result.status,
+            )
+            for result in results
+        ])
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from functools import partial
+from pathlib import Path
+from typing import Callable, Optional
+
+from dl_plus import lockfile
+from dl_plus.backend import (
+    build_extractor_index, get_known_backend, invalidate_autodetect_cache,
+)
+from dl_plus.cli.args import Arg, index_url_arg, installer_arg
+from dl_plus.cli.commands.base import BaseInstallUpdateCommand
+from dl_plus.pypi import InstallRequest
+
+
+class SyncCommand(BaseInstallUpdateCommand):
+
+    short_description = 'install packages from lockfile'
+
+    long_description = """
+        Install exactly the backends and extractor plugins listed in
+        the lockfile written by the `lock` command. Package metadata is
+        taken from the lockfile, the package index is only queried if
+        dependencies of some package are not locked. All wheels are
+        downloaded concurrently before installation. Packages already
+        installed in the locked versions are skipped, packages missing
+        in the lockfile are left intact.
+    """
+
+    arguments = (
+        Arg('path', metavar='PATH', help='Lockfile path.'),
+        index_url_arg,
+        installer_arg,
+    )
+
+    def run(self):
+        try:
+            with open(self.args.path) as fobj:
+                packages = lockfile.load(fobj)
+        except OSError as exc:
+            self.die(f'failed to read lockfile: {exc}')
+        outdated = []
+        for package in packages:
+            if lockfile.is_installed(package):
+                self.print(
+                    f'{package.wheel.name} {package.wheel.version} '
+                    f'is already installed'
+                )
+            else:
+                outdated.append(package)
+        if not outdated:
+            return
+        self.print('Downloading')
+        self.wheel_installer.download_all(
+            wheel for package in outdated
+            for wheel in [package.wheel, *(package.dependencies or ())]
+        )
+        self.print(f'Using {self.wheel_installer.identifier} installer')
+        for package in outdated:
+            self.print(
+                f'Installing {package.wheel.name} {package.wheel.version}')
+        try:
+            self.wheel_installer.install_many([
+                InstallRequest(
+                    package.wheel, package.package_dir, package.extras,
+                    package.dependencies,
+                    self._get_post_install_hook(package),
+                )
+                for package in outdated
+            ])
+        finally:
+            if any(package.kind == 'backends' for package in outdated):
+                invalidate_autodetect_cache()
+        self.print('Synced')
+
+    def _get_post_install_hook(
+        self, package: lockfile.LockedPackage,
+    ) -> Optional[Callable[[Path], None]]:
+        if package.kind != 'backends':
+            return None
+        backend = get_known_backend(package.dir_name)
+        if backend is not None:
+            import_name = backend.import_name
+        else:
+            import_name = package.dir_name
+        return partial(build_extractor_index, import_name=import_name)
@@ -43,6 +43,7 @@ class _Environ:
     DATA_HOME = _EnvironVariable('DL_PLUS_DATA_HOME', 'DL_PLUS_HOME')
     CONFIG = _EnvironVariable('DL_PLUS_CONFIG')
     BACKEND = _EnvironVariable('DL_PLUS_BACKEND')
+    INDEX_URL = _EnvironVariable('DL_PLUS_INDEX_URL')
 
     def __init__(self, environ: Mapping[str, str]) -> None:
         self._environ = MappingProxyType(environ)
@@ -64,12 +65,22 @@ class Section(_StrEnum):
     MAIN = 'main'
     EXTRACTORS = 'extractors'
     BACKEND_OPTIONS = 'backend-options'
+    CACHE = 'cache'
 
     DEPRECATED_EXTRACTORS = 'extractors.enable'
 
 
 class Option(_StrEnum):
     BACKEND = 'backend'
+    INDEX_URL = 'index-url'
+    RECORD_EXTRACTOR_USAGE = 'record-extractor-usage'
+    CACHE_RESULTS = 'results'
+    CACHE_RESULTS_TTL = 'results-ttl'
+    CACHE_FAILURES = 'failures'
+    CACHE_FAILURES_TTL = 'failures-ttl'
+    CACHE_FAILURE_CLASSES = 'failure-classes'
+    CACHE_PAGES = 'pages'
+    CACHE_PAGES_MAX_SIZE = 'pages-max-size'
 
 
 class ConfigValue:
@@ -82,6 +93,12 @@ class ConfigValue:
         PLUGINS = ':plugins:'
         GENERIC = 'generic'
 
+    class FailureClass(_StrEnum):
+        UNSUPPORTED = 'unsupported'
+        NOT_FOUND = 'not-found'
+        GEO_RESTRICTED = 'geo-restricted'
+        UNAVAILABLE = 'unavailable'
+
 
 DEFAULT_CONFIG = f"""
 [{Section.MAIN}]
@@ -91,6 +108,15 @@ DEFAULT_CONFIG = f"""
 {ConfigValue.Extractor.PLUGINS}
 {ConfigValue.Extractor.BUILTINS}
 {ConfigValue.Extractor.GENERIC}
+
+[{Section.CACHE}]
+{Option.CACHE_RESULTS} = no
+{Option.CACHE_RESULTS_TTL} = 3600
+{Option.CACHE_FAILURES} = no
+{Option.CACHE_FAILURES_TTL} = 3600
+{Option.CACHE_FAILURE_CLASSES} = {ConfigValue.FailureClass.UNSUPPORTED}
+{Option.CACHE_PAGES} = no
+{Option.CACHE_PAGES_MAX_SIZE} = 32
 """
 
 
@@ -162,16 +188,19 @@ class _Config(ConfigParser):
 
 class _ConfigOptionProxy:
 
-    __slots__ = ('section', 'option')
+    __slots__ = ('section', 'option', 'required')
 
-    def __init__(self, section: str, option: str) -> None:
+    def __init__(self, section: str, option: str, required: bool = True):
         self.section = section
         self.option = option
+        self.required = required
 
     def __get__(self, instance: 'Config', owner):
         if instance is None:
             return self
-        return instance.get(self.section, self.option)
+        if self.required:
+            return instance.get(self.section, self.option)
+        return instance.get(self.section, self.option, fallback=None)
 
     def __set__(self, instance: 'Config', value: str):
         instance.set(self.section, self.option, value)
@@ -179,7 +208,7 @@ class _ConfigOptionProxy:
 
 class Config(_Config):
 
-    _UPDATE_SECTIONS = (Section.MAIN,)
+    _UPDATE_SECTIONS = (Section.MAIN, Section.CACHE)
     _REPLACE_SECTIONS = (Section.EXTRACTORS, Section.BACKEND_OPTIONS)
 
     def __init__(self) -> None:
@@ -228,6 +257,8 @@ class Config(_Config):
     def load_from_environ(self) -> None:
         if backend := _environ.BACKEND:
             self.backend = backend
+        if index_url := _environ.INDEX_URL:
+            self.index_url = index_url
 
     def _update_section(
         self, name: str, config: _Config, replace: bool,
@@ -242,6 +273,70 @@ class Config(_Config):
         section.update(config[name])
 
     backend = _ConfigOptionProxy(Section.MAIN, Option.BACKEND)
+    index_url = _ConfigOptionProxy(
+        Section.MAIN, Option.INDEX_URL, required=False)
+
+    def _get_boolean(self, section: str, option: str) -> bool:
+        try:
+            return self.getboolean(section, option, fallback=False)
+        except ValueError as exc:
+            raise ConfigError(f'invalid {option} value: {exc}') from exc
+
+    def _get_non_negative_int(self, section: str, option: str) -> int:
+        try:
+            value = self.getint(section, option)
+        except ValueError as exc:
+            raise ConfigError(f'invalid {option} value: {exc}') from exc
+        if value < 0:
+            raise ConfigError(
+                f'invalid {option} value: must be non-negative')
+        return value
+
+    @property
+    def record_extractor_usage(self) -> bool:
+        return self._get_boolean(Section.MAIN, Option.RECORD_EXTRACTOR_USAGE)
+
+    @property
+    def results_cache_ttl(self) -> Optional[int]:
+        """
+        The maximum number of seconds extraction results are cached for
+        or `None` if the cache is disabled
+        """
+        if not self._get_boolean(Section.CACHE, Option.CACHE_RESULTS):
+            return None
+        return self._get_non_negative_int(
+            Section.CACHE, Option.CACHE_RESULTS_TTL)
+
+    @property
+    def failures_cache_ttl(self) -> Optional[int]:
+        """
+        The number of seconds extraction failures are cached for
+        or `None` if the cache is disabled
+        """
+        if not self._get_boolean(Section.CACHE, Option.CACHE_FAILURES):
+            return None
+        return self._get_non_negative_int(
+            Section.CACHE, Option.CACHE_FAILURES_TTL)
+
+    @property
+    def page_cache_max_size(self) -> Optional[int]:
+        """
+        The maximum total size of cached pages in bytes (the option value
+        is in megabytes) or `None` if the cache is disabled
+        """
+        if not self._get_boolean(Section.CACHE, Option.CACHE_PAGES):
+            return None
+        return self._get_non_negative_int(
+            Section.CACHE, Option.CACHE_PAGES_MAX_SIZE) * 1024 * 1024
+
+    @property
+    def failure_classes(self) -> List[ConfigValue.FailureClass]:
+        option = Option.CACHE_FAILURE_CLASSES
+        value = self.get(Section.CACHE, option, fallback=None) or ''
+        try:
+            return [ConfigValue.FailureClass(name) for name in value.split()]
+        except ValueError as exc:
+            raise ConfigError(f'invalid {option} value: {exc}') from exc
 
     @property
     def extractors(self) -> List[str]:
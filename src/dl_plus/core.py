@@ -1,8 +1,11 @@
 import sys
+from fnmatch import fnmatchcase
 from pathlib import Path
-from typing import TYPE_CHECKING, Dict, Iterable, List, Set, Type
+from typing import (
+    TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Type,
+)
 
-from dl_plus import ytdl
+from dl_plus import packagedir, ytdl
 from dl_plus.config import ConfigValue, get_data_home
 from dl_plus.extractor import machinery
 from dl_plus.extractor.peqn import PEQN
@@ -12,6 +15,11 @@ if TYPE_CHECKING:
     from .extractor.extractor import Extractor
 
 
+# '!name' excludes extractors matched by 'name' (an exact name or a glob
+# pattern) from the ones matched by other names
+_EXCLUDE_PREFIX = '!'
+
+
 def get_extractor_plugins_dir() -> Path:
     return get_data_home() / 'extractors'
 
@@ -20,40 +28,116 @@ def get_extractor_plugin_dir(ns: str, plugin: str) -> Path:
     return get_extractor_plugins_dir() / f'{ns}-{plugin}'
 
 
-def get_extractors(names: Iterable[str]) -> List[Type['Extractor']]:
-    extractors_dict: Dict[Type['Extractor'], bool] = {}
-    added_search_paths: Set[str] = set()
+def _get_plugin_dirs(name: str) -> Iterable[Path]:
+    if name.startswith(_EXCLUDE_PREFIX):
+        return []
+    if name == ConfigValue.Extractor.PLUGINS or (
+            '/' in name and ytdl.is_glob(name)):
+        return packagedir.iter_package_dirs(get_extractor_plugins_dir())
+    if '/' in name:
+        peqn = PEQN.from_string(name)
+        return [get_extractor_plugin_dir(peqn.ns, peqn.plugin)]
+    return []
+
 
-    def maybe_add_search_path(path: Path) -> None:
-        if not path.is_dir():
-            return
-        path_str = str(path)
-        if path_str not in added_search_paths:
-            sys.path.insert(0, path_str)
-            added_search_paths.add(path_str)
+def get_extractor_search_paths(names: Iterable[str]) -> List[str]:
+    """
+    Return the active directories of extractor plugins required
+    to load the extractors, in the order they are added to `sys.path`
 
+    Only the file system is accessed, so the search paths can be
+    discovered while the backend is being initialized.
+    """
+    search_paths: List[str] = []
+    for name in names:
+        for plugin_dir in _get_plugin_dirs(name):
+            path = packagedir.get_active_dir(plugin_dir)
+            if not path:
+                continue
+            path_str = str(path)
+            if path_str not in search_paths:
+                search_paths.append(path_str)
+    return search_paths
+
+
+def get_extractors(
+    names: Iterable[str], search_paths: Optional[Iterable[str]] = None,
+) -> List[Type['Extractor']]:
+    """
+    :param search_paths: the result of `get_extractor_search_paths()`
+        if it is already called for the names.
+    """
+    names = list(names)
+    if search_paths is None:
+        search_paths = get_extractor_search_paths(names)
+    for path in search_paths:
+        sys.path.insert(0, path)
+    exclude = _get_exclusion_filter(
+        name[len(_EXCLUDE_PREFIX):] for name in names
+        if name.startswith(_EXCLUDE_PREFIX)
+    )
+    extractors_dict: Dict[Type['Extractor'], bool] = {}
     for name in names:
+        if name.startswith(_EXCLUDE_PREFIX):
+            continue
         if name == ConfigValue.Extractor.BUILTINS:
             extractors = ytdl.get_all_extractors(include_generic=False)
         elif name == ConfigValue.Extractor.PLUGINS:
-            extractor_plugins_dir = get_extractor_plugins_dir()
-            if extractor_plugins_dir.is_dir():
-                for path in extractor_plugins_dir.iterdir():
-                    maybe_add_search_path(path)
             extractors = machinery.load_all_extractors()
+        elif '/' in name and ytdl.is_glob(name):
+            extractors = [
+                extractor for extractor in machinery.load_all_extractors()
+                if _match_plugin_extractor(extractor.ie_key(), name)
+            ]
         elif '/' in name:
-            peqn = PEQN.from_string(name)
-            maybe_add_search_path(get_extractor_plugin_dir(
-                peqn.ns, peqn.plugin))
-            extractors = machinery.load_extractors_by_peqn(peqn)
+            extractors = machinery.load_extractors_by_peqn(
+                PEQN.from_string(name))
         else:
             extractors = ytdl.get_extractors_by_name(name)
         for extractor in extractors:
-            if extractor not in extractors_dict:
-                extractors_dict[extractor] = True
+            if extractor in extractors_dict:
+                continue
+            if exclude is not None and exclude(extractor):
+                continue
+            extractors_dict[extractor] = True
     return list(extractors_dict.keys())
 
 
-def enable_extractors(names) -> None:
-    extractors = get_extractors(names)
-    ytdl.patch_extractors(extractors)
+def _match_plugin_extractor(ie_key: str, pattern: str) -> bool:
+    # 'ns/plugin' matches 'ns/plugin' and 'ns/plugin:name'
+    return fnmatchcase(ie_key, pattern) or fnmatchcase(ie_key, f'{pattern}:*')
+
+
+def _get_exclusion_filter(
+    names: Iterable[str],
+) -> Optional[Callable[[Type['Extractor']], bool]]:
+    # built-in extractors are compared by keys, so that neither
+    # the excluded extractors are imported nor lazy extractors
+    # returned by `:builtins:` are resolved
+    excluded_keys = set()
+    plugin_patterns = []
+    for name in names:
+        if '/' in name:
+            plugin_patterns.append(name)
+        else:
+            excluded_keys.update(ytdl.get_extractor_keys_by_name(name))
+    if not excluded_keys and not plugin_patterns:
+        return None
+
+    def exclude(extractor: Type['Extractor']) -> bool:
+        ie_key = extractor.ie_key()
+        return ie_key in excluded_keys or any(
+            _match_plugin_extractor(ie_key, pattern)
+            for pattern in plugin_patterns
+        )
+
+    return exclude
+
+
+def enable_extractors(
+    names: Iterable[str], search_paths: Optional[Iterable[str]] = None,
+    on_use: Optional[Callable[[Type['Extractor']], None]] = None,
+) -> None:
+    extractors = get_extractors(names, search_paths)
+    machinery.install_url_matcher(extractors)
+    ytdl.patch_extractors(extractors, on_use)
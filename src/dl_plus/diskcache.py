@@ -0,0 +1,176 @@
+"""
+A size-bounded on-disk key-value cache
+
+Every entry is stored in a separate file named after the key digest,
+along with the digest itself (keys may contain credentials and are never
+stored) and the expiration time. Entries are written atomically (to
+a temporary file, then renamed), so readers never see partially written
+entries and need no locking. Reading an entry updates
+the file modification time (expired entries are removed instead), the
+least recently used entries are evicted under an inter-process lock when
+the total size exceeds the limit. Since eviction scans the directory, it
+is done periodically: every `evict_interval` writes counted (without
+locking) by appending a byte to a counter file. The total size can
+therefore exceed the limit by the size of the entries written since
+the last eviction.
+
+The cache is best effort: any I/O error results in a miss.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import struct
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from dl_plus.utils import FileLock
+
+
+_MAGIC = b'DLPC'
+# magic, format version, expiration time, key digest
+_HEADER = struct.Struct('!4sHd32s')
+_VERSION = 2
+
+_LOCK_NAME = '.lock'
+_WRITES_NAME = '.writes'
+_TMP_PREFIX = '.'
+
+EVICT_INTERVAL = 32
+
+
+class DiskCache:
+
+    def __init__(
+        self, directory: Path, max_size: int,
+        evict_interval: int = EVICT_INTERVAL,
+    ) -> None:
+        """
+        :param max_size: the maximum total size of entries in bytes.
+        :param evict_interval: the number of writes between evictions.
+        """
+        self.directory = directory
+        self.max_size = max_size
+        self.evict_interval = evict_interval
+
+    def _get_path(self, key: str) -> Path:
+        return self.directory / _get_digest(key).hex()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the value or `None` if there is no unexpired entry."""
+        path = self._get_path(key)
+        try:
+            with open(path, 'rb') as fobj:
+                data = fobj.read()
+        except OSError:
+            return None
+        entry = _unpack(data)
+        if entry is None or entry[0] != _get_digest(key):
+            return None
+        if entry[1] <= time.time():
+            self._unlink(path)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry[2]
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        """Store the value for `ttl` seconds."""
+        if ttl <= 0:
+            return
+        data = _HEADER.pack(
+            _MAGIC, _VERSION, time.time() + ttl, _get_digest(key)) + value
+        if len(data) > self.max_size:
+            return
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(
+                prefix=_TMP_PREFIX, suffix='.tmp', dir=self.directory)
+            try:
+                with os.fdopen(fd, 'wb') as fobj:
+                    fobj.write(data)
+                os.replace(tmp_path, self._get_path(key))
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+            if self._count_write() >= self.evict_interval:
+                self.evict()
+        except OSError:
+            pass
+
+    def _count_write(self) -> int:
+        """Return the number of writes since the last eviction."""
+        fd = os.open(
+            self.directory / _WRITES_NAME,
+            os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644,
+        )
+        try:
+            os.write(fd, b'.')
+            return os.fstat(fd).st_size
+        finally:
+            os.close(fd)
+
+    def delete(self, key: str) -> None:
+        self._unlink(self._get_path(key))
+
+    def _unlink(self, path: Path) -> None:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+    def _scan(self) -> List[Tuple[float, int, Path]]:
+        entries = []
+        with os.scandir(self.directory) as it:
+            for dir_entry in it:
+                if dir_entry.name.startswith(_TMP_PREFIX):
+                    continue
+                try:
+                    stat = dir_entry.stat()
+                except OSError:
+                    continue
+                entries.append(
+                    (stat.st_mtime, stat.st_size, Path(dir_entry.path)))
+        return entries
+
+    def evict(self) -> None:
+        """
+        Remove the least recently used entries until the total size fits
+        the limit
+        """
+        with FileLock(self.directory / _LOCK_NAME):
+            self._unlink(self.directory / _WRITES_NAME)
+            entries = self._scan()
+            size = sum(entry[1] for entry in entries)
+            if size <= self.max_size:
+                return
+            entries.sort()
+            for _, entry_size, path in entries:
+                if size <= self.max_size:
+                    break
+                self._unlink(path)
+                size -= entry_size
+
+    def clear(self) -> None:
+        with FileLock(self.directory / _LOCK_NAME):
+            for _, _, path in self._scan():
+                self._unlink(path)
+
+
+def _get_digest(key: str) -> bytes:
+    return hashlib.sha256(key.encode()).digest()
+
+
+def _unpack(data: bytes) -> Optional[Tuple[bytes, float, bytes]]:
+    try:
+        magic, version, expires, digest = _HEADER.unpack_from(data)
+    except struct.error:
+        return None
+    if magic != _MAGIC or version != _VERSION:
+        return None
+    return digest, expires, data[_HEADER.size:]
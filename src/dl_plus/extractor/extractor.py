@@ -1,8 +1,10 @@
-import re
 from typing import Match, Optional
 
 from dl_plus import deprecated, ytdl
 
+from . import httpcache
+from .urlmatcher import URLMatcher, compile_valid_url
+
 
 InfoExtractor = ytdl.import_from('extractor.common', 'InfoExtractor')
 ExtractorError = ytdl.import_from('utils', 'ExtractorError')
@@ -28,14 +30,35 @@ class Extractor(InfoExtractor):
             valid_url = cls._VALID_URL
             if valid_url is False:
                 return None
-            if not isinstance(valid_url, str):
-                # multiple _VALID_URL is not (yet?) supported
-                raise ExtractorError(
-                    f'_VALID_URL: string expected, got: {valid_url!r}')
-            # a copy/paste from youtube-dl
-            if '_VALID_URL_RE' not in cls.__dict__:
-                cls._VALID_URL_RE = re.compile(valid_url)
-            return cls._VALID_URL_RE.match(url)
+            # youtube-dl expects `_VALID_URL_RE` to be a single pattern
+            if '_DLP_VALID_URL_RE' not in cls.__dict__:
+                try:
+                    cls._DLP_VALID_URL_RE = compile_valid_url(valid_url)
+                except TypeError as exc:
+                    raise ExtractorError(str(exc)) from exc
+            for regex in cls._DLP_VALID_URL_RE:
+                match = regex.match(url)
+                if match:
+                    return match
+            return None
+
+        @classmethod
+        def _match_id(cls, url: str) -> str:
+            match = cls._match_valid_url(url)
+            assert match
+            return match.group('id')
+
+    @classmethod
+    def suitable(cls, url: str) -> bool:
+        # see `install_url_matcher()`
+        if _url_matcher is not None and cls in _url_matcher:
+            owner = _url_matcher.match(url)
+            if owner is cls:
+                return True
+            if owner is None:
+                return False
+            # a preceding extractor owns the URL
+        return cls._match_valid_url(url) is not None
 
     if (
             ytdl.get_ytdl_module_name() == 'yt_dlp'
@@ -53,8 +76,54 @@ class Extractor(InfoExtractor):
     DLP_BASE_URL: Optional[str] = None
     DLP_REL_URL: Optional[str] = None
 
+    # Cache responses of `_download_webpage_handle()` and the helpers
+    # using it, see `dl_plus.extractor.httpcache`.
+    DLP_HTTP_CACHE: bool = False
+    # The number of seconds responses are cached for, overrides
+    # `Cache-Control: max-age` of the responses.
+    DLP_HTTP_CACHE_TTL: Optional[float] = None
+    # The maximum number of seconds extraction results are cached for
+    # (if the cache is enabled, see `dl_plus.resultcache`), overrides
+    # `results-ttl` of the `[cache]` config section, 0 disables caching.
+    DLP_RESULT_CACHE_TTL: Optional[float] = None
+
+    def _download_webpage_handle(self, *args, **kwargs):
+        if not self.DLP_HTTP_CACHE:
+            return super()._download_webpage_handle(*args, **kwargs)
+        return httpcache.download_webpage_handle(
+            self, super()._download_webpage_handle, args, kwargs)
+
     @classmethod
     def dlp_match(cls, url: str) -> Optional[Match[str]]:
         deprecated.warn(
             'dlp_match() is deprecated, use _match_valid_url() instead')
         return cls._match_valid_url(url)
+
+
+_url_matcher: Optional[URLMatcher] = None
+
+
+def _is_matchable(extractor) -> bool:
+    # extractors with custom matching logic match URLs on their own
+    return (
+        isinstance(extractor, type)
+        and issubclass(extractor, Extractor)
+        and extractor.suitable.__func__ is Extractor.suitable.__func__
+        and (
+            extractor._match_valid_url.__func__
+            is Extractor._match_valid_url.__func__
+        )
+    )
+
+
+def install_url_matcher(extractors) -> None:
+    """
+    Build the combined URL matcher (see `dl_plus.extractor.urlmatcher`)
+    of the enabled extractor plugins, so that `Extractor.suitable()` does
+    not match URLs against patterns of every plugin extractor separately
+    """
+    global _url_matcher
+    _url_matcher = URLMatcher(
+        (extractor, extractor._VALID_URL)
+        for extractor in extractors if _is_matchable(extractor)
+    )
@@ -0,0 +1,169 @@
+"""
+HTTP response cache of extractors
+
+Extractors with `DLP_HTTP_CACHE` enabled store successful responses
+of GET requests made with `_download_webpage_handle()` and the helpers
+built on it (`_download_webpage()`, `_download_json()`, etc.) in
+`$DL_PLUS_DATA_HOME/cache/http`. A response is stored for
+`DLP_HTTP_CACHE_TTL` seconds if set, otherwise for `max-age` seconds of
+its `Cache-Control` header. Responses with `Cache-Control: no-store`
+or cookies are never stored.
+
+The cache is disabled by the `--no-cache-dir` backend option.
+"""
+
+from __future__ import annotations
+
+import functools
+import inspect
+import io
+import json
+import urllib.response
+from email.message import Message
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from dl_plus import ytdl
+from dl_plus.config import get_data_home
+from dl_plus.diskcache import DiskCache
+
+
+MAX_SIZE = 64 * 1024 * 1024
+
+
+def get_cache_dir() -> Path:
+    return get_data_home() / 'cache' / 'http'
+
+
+def get_cache() -> DiskCache:
+    return DiskCache(get_cache_dir(), MAX_SIZE)
+
+
+def _parse_cache_control(headers: Message) -> Dict[str, str]:
+    directives = {}
+    for value in headers.get_all('Cache-Control') or ():
+        for directive in value.split(','):
+            name, _, arg = directive.partition('=')
+            directives[name.strip().lower()] = arg.strip().strip('"')
+    return directives
+
+
+def get_ttl(
+    headers: Message, declared_ttl: Optional[float],
+) -> Optional[float]:
+    """
+    Return the number of seconds the response can be stored for
+    or `None` if the response is not to be stored
+    """
+    if headers.get('Set-Cookie'):
+        return None
+    directives = _parse_cache_control(headers)
+    if 'no-store' in directives:
+        return None
+    if declared_ttl is not None:
+        return declared_ttl
+    if 'no-cache' in directives:
+        return None
+    try:
+        ttl = int(directives['max-age']) - int(headers.get('Age') or 0)
+    except (KeyError, ValueError):
+        return None
+    return ttl if ttl > 0 else None
+
+
+@functools.lru_cache(maxsize=None)
+def _get_signature(func: Callable) -> inspect.Signature:
+    return inspect.signature(func)
+
+
+def _get_response_class() -> Optional[type]:
+    try:
+        return ytdl.import_from('networking.common', 'Response')
+    except ImportError:
+        # youtube-dl and old yt-dlp versions return urllib responses
+        return None
+
+
+def make_response(
+    url: str, status: int, header_items: list, content: bytes = b'',
+) -> Any:
+    """Return a response handle reading `content`."""
+    headers = Message()
+    for name, value in header_items:
+        headers[name] = value
+    fp = io.BytesIO(content)
+    response_class = _get_response_class()
+    if response_class is not None:
+        return response_class(fp, url, headers, status)
+    return urllib.response.addinfourl(fp, headers, url, status)
+
+
+def get_response_status(urlh) -> int:
+    return getattr(urlh, 'status', None) or urlh.getcode()
+
+
+def get_response_url(urlh) -> str:
+    return getattr(urlh, 'url', None) or urlh.geturl()
+
+
+def get_request_key(
+    download: Callable, ie, args: tuple, kwargs: Dict[str, Any],
+    *extra: Any,
+) -> Optional[str]:
+    """
+    Return the cache key of the `_download_webpage_handle()`
+    or `_request_webpage()` call or `None` if the request is not cacheable
+
+    :param download: the called backend function.
+    :param extra: additional key parts.
+    """
+    arguments = _get_signature(download).bind(ie, *args, **kwargs).arguments
+    url = arguments['url_or_request']
+    # requests objects are not cached, neither are POST requests
+    if not isinstance(url, str) or arguments.get('data') is not None:
+        return None
+    return json.dumps([
+        *extra,
+        url.partition('#')[0],
+        sorted((arguments.get('query') or {}).items()),
+        sorted((arguments.get('headers') or {}).items()),
+        arguments.get('encoding'),
+        arguments.get('impersonate'),
+    ], default=str)
+
+
+def download_webpage_handle(
+    ie, download: Callable, args: tuple, kwargs: Dict[str, Any],
+) -> Any:
+    """
+    Call `download` (the backend `_download_webpage_handle()` method
+    bound to the extractor) with the arguments or return the cached result
+    """
+    downloader_params = getattr(ie._downloader, 'params', None) or {}
+    if downloader_params.get('cachedir') is False:
+        return download(*args, **kwargs)
+    key = get_request_key(download.__func__, ie, args, kwargs, ie.ie_key())
+    if key is None:
+        return download(*args, **kwargs)
+    cache = get_cache()
+    cached = cache.get(key)
+    if cached is not None:
+        try:
+            url, status, header_items, content = json.loads(cached)
+            return content, make_response(url, status, header_items)
+        except (ValueError, TypeError):
+            cache.delete(key)
+    result = download(*args, **kwargs)
+    if result is False:
+        return result
+    content, urlh = result
+    status = get_response_status(urlh)
+    if not 200 <= status < 300:
+        return result
+    ttl = get_ttl(urlh.headers, ie.DLP_HTTP_CACHE_TTL)
+    if ttl is not None:
+        cache.set(key, json.dumps([
+            get_response_url(urlh), status, list(urlh.headers.items()),
+            content,
+        ]).encode(), ttl)
+    return result
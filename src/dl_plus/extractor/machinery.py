@@ -1,8 +1,11 @@
 import importlib
 import itertools
+import json
 import os
 import os.path
 import pkgutil
+import sys
+import zipimport
 
 from dl_plus.const import PLUGINS_PACKAGE
 from dl_plus.exceptions import DLPlusException
@@ -10,11 +13,26 @@ from dl_plus.exceptions import DLPlusException
 from .peqn import PEQN
 
 
+# the list of plugin import paths stored in the plugins package directory
+# of bundles (see `dl_plus.bundle`), zip archives cannot be scanned
+PLUGIN_MANIFEST_FILENAME = 'plugins.json'
+
+
 class ExtractorLoadError(DLPlusException):
 
     pass
 
 
+def _read_plugin_manifest(ns_path):
+    try:
+        importer = zipimport.zipimporter(ns_path)
+        data = importer.get_data(
+            os.path.join(ns_path, PLUGIN_MANIFEST_FILENAME))
+        return json.loads(data)
+    except (zipimport.ZipImportError, OSError, ValueError):
+        return []
+
+
 def discover_extractor_plugins_gen():
     try:
         extractors_package = importlib.import_module(PLUGINS_PACKAGE)
@@ -22,6 +40,7 @@ def discover_extractor_plugins_gen():
         return
     for ns_path in extractors_package.__path__:
         if not os.path.isdir(ns_path):
+            yield from _read_plugin_manifest(ns_path)
             continue
         for entry in os.scandir(ns_path):
             if not entry.is_dir():
@@ -73,3 +92,15 @@ def load_all_extractors():
             discover_extractor_plugins_gen(),
         )
     ))
+
+
+def install_url_matcher(extractors):
+    """
+    Build the combined URL matcher of the enabled plugin extractors,
+    see `dl_plus.extractor.extractor.install_url_matcher()`
+    """
+    # the module is imported by plugins, it is not imported (and
+    # there is nothing to match) if no plugins are loaded
+    extractor_module = sys.modules.get(f'{__package__}.extractor')
+    if extractor_module is not None:
+        extractor_module.install_url_matcher(extractors)
@@ -0,0 +1,136 @@
+"""
+Per-run in-memory page cache
+
+If enabled by the `pages` option of the `[cache]` config section,
+successful responses of GET requests made with `_request_webpage()` (and
+the helpers built on it, `_download_webpage_handle()`,
+`_download_webpage()`, `_download_json()`, etc.) of all extractors are
+kept in memory until the process exits, so that when an extractor
+delegates to another one or falls back to the generic extractor, the same
+page is not downloaded again. A response is stored once its content is
+read to the end, so responses the caller does not read (e.g., direct media
+links the generic extractor only peeks at) are not. The cache is limited
+by the total size of the pages (`pages-max-size` megabytes), the least
+recently used pages are evicted first.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, List, Optional, Tuple
+
+from dl_plus import ytdl
+
+from .httpcache import (
+    get_request_key, get_response_status, get_response_url, make_response,
+)
+
+
+# content, final URL, status, header items
+_Page = Tuple[bytes, str, int, list]
+
+
+class PageCache:
+
+    def __init__(self, max_size: int) -> None:
+        """
+        :param max_size: the maximum total size of pages in bytes.
+        """
+        self.max_size = max_size
+        self.size = 0
+        self._pages: OrderedDict[str, Tuple[_Page, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[_Page]:
+        with self._lock:
+            try:
+                page, _ = self._pages[key]
+            except KeyError:
+                return None
+            self._pages.move_to_end(key)
+            return page
+
+    def set(self, key: str, page: _Page) -> None:
+        size = len(page[0])
+        if size > self.max_size:
+            return
+        with self._lock:
+            old = self._pages.pop(key, None)
+            if old is not None:
+                self.size -= old[1]
+            self._pages[key] = (page, size)
+            self.size += size
+            while self.size > self.max_size:
+                _, (_, evicted_size) = self._pages.popitem(last=False)
+                self.size -= evicted_size
+
+
+_cache: Optional[PageCache] = None
+
+
+def _on_read_to_end(
+    urlh, max_size: int, callback: Callable[[bytes], None],
+) -> None:
+    """
+    Patch `urlh.read()` to call `callback` with the content once it is
+    read to the end unless it is larger than `max_size` bytes
+    """
+    read = urlh.read
+    chunks: Optional[List[bytes]] = []
+    size = 0
+
+    def _read(amt: Optional[int] = None) -> bytes:
+        nonlocal chunks, size
+        data = read(amt)
+        if chunks is None:
+            return data
+        chunks.append(data)
+        size += len(data)
+        if size > max_size:
+            chunks = None
+        elif amt is None or amt < 0 or not data:
+            content, chunks = b''.join(chunks), None
+            callback(content)
+        return data
+
+    urlh.read = _read
+
+
+def install(max_size: int) -> None:
+    """
+    Patch `InfoExtractor._request_webpage()` of the backend to cache pages
+
+    :param max_size: the maximum total size of pages in bytes.
+    """
+    global _cache
+    if _cache is not None:
+        return
+    _cache = cache = PageCache(max_size)
+    InfoExtractor = ytdl.import_from('extractor.common', 'InfoExtractor')
+    request = InfoExtractor._request_webpage
+
+    def _request_webpage(self, *args, **kwargs) -> Any:
+        # geo bypass headers are added by the backend
+        key = get_request_key(
+            request, self, args, kwargs,
+            getattr(self, '_x_forwarded_for_ip', None),
+        )
+        if key is None:
+            return request(self, *args, **kwargs)
+        page = cache.get(key)
+        if page is not None:
+            content, url, status, header_items = page
+            return make_response(url, status, header_items, content)
+        urlh = request(self, *args, **kwargs)
+        if urlh is False:
+            return urlh
+        status = get_response_status(urlh)
+        if 200 <= status < 300:
+            url = get_response_url(urlh)
+            header_items = list(urlh.headers.items())
+            _on_read_to_end(urlh, max_size, lambda content: cache.set(
+                key, (content, url, status, header_items)))
+        return urlh
+
+    InfoExtractor._request_webpage = _request_webpage
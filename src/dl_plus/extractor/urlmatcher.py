@@ -0,0 +1,127 @@
+"""
+Combined URL matcher
+
+The backend asks extractors one by one whether they are suitable for
+a URL, so every extractor pattern is compiled and matched separately.
+`URLMatcher` combines patterns of many extractors into a single regular
+expression, an alternation of per-extractor groups, so that one pass
+tells which extractor (the first one in order) owns a URL.
+
+Named groups of the patterns are turned into non-capturing ones (the same
+name is used by most patterns, and the groups are not needed to find the
+owner), leading inline flags are turned into scoped ones. Patterns that
+cannot be combined this way (backreferences, etc.) are left out, their
+extractors match URLs on their own.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import (
+    Generic, Hashable, Iterable, List, Optional, Pattern, Tuple, TypeVar,
+    Union,
+)
+
+
+ValidURL = Union[str, Tuple[str, ...], List[str]]
+
+_Owner = TypeVar('_Owner', bound=Hashable)
+
+_LEADING_FLAGS_REGEX = re.compile(r'\(\?([aiLmsux]+)\)')
+_NAMED_GROUP_REGEX = re.compile(r'\(\?P<[^>]+>')
+# backreferences depend on group names and numbers
+_BACKREFERENCE_REGEX = re.compile(r'\(\?P=|\\[1-9]')
+
+_GROUP_PREFIX = '_dlp'
+
+
+def get_patterns(valid_url: ValidURL) -> Tuple[str, ...]:
+    """
+    Return patterns of the `_VALID_URL` value
+
+    :raises TypeError: if the value is neither a string nor a sequence
+        of strings.
+    """
+    if isinstance(valid_url, str):
+        return (valid_url,)
+    if isinstance(valid_url, (tuple, list)) and all(
+            isinstance(item, str) for item in valid_url):
+        return tuple(valid_url)
+    raise TypeError(
+        f'_VALID_URL: string or sequence of strings expected, '
+        f'got: {valid_url!r}'
+    )
+
+
+def compile_valid_url(valid_url: ValidURL) -> Tuple[Pattern[str], ...]:
+    return tuple(map(re.compile, get_patterns(valid_url)))
+
+
+def _to_alternative(pattern: str) -> Optional[str]:
+    if _BACKREFERENCE_REGEX.search(pattern):
+        return None
+    alternative = _NAMED_GROUP_REGEX.sub('(?:', pattern)
+    match = _LEADING_FLAGS_REGEX.match(alternative)
+    if match:
+        # a newline ends a possible trailing comment of verbose patterns
+        alternative = f'(?{match[1]}:{alternative[match.end():]}\n)'
+    try:
+        re.compile(alternative)
+    except re.error:
+        return None
+    return alternative
+
+
+class URLMatcher(Generic[_Owner]):
+
+    def __init__(self, patterns: Iterable[Tuple[_Owner, ValidURL]]) -> None:
+        """
+        :param patterns: owners (extractors) and their `_VALID_URL` values
+            in the matching order.
+        """
+        self._owners: list[_Owner] = []
+        alternatives: list[str] = []
+        for owner, valid_url in patterns:
+            try:
+                _patterns = get_patterns(valid_url)
+            except TypeError:
+                continue
+            _alternatives = [
+                alternative
+                for alternative in map(_to_alternative, _patterns)
+                if alternative is not None
+            ]
+            # all patterns of the extractor or none of them are combined
+            if not _alternatives or len(_alternatives) < len(_patterns):
+                continue
+            group_name = f'{_GROUP_PREFIX}{len(self._owners)}'
+            self._owners.append(owner)
+            alternatives.append(
+                f'(?P<{group_name}>{"|".join(_alternatives)})')
+        self._owner_set = frozenset(self._owners)
+        self._regex: Optional[Pattern[str]] = None
+        if alternatives:
+            self._regex = re.compile('|'.join(alternatives))
+        self._last: Optional[Tuple[str, Optional[_Owner]]] = None
+
+    def __contains__(self, owner: object) -> bool:
+        """Check whether URLs of the owner are matched by the matcher."""
+        return owner in self._owner_set
+
+    def match(self, url: str) -> Optional[_Owner]:
+        """
+        Return the first owner whose pattern matches the URL or `None`
+        if there is no such owner
+        """
+        last = self._last
+        if last is not None and last[0] == url:
+            return last[1]
+        owner = None
+        if self._regex is not None:
+            match = self._regex.match(url)
+            if match:
+                assert match.lastgroup
+                owner = self._owners[
+                    int(match.lastgroup[len(_GROUP_PREFIX):])]
+        self._last = (url, owner)
+        return owner
@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import base64
+import threading
+from collections import defaultdict
+from http.client import (
+    HTTPConnection, HTTPException, HTTPMessage, HTTPResponse, HTTPSConnection,
+)
+from typing import Dict, List, Mapping, Optional, Tuple
+from urllib.parse import SplitResult, unquote, urljoin, urlsplit
+from urllib.request import getproxies, proxy_bypass
+
+from dl_plus.const import DL_PLUS_VERSION
+
+
+DEFAULT_TIMEOUT = 30
+
+_MAX_REDIRECTS = 5
+_REDIRECT_CODES = (301, 302, 303, 307, 308)
+_USER_AGENT = f'dl-plus/{DL_PLUS_VERSION}'
+
+# errors signaling that the server has closed an idle keep-alive connection
+_STALE_CONNECTION_ERRORS = (
+    ConnectionResetError, ConnectionAbortedError, BrokenPipeError,
+    HTTPException,
+)
+
+
+_HostKey = Tuple[str, str, Optional[int]]
+
+
+class _Proxy:
+
+    def __init__(self, url: str) -> None:
+        """
+        :raises OSError: if the proxy URL is not supported.
+        """
+        # 'host:port' is accepted by urllib as well
+        if '://' not in url:
+            url = f'http://{url}'
+        parsed: SplitResult = urlsplit(url)
+        if parsed.scheme.lower() != 'http' or not parsed.hostname:
+            raise OSError(f'unsupported proxy: {url}')
+        self.host = parsed.hostname
+        self.port = parsed.port or 80
+        self.headers: Dict[str, str] = {}
+        if parsed.username is not None:
+            credentials = (
+                f'{unquote(parsed.username)}:'
+                f'{unquote(parsed.password or "")}'
+            )
+            self.headers['Proxy-Authorization'] = 'Basic {}'.format(
+                base64.b64encode(credentials.encode()).decode())
+
+
+class HTTPError(OSError):
+
+    def __init__(self, url: str, code: int, reason: str) -> None:
+        super().__init__(f'HTTP Error {code}: {reason}')
+        self.url = url
+        self.code = code
+        self.reason = reason
+
+
+class Response:
+    """
+    A thin wrapper around :class:`http.client.HTTPResponse`
+
+    The underlying connection is returned to the pool when the response
+    is closed after the body has been read completely, otherwise it is
+    discarded.
+    """
+
+    def __init__(
+        self, client: HTTPClient, key: _HostKey,
+        connection: HTTPConnection, response: HTTPResponse, url: str,
+    ) -> None:
+        self._client = client
+        self._key = key
+        self._connection: Optional[HTTPConnection] = connection
+        self._response = response
+        self.url = url
+
+    @property
+    def status(self) -> int:
+        return self._response.status
+
+    @property
+    def reason(self) -> str:
+        return self._response.reason
+
+    @property
+    def headers(self) -> HTTPMessage:
+        return self._response.headers
+
+    def read(self, amt: Optional[int] = None) -> bytes:
+        response = self._response
+        try:
+            data = response.read(amt)
+        except HTTPException as exc:
+            raise OSError(f'{self.url}: {exc!r}') from exc
+        if not data and amt != 0 and response.length:
+            # http.client silently treats a premature connection close
+            # as the end of the body when reading in chunks
+            raise OSError(
+                f'{self.url}: connection closed, '
+                f'{response.length} more bytes expected'
+            )
+        return data
+
+    def close(self) -> None:
+        connection = self._connection
+        if connection is None:
+            return
+        self._connection = None
+        response = self._response
+        if response.isclosed() and not response.will_close:
+            self._client._release(self._key, connection)
+        else:
+            response.close()
+            connection.close()
+
+    def __enter__(self) -> Response:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class HTTPClient:
+    """
+    A minimal HTTP/1.1 client keeping one or more keep-alive connections
+    per host
+
+    The client is thread-safe: every request takes an idle connection
+    from the pool (or opens a new one) and returns it back when
+    the response is closed.
+
+    Proxies are configured the same way as for `urllib`: `http_proxy`,
+    `https_proxy` and `no_proxy` environment variables or the system
+    settings (see `urllib.request.getproxies()`). Only HTTP proxies are
+    supported, HTTPS requests are tunneled with `CONNECT`.
+    """
+
+    def __init__(
+        self, timeout: float = DEFAULT_TIMEOUT, max_idle_per_host: int = 4,
+    ) -> None:
+        self.timeout = timeout
+        self.max_idle_per_host = max_idle_per_host
+        self._idle: Dict[_HostKey, List[HTTPConnection]] = defaultdict(list)
+        self._lock = threading.Lock()
+        self._proxy_urls = getproxies()
+        self._proxies: Dict[_HostKey, Optional[_Proxy]] = {}
+
+    def _get_proxy(self, key: _HostKey) -> Optional[_Proxy]:
+        with self._lock:
+            if key in self._proxies:
+                return self._proxies[key]
+        scheme, host, port = key
+        proxy_url = self._proxy_urls.get(scheme)
+        proxy = None
+        if proxy_url and not proxy_bypass(
+                host if port is None else f'{host}:{port}'):
+            proxy = _Proxy(proxy_url)
+        with self._lock:
+            self._proxies[key] = proxy
+        return proxy
+
+    def _acquire(self, key: _HostKey) -> Tuple[HTTPConnection, bool]:
+        with self._lock:
+            idle = self._idle[key]
+            if idle:
+                return idle.pop(), True
+        scheme, host, port = key
+        connection_cls: type[HTTPConnection]
+        if scheme == 'https':
+            connection_cls = HTTPSConnection
+        else:
+            connection_cls = HTTPConnection
+        proxy = self._get_proxy(key)
+        if proxy is None:
+            return connection_cls(host, port, timeout=self.timeout), False
+        connection = connection_cls(
+            proxy.host, proxy.port, timeout=self.timeout)
+        if scheme == 'https':
+            connection.set_tunnel(host, port, headers=proxy.headers)
+        return connection, False
+
+    def _release(self, key: _HostKey, connection: HTTPConnection) -> None:
+        with self._lock:
+            idle = self._idle[key]
+            if len(idle) < self.max_idle_per_host:
+                idle.append(connection)
+                return
+        connection.close()
+
+    def close(self) -> None:
+        with self._lock:
+            connections = [
+                conn for idle in self._idle.values() for conn in idle]
+            self._idle.clear()
+        for connection in connections:
+            connection.close()
+
+    def __enter__(self) -> HTTPClient:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _send(
+        self, method: str, url: str, headers: Mapping[str, str],
+    ) -> Response:
+        parsed = urlsplit(url)
+        scheme = parsed.scheme.lower()
+        if scheme not in ('http', 'https') or not parsed.hostname:
+            raise ValueError(f'unsupported URL: {url}')
+        key = (scheme, parsed.hostname, parsed.port)
+        target = parsed.path or '/'
+        if parsed.query:
+            target = f'{target}?{parsed.query}'
+        _headers = {'User-Agent': _USER_AGENT, **headers}
+        proxy = self._get_proxy(key)
+        if proxy is not None and scheme == 'http':
+            # plain HTTP requests are sent to the proxy as is
+            target = f'http://{parsed.netloc}{target}'
+            _headers.update(proxy.headers)
+        while True:
+            connection, reused = self._acquire(key)
+            try:
+                connection.request(method, target, headers=_headers)
+                response = connection.getresponse()
+            except _STALE_CONNECTION_ERRORS as exc:
+                connection.close()
+                if reused:
+                    # the server has dropped the idle connection, retry
+                    # with a fresh one
+                    continue
+                if isinstance(exc, HTTPException):
+                    raise OSError(f'{url}: {exc!r}') from exc
+                raise
+            except BaseException:
+                connection.close()
+                raise
+            return Response(self, key, connection, response, url)
+
+    def request(
+        self, url: str, headers: Optional[Mapping[str, str]] = None,
+        method: str = 'GET',
+    ) -> Response:
+        """
+        Send the request and return the response, following redirects
+
+        :raises HTTPError: if the final response status is not 2xx.
+        :raises OSError: on network errors.
+        """
+        _headers = dict(headers or {})
+        for _ in range(_MAX_REDIRECTS + 1):
+            response = self._send(method, url, _headers)
+            status = response.status
+            location = response.headers.get('Location')
+            if status in _REDIRECT_CODES and location:
+                response.read()
+                response.close()
+                url = urljoin(url, location)
+                continue
+            if 200 <= status < 300:
+                return response
+            response.read()
+            response.close()
+            raise HTTPError(url, status, response.reason)
+        raise HTTPError(url, status, 'too many redirects')
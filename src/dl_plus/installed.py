@@ -0,0 +1,318 @@
+"""
+Installed packages database
+
+`installed.json` in the data home directory describes every installed
+backend and extractor plugin (project name, version, wheel sha256 and, for
+plugins, names of extractors found by parsing plugin modules), so that
+list commands do not need to walk package directories, read metadata
+files or import plugins. The database is updated by install/update/
+uninstall commands and rebuilt from package directories if missing or
+stale: modification times of the `backends` and `extractors` directories
+are stored along with the records, any change of their entries (installs
+and removals of versions, switching the active version, etc., including
+the ones made by other tools or by hand) invalidates the database.
+"""
+
+from __future__ import annotations
+
+import ast
+import json
+import os
+from pathlib import Path
+from typing import AbstractSet, Dict, List, Optional, Set
+
+from dl_plus import packagedir
+from dl_plus.config import get_data_home
+from dl_plus.const import PLUGINS_PACKAGE
+from dl_plus.utils import FileLock
+
+
+DB_VERSION = 2
+
+# see `dl_plus.backend.get_backends_dir()` and
+# `dl_plus.core.get_extractor_plugins_dir()`, the modules are not imported
+# to keep list commands fast
+BACKENDS = 'backends'
+EXTRACTORS = 'extractors'
+
+
+Record = Dict
+
+_PLUGIN_CLASS_NAME = 'ExtractorPlugin'
+
+
+def get_db_path() -> Path:
+    return get_data_home() / 'installed.json'
+
+
+def _get_lock() -> FileLock:
+    return FileLock(get_data_home() / '.installed.lock')
+
+
+def _get_key(package_dir: Path) -> str:
+    return f'{package_dir.parent.name}/{package_dir.name}'
+
+
+def _is_plugin_call(node: ast.expr) -> bool:
+    # ExtractorPlugin(__name__) or extractor.ExtractorPlugin(__name__)
+    if not isinstance(node, ast.Call):
+        return False
+    func = node.func
+    if isinstance(func, ast.Attribute):
+        return func.attr == _PLUGIN_CLASS_NAME
+    return isinstance(func, ast.Name) and func.id == _PLUGIN_CLASS_NAME
+
+
+def _get_plugin_names(tree: ast.AST) -> Set[str]:
+    """Return names the module binds to `ExtractorPlugin` instances."""
+    names: Set[str] = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Assign) and _is_plugin_call(node.value):
+            names.update(
+                target.id for target in node.targets
+                if isinstance(target, ast.Name)
+            )
+    return names
+
+
+def _get_imported_names(tree: ast.AST) -> Dict[str, str]:
+    """Return original names of imported names by local names."""
+    names = {}
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            for alias in node.names:
+                name = alias.name.rpartition('.')[2]
+                names[alias.asname or name] = name
+    return names
+
+
+def _get_registered_names(
+    source: str, package_plugin_names: AbstractSet[str] = frozenset(),
+) -> Optional[List[Optional[str]]]:
+    """
+    Return names of extractors registered in the plugin module source,
+    `None` stands for the unnamed extractor
+
+    Only `register` calls of `ExtractorPlugin` instances are taken into
+    account: the ones created in the module and the ones imported
+    from other modules of the plugin under `package_plugin_names`.
+    Return `None` if names cannot be determined statically.
+    """
+    tree = ast.parse(source)
+    plugin_names = _get_plugin_names(tree)
+    unknown_names = set()
+    for local_name, name in _get_imported_names(tree).items():
+        if name in package_plugin_names:
+            plugin_names.add(local_name)
+        else:
+            unknown_names.add(local_name)
+    names: List[Optional[str]] = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ClassDef):
+            for decorator in node.decorator_list:
+                # @plugin.register
+                register = _get_register_owner(decorator)
+                if register in unknown_names:
+                    return None
+                if register in plugin_names:
+                    names.append(None)
+            continue
+        if not isinstance(node, ast.Call):
+            continue
+        register = _get_register_owner(node.func)
+        if register in unknown_names:
+            return None
+        if register not in plugin_names:
+            continue
+        name_node: Optional[ast.expr] = None
+        if node.args and isinstance(node.args[0], ast.Constant):
+            # @plugin.register('name')
+            name_node = node.args[0]
+        for keyword in node.keywords:
+            # plugin.register(Extractor, name='name')
+            if keyword.arg == 'name':
+                name_node = keyword.value
+        if name_node is None:
+            names.append(None)
+        elif isinstance(name_node, ast.Constant) and isinstance(
+                name_node.value, str):
+            names.append(name_node.value or None)
+        else:
+            return None
+    return names
+
+
+def _get_register_owner(node: ast.expr) -> Optional[str]:
+    """Return `name` if the node is `name.register`."""
+    if (
+        isinstance(node, ast.Attribute) and node.attr == 'register'
+        and isinstance(node.value, ast.Name)
+    ):
+        return node.value.id
+    return None
+
+
+def scan_extractor_names(
+    version_dir: Path, ns: str, plugin: str,
+) -> Optional[List[Optional[str]]]:
+    """
+    Return names of extractors of the plugin installed into the directory
+    without importing the plugin or `None` if names cannot be determined
+    """
+    base_path = version_dir.joinpath(*PLUGINS_PACKAGE.split('.'), ns, plugin)
+    module_path = base_path.with_suffix('.py')
+    if module_path.is_file():
+        paths = [module_path]
+    elif base_path.is_dir():
+        paths = sorted(base_path.rglob('*.py'))
+    else:
+        return None
+    try:
+        sources = [path.read_text('utf-8') for path in paths]
+        # plugin instances may be shared by modules of the plugin package
+        package_plugin_names: Set[str] = set()
+        for source in sources:
+            package_plugin_names.update(_get_plugin_names(ast.parse(source)))
+        names: List[Optional[str]] = []
+        for source in sources:
+            module_names = _get_registered_names(
+                source, package_plugin_names)
+            if module_names is None:
+                return None
+            names.extend(module_names)
+    except (OSError, SyntaxError, ValueError):
+        return None
+    return names or None
+
+
+def _build_record(package_dir: Path, version_dir: Path) -> Record:
+    try:
+        with open(version_dir / 'metadata.json') as fobj:
+            info = json.load(fobj)['info']
+    except (OSError, ValueError, KeyError):
+        # not installed by dl-plus
+        info = {'name': package_dir.name.replace('_', '-'), 'version': None}
+    sha256 = None
+    try:
+        with open(version_dir / 'dependencies.json') as fobj:
+            sha256 = json.load(fobj)['wheel']['sha256']
+    except (OSError, ValueError, KeyError):
+        pass
+    kind = package_dir.parent.name
+    extractors = None
+    if kind == EXTRACTORS:
+        ns, _, plugin = package_dir.name.partition('-')
+        extractors = scan_extractor_names(version_dir, ns, plugin)
+    return {
+        'kind': kind,
+        'dir': package_dir.name,
+        'name': info['name'],
+        'version': info['version'],
+        'sha256': sha256,
+        'version_dir': version_dir.name,
+        'extractors': extractors,
+    }
+
+
+def _get_mtimes() -> Dict[str, Optional[int]]:
+    mtimes: Dict[str, Optional[int]] = {}
+    data_home = get_data_home()
+    for kind in (BACKENDS, EXTRACTORS):
+        try:
+            mtimes[kind] = (data_home / kind).stat().st_mtime_ns
+        except FileNotFoundError:
+            mtimes[kind] = None
+    return mtimes
+
+
+def _read() -> Optional[Dict[str, Record]]:
+    """Return records or `None` if the database is missing or stale."""
+    try:
+        with open(get_db_path()) as fobj:
+            data = json.load(fobj)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get('version') != DB_VERSION:
+        return None
+    if data['mtimes'] != _get_mtimes():
+        return None
+    return data['packages']
+
+
+def _write(
+    packages: Dict[str, Record], mtimes: Dict[str, Optional[int]],
+) -> None:
+    path = get_db_path()
+    tmp_path = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    with open(tmp_path, 'w') as fobj:
+        json.dump({
+            'version': DB_VERSION,
+            'mtimes': mtimes,
+            'packages': packages,
+        }, fobj)
+    os.replace(tmp_path, path)
+
+
+def _rebuild() -> Dict[str, Record]:
+    # modification times are taken before scanning, so that changes made
+    # during the scan invalidate the database
+    mtimes = _get_mtimes()
+    packages = _scan()
+    _write(packages, mtimes)
+    return packages
+
+
+def _scan() -> Dict[str, Record]:
+    packages = {}
+    data_home = get_data_home()
+    for kind in (BACKENDS, EXTRACTORS):
+        for package_dir in packagedir.iter_package_dirs(data_home / kind):
+            version_dir = packagedir.get_active_dir(package_dir)
+            if not version_dir:
+                continue
+            packages[_get_key(package_dir)] = _build_record(
+                package_dir, version_dir)
+    return packages
+
+
+def load() -> Dict[str, Record]:
+    """Return records of installed packages keyed by `<kind>/<dir>`."""
+    packages = _read()
+    if packages is not None:
+        return packages
+    if not get_data_home().is_dir():
+        return {}
+    with _get_lock():
+        packages = _read()
+        if packages is None:
+            packages = _rebuild()
+    return packages
+
+
+def get_packages(kind: str) -> List[Record]:
+    records = [record for record in load().values() if record['kind'] == kind]
+    return sorted(records, key=lambda record: record['dir'])
+
+
+def add(package_dir: Path, version_dir: Path) -> None:
+    """Add (or replace) the record of the installed package version."""
+    with _get_lock():
+        packages = _read()
+        if packages is None:
+            # the package directory change itself makes the database stale
+            # unless the filesystem has a coarse timestamp resolution
+            _rebuild()
+        else:
+            packages[_get_key(package_dir)] = _build_record(
+                package_dir, version_dir)
+            _write(packages, _get_mtimes())
+
+
+def remove(package_dir: Path) -> None:
+    with _get_lock():
+        packages = _read()
+        if packages is None:
+            _rebuild()
+        else:
+            packages.pop(_get_key(package_dir), None)
+            _write(packages, _get_mtimes())
@@ -0,0 +1,207 @@
+"""
+Lockfiles: the exact set of installed backends and extractor plugins
+along with their dependencies, wheel URLs and sha256 digests
+
+A lockfile is written by `dl-plus --cmd lock` and installed by
+`dl-plus --cmd sync` without querying the package index (unless
+the dependencies of some package are not known, e.g., it was installed
+by pip).
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import IO, Dict, List, NamedTuple, Optional
+
+from dl_plus import packagedir
+from dl_plus.backend import get_backends_dir
+from dl_plus.core import get_extractor_plugins_dir
+from dl_plus.exceptions import DLPlusException
+from dl_plus.pypi import (
+    Metadata, Wheel, load_dependencies, load_metadata, select_wheel_release,
+    wheel_from_dict, wheel_to_dict,
+)
+
+
+LOCKFILE_VERSION = 1
+
+# the core metadata fields stored in the lockfile
+_INFO_KEYS = (
+    'name', 'version', 'provides_extra', 'requires_dist', 'requires_python')
+
+
+class LockfileError(DLPlusException):
+
+    pass
+
+
+class LockedPackage(NamedTuple):
+    # 'backends' or 'extractors'
+    kind: str
+    # the package directory name, e.g., 'yt_dlp' or 'un1def-goodgame'
+    dir_name: str
+    wheel: Wheel
+    extras: List[str]
+    # `None` if the dependencies are not known
+    dependencies: Optional[List[Wheel]]
+
+    @property
+    def package_dir(self) -> Path:
+        return get_package_kind_dirs()[self.kind] / self.dir_name
+
+
+def get_package_kind_dirs() -> Dict[str, Path]:
+    return {
+        'backends': get_backends_dir(),
+        'extractors': get_extractor_plugins_dir(),
+    }
+
+
+def _get_installed_package(
+    kind: str, package_dir: Path, exact: bool = False,
+) -> Optional[LockedPackage]:
+    """
+    :param exact: if true, return `None` for packages installed without
+        recording the wheel (the wheel cannot be determined exactly).
+    """
+    active_dir = packagedir.get_active_dir(package_dir)
+    if not active_dir:
+        return None
+    metadata = load_metadata(active_dir)
+    if not metadata:
+        # not installed by dl-plus
+        return None
+    dependencies = load_dependencies(active_dir)
+    if dependencies:
+        wheel = wheel_from_dict(dependencies['wheel'], metadata)
+        extras = dependencies['extras']
+        dependency_wheels = dependencies['dependencies']
+    elif exact:
+        return None
+    else:
+        # installed by an older dl-plus version which did not record
+        # the wheel and selected it differently, the current selection
+        # is the best guess
+        release = select_wheel_release(metadata.urls)
+        if release is None:
+            return None
+        wheel = Wheel(
+            name=metadata.name,
+            version=metadata.version,
+            metadata=metadata,
+            filename=release['filename'],
+            url=release['url'],
+            sha256=release['digests']['sha256'],
+        )
+        extras = []
+        dependency_wheels = None
+    return LockedPackage(
+        kind=kind,
+        dir_name=package_dir.name,
+        wheel=wheel,
+        extras=extras,
+        dependencies=_load_wheels(dependency_wheels),
+    )
+
+
+def get_installed_packages() -> List[LockedPackage]:
+    packages = []
+    for kind, parent_dir in get_package_kind_dirs().items():
+        for package_dir in packagedir.iter_package_dirs(parent_dir):
+            package = _get_installed_package(kind, package_dir)
+            if package:
+                packages.append(package)
+    return packages
+
+
+def is_installed(package: LockedPackage) -> bool:
+    """Check whether exactly the locked package is installed."""
+    installed = _get_installed_package(
+        package.kind, package.package_dir, exact=True)
+    if installed is None:
+        return False
+    if installed.wheel.sha256 != package.wheel.sha256:
+        return False
+    if package.dependencies is None:
+        return True
+    if installed.dependencies is None:
+        return False
+    return (
+        sorted(wheel.sha256 for wheel in installed.dependencies)
+        == sorted(wheel.sha256 for wheel in package.dependencies)
+    )
+
+
+def _dump_wheels(wheels: Optional[List[Wheel]]) -> Optional[List[Dict]]:
+    if wheels is None:
+        return None
+    return [wheel_to_dict(wheel) for wheel in wheels]
+
+
+def _load_wheels(data: Optional[List[Dict]]) -> Optional[List[Wheel]]:
+    if data is None:
+        return None
+    return [wheel_from_dict(item) for item in data]
+
+
+def dump(packages: List[LockedPackage], fobj: IO[str]) -> None:
+    json.dump({
+        'version': LOCKFILE_VERSION,
+        'packages': [
+            {
+                'kind': package.kind,
+                'dir': package.dir_name,
+                'wheel': wheel_to_dict(package.wheel),
+                'info': {
+                    key: package.wheel.metadata['info'].get(key)
+                    for key in _INFO_KEYS
+                },
+                'extras': package.extras,
+                'dependencies': _dump_wheels(package.dependencies),
+            }
+            for package in packages
+        ],
+    }, fobj, indent=2)
+    fobj.write('\n')
+
+
+def load(fobj: IO[str]) -> List[LockedPackage]:
+    """
+    :raises LockfileError:
+    """
+    try:
+        data = json.load(fobj)
+    except ValueError as exc:
+        raise LockfileError(f'invalid lockfile: {exc}') from exc
+    if not isinstance(data, dict) or data.get('version') != LOCKFILE_VERSION:
+        raise LockfileError('unsupported lockfile version')
+    kinds = get_package_kind_dirs()
+    packages = []
+    try:
+        for item in data['packages']:
+            kind = item['kind']
+            dir_name = item['dir']
+            if kind not in kinds or not packagedir.is_valid_name(dir_name):
+                raise LockfileError(f'invalid package: {kind}/{dir_name}')
+            wheel_data = item['wheel']
+            metadata = Metadata({
+                'info': item['info'],
+                'urls': [{
+                    'packagetype': 'bdist_wheel',
+                    'yanked': False,
+                    'filename': wheel_data['filename'],
+                    'url': wheel_data['url'],
+                    'digests': {'sha256': wheel_data['sha256']},
+                }],
+            })
+            packages.append(LockedPackage(
+                kind=kind,
+                dir_name=dir_name,
+                wheel=wheel_from_dict(wheel_data, metadata),
+                extras=item['extras'],
+                dependencies=_load_wheels(item['dependencies']),
+            ))
+    except (KeyError, TypeError) as exc:
+        raise LockfileError(f'invalid lockfile: {exc!r}') from exc
+    return packages
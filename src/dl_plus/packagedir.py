@@ -0,0 +1,311 @@
+"""
+Versioned package directories
+
+Every managed package (a backend or an extractor plugin) is installed into
+its own versioned directory, e.g., `backends/yt_dlp@2024.10.22`. The active
+version is selected by the `backends/yt_dlp` symlink (or, if symlinks are
+not available, by the `backends/yt_dlp.current` pointer file) which is
+replaced atomically, so other dl-plus processes always see either the old
+or the new version, never a partially installed one.
+
+Inactive versions are not removed immediately since they may still be used
+by running processes, they are garbage collected by subsequent installs
+after a grace period. Versions installed side by side (see `keep()`) are
+never garbage collected, they can be selected explicitly, e.g.,
+`--backend yt-dlp@2024.10.22`.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from dl_plus.utils import FileLock
+
+
+VERSION_SEPARATOR = '@'
+# version directories of forced reinstalls get a counter suffix,
+# e.g., yt_dlp@2024.10.22~1
+_REINSTALL_SEPARATOR = '~'
+_POINTER_SUFFIX = '.current'
+_LOCK_SUFFIX = '.lock'
+_TMP_SUFFIX = '.tmp'
+# a marker file inside version directories exempt from garbage collection
+_KEEP_MARKER = '.keep'
+
+GC_GRACE_PERIOD = 24 * 60 * 60
+
+
+_NAME_REGEX = re.compile(r'^[A-Za-z0-9][A-Za-z0-9_.-]*$')
+
+
+def is_valid_name(name: str) -> bool:
+    """Check whether the name can be used as a package directory name."""
+    return (
+        _NAME_REGEX.fullmatch(name) is not None
+        and not name.endswith(_POINTER_SUFFIX)
+    )
+
+
+def _get_pointer_path(package_dir: Path) -> Path:
+    return package_dir.with_name(package_dir.name + _POINTER_SUFFIX)
+
+
+def get_lock(package_dir: Path) -> FileLock:
+    """Return the lock serializing modifications of the package."""
+    return FileLock(
+        package_dir.with_name(f'.{package_dir.name}{_LOCK_SUFFIX}'))
+
+
+def get_tmp_dir(package_dir: Path) -> Path:
+    """Return a temporary directory on the same filesystem."""
+    return package_dir.with_name(
+        f'.{package_dir.name}.{os.getpid()}{_TMP_SUFFIX}')
+
+
+def get_version_from_dir_name(version_dir: Path) -> str:
+    version = version_dir.name.partition(VERSION_SEPARATOR)[2]
+    return version.partition(_REINSTALL_SEPARATOR)[0]
+
+
+def get_new_version_dir(package_dir: Path, version: str) -> Path:
+    """Return a non-existent version directory path."""
+    base_name = f'{package_dir.name}{VERSION_SEPARATOR}{version}'
+    version_dir = package_dir.with_name(base_name)
+    counter = 0
+    while version_dir.exists():
+        counter += 1
+        version_dir = package_dir.with_name(
+            f'{base_name}{_REINSTALL_SEPARATOR}{counter}')
+    return version_dir
+
+
+def get_active_dir(package_dir: Path) -> Optional[Path]:
+    """
+    Return the resolved directory of the active version or `None`
+    if the package is not installed
+
+    Legacy (non-versioned) installations are supported, the package
+    directory itself is returned in this case.
+    """
+    try:
+        name = _get_pointer_path(package_dir).read_text().strip()
+    except FileNotFoundError:
+        pass
+    else:
+        version_dir = package_dir.with_name(name)
+        if version_dir.is_dir():
+            return version_dir
+    if package_dir.is_dir():
+        return package_dir.resolve()
+    return None
+
+
+def get_version_dirs(package_dir: Path) -> List[Path]:
+    prefix = f'{package_dir.name}{VERSION_SEPARATOR}'
+    if not package_dir.parent.is_dir():
+        return []
+    return sorted(
+        path for path in package_dir.parent.iterdir()
+        if path.name.startswith(prefix) and path.is_dir()
+    )
+
+
+def get_version_dir(package_dir: Path, version: str) -> Optional[Path]:
+    """
+    Return the directory of the installed version or `None` if the version
+    is not installed
+
+    The active directory is preferred, otherwise the latest reinstall
+    of the version is returned.
+    """
+    active_dir = get_active_dir(package_dir)
+    if active_dir and get_version_from_dir_name(active_dir) == version:
+        return active_dir
+    version_dirs = [
+        version_dir for version_dir in get_version_dirs(package_dir)
+        if get_version_from_dir_name(version_dir) == version
+    ]
+    if not version_dirs:
+        return None
+    return max(version_dirs, key=_get_reinstall_counter)
+
+
+def _get_reinstall_counter(version_dir: Path) -> int:
+    counter = version_dir.name.rpartition(_REINSTALL_SEPARATOR)[2]
+    if counter.isdigit():
+        return int(counter)
+    return 0
+
+
+def keep(version_dir: Path) -> None:
+    """Exempt the version directory from garbage collection."""
+    (version_dir / _KEEP_MARKER).touch()
+
+
+def is_kept(version_dir: Path) -> bool:
+    return (version_dir / _KEEP_MARKER).exists()
+
+
+def iter_package_dirs(parent_dir: Path) -> List[Path]:
+    """
+    Return a sorted list of installed packages (that is, package directory
+    paths, not version directory paths) inside the parent directory
+    """
+    if not parent_dir.is_dir():
+        return []
+    names = set()
+    for path in parent_dir.iterdir():
+        name = path.name
+        if name.startswith('.') or VERSION_SEPARATOR in name:
+            continue
+        if name.endswith(_POINTER_SUFFIX):
+            name = name[:-len(_POINTER_SUFFIX)]
+        elif not path.is_dir():
+            continue
+        names.add(name)
+    package_dirs = []
+    for name in sorted(names):
+        package_dir = parent_dir / name
+        if get_active_dir(package_dir):
+            package_dirs.append(package_dir)
+    return package_dirs
+
+
+def activate(package_dir: Path, version_dir: Path) -> None:
+    """
+    Atomically switch the active version of the package
+
+    The caller must hold the package lock.
+    """
+    if package_dir.is_dir() and not package_dir.is_symlink():
+        _migrate_legacy_dir(package_dir)
+    tmp_path = get_tmp_dir(package_dir)
+    pointer_path = _get_pointer_path(package_dir)
+    try:
+        os.symlink(version_dir.name, tmp_path, target_is_directory=True)
+    except (OSError, NotImplementedError):
+        # e.g., Windows without the symlink privilege
+        tmp_path.write_text(version_dir.name)
+        os.replace(tmp_path, pointer_path)
+        return
+    os.replace(tmp_path, package_dir)
+    try:
+        pointer_path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def _migrate_legacy_dir(package_dir: Path) -> None:
+    from dl_plus.pypi import load_metadata
+    metadata = load_metadata(package_dir)
+    version = metadata.version if metadata else 'legacy'
+    os.replace(package_dir, get_new_version_dir(package_dir, version))
+
+
+def _mark_inactive(version_dir: Path) -> None:
+    # the modification time of the version directory is used
+    # as the deactivation time
+    try:
+        os.utime(version_dir)
+    except OSError:
+        pass
+
+
+def switch(package_dir: Path, version_dir: Path) -> None:
+    """
+    Activate the new version and mark the previous one as inactive
+
+    The caller must hold the package lock.
+    """
+    previous_dir = get_active_dir(package_dir)
+    activate(package_dir, version_dir)
+    if previous_dir and previous_dir != version_dir.resolve():
+        _mark_inactive(previous_dir)
+
+
+def collect_garbage(
+    package_dir: Path, grace_period: float = GC_GRACE_PERIOD,
+) -> None:
+    """
+    Remove inactive versions deactivated more than `grace_period` seconds
+    ago and leftovers of interrupted installs
+
+    The caller must hold the package lock.
+    """
+    active_dir = get_active_dir(package_dir)
+    threshold = time.time() - grace_period
+    candidates = get_version_dirs(package_dir)
+    # the same pattern as in `get_tmp_dir()`, the prefix alone would
+    # also match temporary directories of, e.g., 'foo.bar' for 'foo'
+    tmp_regex = re.compile(
+        rf'\.{re.escape(package_dir.name)}\.\d+{re.escape(_TMP_SUFFIX)}')
+    for path in package_dir.parent.iterdir():
+        if tmp_regex.fullmatch(path.name):
+            candidates.append(path)
+    for path in candidates:
+        if active_dir and path.resolve() == active_dir:
+            continue
+        if is_kept(path):
+            continue
+        try:
+            if path.lstat().st_mtime > threshold:
+                continue
+        except FileNotFoundError:
+            continue
+        _remove(path)
+
+
+def collect_garbage_in_background(
+    package_dir: Path, grace_period: float = GC_GRACE_PERIOD,
+) -> threading.Thread:
+    thread = threading.Thread(
+        target=collect_garbage, args=(package_dir, grace_period), daemon=True)
+    thread.start()
+    return thread
+
+
+def _remove(path: Path) -> None:
+    if path.is_symlink() or not path.is_dir():
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+    else:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def remove(package_dir: Path) -> None:
+    """
+    Uninstall the package: deactivate it and remove all its versions
+
+    The caller must hold the package lock.
+    """
+    _remove(_get_pointer_path(package_dir))
+    _remove(package_dir)
+    for version_dir in get_version_dirs(package_dir):
+        _remove(version_dir)
+
+
+def remove_version(package_dir: Path, version: str) -> bool:
+    """
+    Remove all inactive directories of the version, return `False`
+    if there are none
+
+    The caller must hold the package lock.
+    """
+    active_dir = get_active_dir(package_dir)
+    removed = False
+    for version_dir in get_version_dirs(package_dir):
+        if get_version_from_dir_name(version_dir) != version:
+            continue
+        if active_dir and version_dir.resolve() == active_dir:
+            continue
+        _remove(version_dir)
+        removed = True
+    return removed
@@ -1,24 +1,50 @@
 from __future__ import annotations
 
+import compileall
 import hashlib
 import json
 import os
+import platform
+import re
 import shutil
 import subprocess
 import sys
 import tempfile
+import threading
+import time
 import zipfile
 from collections.abc import Iterable
-from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
+from email.parser import HeaderParser
+from functools import partial
+from html.parser import HTMLParser
 from pathlib import Path
-from typing import ClassVar, Dict, NamedTuple, Optional
-from urllib.error import HTTPError
-from urllib.request import urlopen
+from typing import (
+    Callable, ClassVar, Dict, FrozenSet, List, NamedTuple, Optional, Sequence,
+    Set, Tuple,
+)
+from urllib.parse import unquote, urljoin, urlsplit
+from urllib.request import url2pathname
 
+from dl_plus import installed, packagedir, store
+from dl_plus.config import get_data_home
 from dl_plus.exceptions import DLPlusException
+from dl_plus.httpclient import HTTPClient, HTTPError
+from dl_plus.requirement import (
+    InvalidRequirement, Requirement, SpecifierSet, default_environment,
+    normalize_name,
+)
+from dl_plus.tags import get_wheel_priority
+from dl_plus.utils import FileLock
+from dl_plus.version import Version, parse_version
 
 
-_HTTP_TIMEOUT = 30
+_DOWNLOAD_ATTEMPTS = 5
+_DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# cached wheels (and partial downloads) not used for this number
+# of seconds are removed
+WHEEL_CACHE_MAX_AGE = 30 * 24 * 60 * 60
 
 
 class Wheel(NamedTuple):
@@ -72,13 +98,17 @@ class Metadata(dict):
         return self['info']['version']
 
     @property
-    def urls(self) -> Dict[str, Dict]:
+    def urls(self) -> List[Dict]:
         return self['urls']
 
     @property
     def extras(self) -> Optional[list[str]]:
         return self['info']['provides_extra']
 
+    @property
+    def requires_dist(self) -> Optional[list[str]]:
+        return self['info'].get('requires_dist')
+
 
 def save_metadata(backend_dir: Path, metadata: Metadata) -> None:
     with open(backend_dir / 'metadata.json', 'w') as fobj:
@@ -93,14 +123,220 @@ def load_metadata(backend_dir: Path) -> Optional[Metadata]:
         return None
 
 
-class PyPIClient:
+def wheel_to_dict(wheel: Wheel) -> Dict[str, str]:
+    return {
+        'name': wheel.name,
+        'version': wheel.version,
+        'filename': wheel.filename,
+        'url': wheel.url,
+        'sha256': wheel.sha256,
+    }
 
-    JSON_BASE_URL = 'https://pypi.org/pypi'
+
+def wheel_from_dict(
+    data: Dict[str, str], metadata: Optional[Metadata] = None,
+) -> Wheel:
+    if metadata is None:
+        metadata = Metadata({
+            'info': {
+                'name': data['name'],
+                'version': data['version'],
+                'provides_extra': None,
+                'requires_dist': None,
+                'requires_python': None,
+            },
+            'urls': [],
+        })
+    return Wheel(
+        name=data['name'],
+        version=data['version'],
+        metadata=metadata,
+        filename=data['filename'],
+        url=data['url'],
+        sha256=data['sha256'],
+    )
+
+
+def save_dependencies(
+    backend_dir: Path, wheel: Wheel, extras: Iterable[str],
+    dependencies: Optional[Iterable[Wheel]],
+) -> None:
+    """
+    Save the installed wheel, extras and the exact set of installed
+    dependencies, `dependencies` is `None` if the set is unknown (e.g.,
+    dependencies were installed by pip)
+    """
+    with open(backend_dir / 'dependencies.json', 'w') as fobj:
+        json.dump({
+            'wheel': wheel_to_dict(wheel),
+            'extras': list(extras),
+            'dependencies': (
+                None if dependencies is None
+                else [wheel_to_dict(wheel) for wheel in dependencies]
+            ),
+        }, fobj)
+
+
+def load_dependencies(backend_dir: Path) -> Optional[Dict]:
+    try:
+        with open(backend_dir / 'dependencies.json') as fobj:
+            return json.load(fobj)
+    except (OSError, ValueError):
+        return None
+
+
+class ProjectNotFound(RequestError):
+
+    pass
+
+
+WHEEL_FILENAME_REGEX = re.compile(
+    r'^(?P<name>[^-]+)-(?P<version>[^-]+)(?:-(?P<build>\d[^-]*))?'
+    r'-(?P<python>[^-]+)-(?P<abi>[^-]+)-(?P<platform>[^-]+)\.whl$'
+)
+
+
+def is_python_compatible(requires_python: Optional[str]) -> bool:
+    if not requires_python:
+        return True
+    try:
+        specifier = SpecifierSet(requires_python)
+    except InvalidRequirement:
+        # there are lots of malformed Requires-Python values on PyPI,
+        # pip ignores them as well
+        return True
+    return specifier.contains(platform.python_version(), prereleases=True)
+
+
+def get_release_priority(release: Dict) -> Optional[int]:
+    """
+    Return the priority of the release file (the lower the better) or
+    `None` if the file is not a wheel installable on this platform
+    """
+    if release.get('packagetype', 'bdist_wheel') != 'bdist_wheel':
+        return None
+    if release.get('yanked'):
+        return None
+    match = WHEEL_FILENAME_REGEX.fullmatch(release['filename'])
+    if not match:
+        return None
+    if not is_python_compatible(release.get('requires_python')):
+        return None
+    return get_wheel_priority(match['python'], match['abi'], match['platform'])
+
+
+def select_wheel_release(releases: Iterable[Dict]) -> Optional[Dict]:
+    """Return the most preferred installable wheel of the release files."""
+    selected, selected_priority = None, None
+    for release in releases:
+        priority = get_release_priority(release)
+        if priority is None:
+            continue
+        if selected_priority is None or priority < selected_priority:
+            selected, selected_priority = release, priority
+    return selected
+
+
+def parse_core_metadata(content: str) -> Dict:
+    """
+    Parse the core metadata file (*.dist-info/METADATA) into a dict
+    resembling the `info` object of the PyPI JSON API
+    """
+    message = HeaderParser().parsestr(content)
+    return {
+        'name': message['Name'],
+        'version': message['Version'],
+        'provides_extra': message.get_all('Provides-Extra') or [],
+        'requires_dist': message.get_all('Requires-Dist') or [],
+        'requires_python': message['Requires-Python'],
+    }
+
+
+def read_wheel_core_metadata(path: Path) -> str:
+    with zipfile.ZipFile(path) as zfobj:
+        for name in zfobj.namelist():
+            parts = name.split('/')
+            if (
+                len(parts) == 2 and parts[0].endswith('.dist-info')
+                and parts[1] == 'METADATA'
+            ):
+                return zfobj.read(name).decode('utf-8')
+    raise ParseError(f'{path}: no METADATA file')
+
+
+class PackageIndex:
+    """A source of project metadata and wheel URLs"""
+
+    def fetch_metadata(
+        self, project_name: str, version: Optional[str] = None,
+    ) -> Metadata:
+        """
+        :raises ProjectNotFound: if the project (version) does not exist.
+        :raises RequestError:
+        """
+        raise NotImplementedError
+
+    def fetch_releases(self, project_name: str) -> Dict[str, list[Dict]]:
+        """
+        Return files of all versions of the project, the files are dicts
+        resembling the `urls` items of the PyPI JSON API, except that
+        `digests` may be missing
+
+        :raises ProjectNotFound:
+        :raises RequestError:
+        """
+        raise NotImplementedError
+
+
+def _read_cached_response(path: Path) -> Optional[Dict]:
+    try:
+        with open(path) as fobj:
+            cached = json.load(fobj)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cached, dict) or cached.keys() != {
+            'url', 'etag', 'last_modified', 'data'}:
+        return None
+    return cached
+
+
+def _write_cached_response(path: Path, cached: Dict) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(
+            f'.{path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+        with open(tmp_path, 'w') as fobj:
+            json.dump(cached, fobj)
+        os.replace(tmp_path, path)
+    except OSError:
+        # the cache is an optimization only
+        pass
+
+
+class JSONPackageIndex(PackageIndex):
+    """
+    An index implementing the PyPI JSON API, e.g., PyPI itself or
+    an HTTP mirror
+    """
+
+    def __init__(
+        self, base_url: str, http_client: HTTPClient,
+        cache_dir: Optional[Path] = None,
+    ) -> None:
+        self.base_url = base_url.rstrip('/')
+        self.http_client = http_client
+        # if set, responses are cached and revalidated with conditional
+        # requests (`If-None-Match`/`If-Modified-Since`)
+        self.cache_dir = cache_dir
+        # project metadata fetched by `fetch_releases`, it describes
+        # the latest version and is reused to avoid another request
+        # when the latest version is selected
+        self._latest: Dict[str, Metadata] = {}
 
     def build_json_url(
         self, project_name: str, version: Optional[str] = None,
     ) -> str:
-        parts = [self.JSON_BASE_URL, project_name]
+        parts = [self.base_url, project_name]
         if version:
             parts.append(version)
         parts.append('json')
@@ -109,32 +345,350 @@ class PyPIClient:
     def fetch_metadata(
         self, project_name: str, version: Optional[str] = None,
     ) -> Metadata:
+        if version is not None:
+            latest = self._latest.get(normalize_name(project_name))
+            if latest is not None and latest.version == version:
+                return latest
         url = self.build_json_url(project_name, version)
         try:
-            with urlopen(url, timeout=_HTTP_TIMEOUT) as response:
-                return Metadata(json.load(response))
+            data, url = self._fetch_json(url)
+        except HTTPError as exc:
+            if exc.code == 404:
+                raise ProjectNotFound from exc
+            raise RequestError from exc
         except (OSError, ValueError) as exc:
             raise RequestError from exc
+        metadata = Metadata(data)
+        # mirrors may use relative file URLs
+        for files in (metadata.urls, *metadata.get('releases', {}).values()):
+            for file in files:
+                file['url'] = urljoin(url, file['url'])
+        return metadata
+
+    def _get_cache_path(self, url: str) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        digest = hashlib.sha256(url.encode()).hexdigest()
+        return self.cache_dir / f'{digest}.json'
+
+    def _fetch_json(self, url: str) -> Tuple[Dict, str]:
+        """
+        Return the decoded response body and the final (after redirects)
+        URL
+
+        :raises OSError:
+        :raises ValueError:
+        """
+        cache_path = self._get_cache_path(url)
+        cached: Optional[Dict] = None
+        headers = {}
+        if cache_path is not None:
+            cached = _read_cached_response(cache_path)
+        if cached is not None:
+            if cached['etag']:
+                headers['If-None-Match'] = cached['etag']
+            if cached['last_modified']:
+                headers['If-Modified-Since'] = cached['last_modified']
+        try:
+            with self.http_client.request(url, headers) as response:
+                body = response.read()
+                final_url = response.url
+                etag = response.headers.get('ETag')
+                last_modified = response.headers.get('Last-Modified')
+        except HTTPError as exc:
+            if exc.code == 304 and cached is not None:
+                return cached['data'], cached['url']
+            raise
+        data = json.loads(body)
+        if cache_path is not None and (etag or last_modified):
+            _write_cached_response(cache_path, {
+                'url': final_url,
+                'etag': etag,
+                'last_modified': last_modified,
+                'data': data,
+            })
+        return data, final_url
+
+    def fetch_releases(self, project_name: str) -> Dict[str, list[Dict]]:
+        metadata = self.fetch_metadata(project_name)
+        self._latest[normalize_name(project_name)] = metadata
+        releases = metadata.get('releases')
+        if releases is None:
+            # the `releases` key is deprecated and may be missing
+            releases = {metadata.version: metadata.urls}
+        return releases
+
+
+class _IndexFile(NamedTuple):
+    filename: str
+    url: str
+    sha256: Optional[str]
+    yanked: bool = False
+    # PEP 658 core metadata file URL
+    metadata_url: Optional[str] = None
+    requires_python: Optional[str] = None
+
+
+class _LinkParser(HTMLParser):
+
+    def __init__(self, base_url: str) -> None:
+        super().__init__()
+        self.base_url = base_url
+        self.files: list[_IndexFile] = []
+
+    def handle_starttag(
+        self, tag: str, attrs: list[tuple[str, Optional[str]]],
+    ) -> None:
+        if tag != 'a':
+            return
+        _attrs = dict(attrs)
+        href = _attrs.get('href')
+        if not href:
+            return
+        url, _, fragment = urljoin(self.base_url, href).partition('#')
+        filename = unquote(url.rpartition('/')[2])
+        sha256 = None
+        if fragment.startswith('sha256='):
+            sha256 = fragment[len('sha256='):]
+        metadata_url = None
+        core_metadata = _attrs.get(
+            'data-core-metadata', _attrs.get('data-dist-info-metadata'))
+        if core_metadata and core_metadata != 'false':
+            metadata_url = f'{url}.metadata'
+        self.files.append(_IndexFile(
+            filename=filename, url=url, sha256=sha256,
+            yanked='data-yanked' in _attrs, metadata_url=metadata_url,
+            requires_python=_attrs.get('data-requires-python'),
+        ))
+
 
-    def _is_wheel_release(self, release: Dict) -> bool:
-        return (
-            release['packagetype'] == 'bdist_wheel' and not release['yanked'])
+class _FileListPackageIndex(PackageIndex):
+    """
+    An index providing a list of distribution files per project
+    (the Simple API and its local counterparts)
+    """
+
+    def _list_files(self, project_name: str) -> list[_IndexFile]:
+        raise NotImplementedError
+
+    def _read_core_metadata(self, file: _IndexFile) -> Optional[str]:
+        raise NotImplementedError
+
+    def _get_sha256(self, file: _IndexFile) -> str:
+        if file.sha256 is None:
+            raise ParseError(f'{file.url}: no sha256 digest')
+        return file.sha256
+
+    def _collect_releases(
+        self, project_name: str,
+    ) -> Dict[Version, list[tuple[_IndexFile, re.Match[str]]]]:
+        normalized_name = normalize_name(project_name)
+        releases: Dict[Version, list[tuple[_IndexFile, re.Match[str]]]] = {}
+        for file in self._list_files(project_name):
+            match = WHEEL_FILENAME_REGEX.fullmatch(file.filename)
+            if not match or file.yanked:
+                continue
+            if normalize_name(match['name']) != normalized_name:
+                continue
+            if not (file_version := parse_version(match['version'])):
+                continue
+            releases.setdefault(file_version, []).append((file, match))
+        if not releases:
+            raise ProjectNotFound(f'{project_name}: no wheels found')
+        return releases
+
+    def fetch_releases(self, project_name: str) -> Dict[str, list[Dict]]:
+        return {
+            str(version): [
+                {
+                    'packagetype': 'bdist_wheel',
+                    'yanked': False,
+                    'filename': file.filename,
+                    'url': file.url,
+                    'requires_python': file.requires_python,
+                }
+                for file, _ in files
+            ]
+            for version, files in self._collect_releases(project_name).items()
+        }
+
+    def fetch_metadata(
+        self, project_name: str, version: Optional[str] = None,
+    ) -> Metadata:
+        releases = self._collect_releases(project_name)
+        if version:
+            requested_version = parse_version(version)
+            if requested_version not in releases:
+                raise ProjectNotFound(f'{project_name} {version}: not found')
+            selected_version = requested_version
+        else:
+            final_versions = [v for v in releases if not v.is_prerelease]
+            selected_version = max(final_versions or releases)
+        files = sorted(
+            releases[selected_version], key=lambda item: item[0].filename)
+        first_file, first_match = files[0]
+        core_metadata = self._read_core_metadata(first_file)
+        if core_metadata:
+            info = parse_core_metadata(core_metadata)
+        else:
+            info = {
+                'name': first_match['name'],
+                'version': first_match['version'],
+                'provides_extra': None,
+                'requires_dist': None,
+                'requires_python': None,
+            }
+        return Metadata({
+            'info': info,
+            'urls': [
+                {
+                    'packagetype': 'bdist_wheel',
+                    'yanked': False,
+                    'filename': file.filename,
+                    'url': file.url,
+                    'requires_python': file.requires_python,
+                    'digests': {'sha256': self._get_sha256(file)},
+                }
+                for file, _ in files
+            ],
+        })
+
+
+class SimplePackageIndex(_FileListPackageIndex):
+    """An HTTP index implementing the Simple API (PEP 503)"""
+
+    def __init__(self, base_url: str, http_client: HTTPClient) -> None:
+        self.base_url = base_url.rstrip('/')
+        self.http_client = http_client
+
+    def _list_files(self, project_name: str) -> list[_IndexFile]:
+        url = f'{self.base_url}/{normalize_name(project_name)}/'
+        try:
+            with self.http_client.request(
+                url, {'Accept': 'text/html'},
+            ) as response:
+                content = response.read().decode('utf-8')
+                url = response.url
+        except HTTPError as exc:
+            if exc.code == 404:
+                raise ProjectNotFound from exc
+            raise RequestError from exc
+        except (OSError, ValueError) as exc:
+            raise RequestError from exc
+        parser = _LinkParser(url)
+        parser.feed(content)
+        return parser.files
+
+    def _read_core_metadata(self, file: _IndexFile) -> Optional[str]:
+        if not file.metadata_url:
+            return None
+        try:
+            with self.http_client.request(file.metadata_url) as response:
+                return response.read().decode('utf-8')
+        except (OSError, ValueError):
+            return None
+
+
+class LocalPackageIndex(_FileListPackageIndex):
+    """
+    A local directory containing either wheel files or per-project
+    subdirectories laid out like the Simple API (`<project>/index.html`
+    or just `<project>/*.whl`)
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    def _list_files(self, project_name: str) -> list[_IndexFile]:
+        if not self.path.is_dir():
+            raise RequestError(f'{self.path} is not a directory')
+        project_dir = self.path / normalize_name(project_name)
+        if project_dir.is_dir():
+            index_path = project_dir / 'index.html'
+            if index_path.is_file():
+                parser = _LinkParser(index_path.as_uri())
+                parser.feed(index_path.read_text('utf-8'))
+                return parser.files
+            directory = project_dir
+        else:
+            directory = self.path
+        return [
+            _IndexFile(filename=path.name, url=path.as_uri(), sha256=None)
+            for path in directory.glob('*.whl')
+        ]
+
+    def _read_core_metadata(self, file: _IndexFile) -> Optional[str]:
+        return read_wheel_core_metadata(file_url_to_path(file.url))
+
+    def _get_sha256(self, file: _IndexFile) -> str:
+        if file.sha256 is not None:
+            return file.sha256
+        return _get_file_sha256(file_url_to_path(file.url))
+
+
+def file_url_to_path(url: str) -> Path:
+    return Path(url2pathname(urlsplit(url).path))
+
+
+def get_package_index(
+    index_url: str, http_client: HTTPClient,
+    cache_dir: Optional[Path] = None,
+) -> PackageIndex:
+    """
+    Return the package index for the given URL
+
+    * `http(s)://.../simple` -- the Simple API;
+    * any other `http(s)://` URL -- the PyPI JSON API;
+    * `file://` URL or a filesystem path -- a local directory.
+
+    `cache_dir` is only used by the PyPI JSON API index.
+    """
+    scheme = urlsplit(index_url).scheme.lower()
+    if scheme in ('http', 'https'):
+        if index_url.rstrip('/').endswith('/simple'):
+            return SimplePackageIndex(index_url, http_client)
+        return JSONPackageIndex(index_url, http_client, cache_dir)
+    if scheme == 'file':
+        return LocalPackageIndex(file_url_to_path(index_url))
+    # a plain path, with or without a Windows drive letter
+    if not scheme or len(scheme) == 1:
+        return LocalPackageIndex(Path(index_url))
+    raise PyPIClientError(f'unsupported index URL: {index_url}')
+
+
+class PyPIClient:
+
+    JSON_BASE_URL = 'https://pypi.org/pypi'
+
+    def __init__(
+        self, http_client: Optional[HTTPClient] = None,
+        index_url: Optional[str] = None, cache_dir: Optional[Path] = None,
+    ) -> None:
+        if http_client is None:
+            http_client = HTTPClient()
+        self.http_client = http_client
+        self.index = get_package_index(
+            index_url or self.JSON_BASE_URL, http_client, cache_dir)
+
+    def fetch_metadata(
+        self, project_name: str, version: Optional[str] = None,
+    ) -> Metadata:
+        return self.index.fetch_metadata(project_name, version)
 
     def fetch_wheel_info(
         self, project_name: str, version: Optional[str] = None,
     ) -> Wheel:
         try:
             metadata = self.fetch_metadata(project_name, version)
-        except RequestError as exc:
-            if isinstance(exc.error, HTTPError) and exc.error.code == 404:
-                error = 'not found'
-            else:
-                error = 'unexpected error'
-            raise DownloadError(error, project_name, version) from exc
-        try:
-            release = next(filter(self._is_wheel_release, metadata.urls))
-        except StopIteration:
-            raise DownloadError('no wheel distribution', project_name, version)
+        except ProjectNotFound as exc:
+            raise DownloadError('not found', project_name, version) from exc
+        except (RequestError, ParseError) as exc:
+            raise DownloadError(
+                f'unexpected error: {exc}', project_name, version) from exc
+        release = select_wheel_release(metadata.urls)
+        if release is None:
+            raise DownloadError(
+                'no compatible wheel distribution', project_name, version)
         return Wheel(
             name=metadata.name,
             version=metadata.version,
@@ -145,88 +699,546 @@ class PyPIClient:
         )
 
 
-def _is_pip_available():
-    exit_status = subprocess.call(
-        [sys.executable, '-m', 'pip', '--version'],
-        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+def get_wheel_cache_dir() -> Path:
+    return get_data_home() / 'cache' / 'wheels'
+
+
+def get_metadata_cache_dir() -> Path:
+    return get_data_home() / 'cache' / 'metadata'
+
+
+def _is_stale(path: Path, threshold: float) -> bool:
+    try:
+        return path.stat().st_mtime < threshold
+    except FileNotFoundError:
+        return False
+
+
+def collect_wheel_cache_garbage(max_age: float = WHEEL_CACHE_MAX_AGE) -> None:
+    """
+    Remove cached wheels and partial downloads not used for `max_age`
+    seconds
+
+    Installed packages do not need the wheels, they are only kept to
+    speed up reinstalls and syncs. Lock files are kept, they are empty
+    and may be held by concurrent downloads.
+    """
+    cache_dir = get_wheel_cache_dir()
+    try:
+        paths = list(cache_dir.iterdir())
+    except FileNotFoundError:
+        return
+    threshold = time.time() - max_age
+    for path in paths:
+        filename = path.name
+        if filename.endswith('.part'):
+            filename = filename[:-len('.part')]
+        if filename.startswith('.') or not filename.endswith('.whl'):
+            continue
+        if not _is_stale(path, threshold):
+            continue
+        # the same lock as in `WheelInstaller.download()`
+        with FileLock(cache_dir / f'.{filename}.lock'):
+            if _is_stale(path, threshold):
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+
+
+def _get_file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as fobj:
+        while chunk := fobj.read(_DOWNLOAD_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def extract_wheel(path: Path, target_dir: Path) -> None:
+    """
+    Extract the wheel into the target directory the same way
+    `pip install --target` does
+
+    The contents of `purelib` and `platlib` subdirectories of the `.data`
+    directory are moved to the root, other subdirectories (scripts,
+    headers, data) are skipped.
+    """
+    with zipfile.ZipFile(path) as zfobj:
+        for info in zfobj.infolist():
+            name = info.filename
+            top, _, rest = name.partition('/')
+            if top.endswith('.data'):
+                scheme, _, name = rest.partition('/')
+                if scheme not in ('purelib', 'platlib'):
+                    continue
+            if not name or name.endswith('/'):
+                continue
+            # only the name is changed, the member is still looked up
+            # by the original name
+            info.filename = name
+            zfobj.extract(info, target_dir)
+
+
+class InstallRequest(NamedTuple):
+    wheel: Wheel
+    output_dir: Path
+    extras: Optional[Iterable[str]] = None
+    dependencies: Optional[Sequence[Wheel]] = None
+    post_install: Optional[Callable[[Path], None]] = None
+
+
+def compile_bytecode(directory: Path, target_dir: Path) -> None:
+    """
+    Compile all modules in the directory to be moved to `target_dir`
+
+    Modules are compiled in parallel, files that fail to compile (e.g.,
+    Python 2 only modules of some dependency) are skipped.
+    """
+    compileall.compile_dir(
+        directory, quiet=2, workers=0,
+        # paths in tracebacks must point to the final location
+        stripdir=str(directory), prependdir=str(target_dir),
     )
-    return exit_status == 0
 
 
 class WheelInstaller:
     identifier: ClassVar[str]
 
-    def __new__(cls) -> 'WheelInstaller':
+    max_workers: ClassVar[int] = 4
+
+    def __new__(
+        cls, client: Optional[PyPIClient] = None,
+        identifier: Optional[str] = None,
+    ) -> 'WheelInstaller':
         if cls is WheelInstaller:
-            if _is_pip_available():
-                return PipWheelInstaller()
-            else:
-                return BuiltinWheelInstaller()
+            try:
+                cls = WHEEL_INSTALLERS[identifier or DEFAULT_WHEEL_INSTALLER]
+            except KeyError:
+                raise PyPIClientError(f'unknown installer: {identifier}')
         return super().__new__(cls)
 
+    def __init__(
+        self, client: Optional[PyPIClient] = None,
+        identifier: Optional[str] = None,
+    ) -> None:
+        if client is None:
+            client = PyPIClient()
+        self.client = client
+        self.http_client = client.http_client
+
     def install(
         self, wheel: Wheel, output_dir: Path,
         extras: Optional[Iterable[str]] = None,
-    ) -> None:
+        dependencies: Optional[Sequence[Wheel]] = None,
+        post_install: Optional[Callable[[Path], None]] = None,
+        activate: bool = True,
+    ) -> Path:
+        """
+        Install the wheel as a new version of the package and activate it,
+        return the version directory
+
+        `output_dir` is the package directory, the wheel is installed into
+        a versioned sibling directory (see :mod:`dl_plus.packagedir`).
+        Concurrent installs of the same package are serialized. Installed
+        files are shared with other packages via the store (see
+        :mod:`dl_plus.store`).
+
+        If `dependencies` is passed, exactly these wheels are installed
+        as dependencies instead of resolving them (e.g., from a lockfile).
+
+        Modules are compiled to bytecode before activation, then
+        `post_install` is called with the populated (not yet activated)
+        directory, e.g., to prebuild indexes.
+
+        If `activate` is false, the version is installed side by side with
+        the active one and kept until removed explicitly.
+        """
         _extras: tuple[str, ...]
         if extras is None:
             _extras = ()
         else:
             _extras = tuple(extras)
-        with tempfile.TemporaryDirectory() as _tmp_dir:
-            tmp_dir = Path(_tmp_dir) / output_dir.name
-            self._install(wheel, tmp_dir, _extras)
-            if output_dir.exists():
-                shutil.rmtree(output_dir)
+        return self._install_version(
+            wheel, output_dir, _extras,
+            lambda tmp_dir: self._install(
+                wheel, tmp_dir, _extras, dependencies),
+            post_install, activate,
+        )
+
+    def install_many(self, requests: Sequence[InstallRequest]) -> None:
+        """Install several packages, see :meth:`install`."""
+        for request in requests:
+            self.install(*request)
+
+    def _install_version(
+        self, wheel: Wheel, output_dir: Path, extras: tuple[str, ...],
+        populate: Callable[[Path], Optional[Sequence[Wheel]]],
+        post_install: Optional[Callable[[Path], None]] = None,
+        activate: bool = True,
+    ) -> Path:
+        """
+        Populate a temporary directory with `populate` callable (returning
+        installed dependencies) and activate (or keep) it as a new package
+        version
+        """
+        os.makedirs(output_dir.parent, exist_ok=True)
+        with packagedir.get_lock(output_dir):
+            gc_thread = packagedir.collect_garbage_in_background(output_dir)
+            tmp_dir = packagedir.get_tmp_dir(output_dir)
+            if tmp_dir.exists():
+                shutil.rmtree(tmp_dir)
+            try:
+                installed_dependencies = populate(tmp_dir)
+                save_metadata(tmp_dir, wheel.metadata)
+                save_dependencies(
+                    tmp_dir, wheel, extras, installed_dependencies)
+                version_dir = packagedir.get_new_version_dir(
+                    output_dir, wheel.version)
+                compile_bytecode(tmp_dir, version_dir)
+                if post_install is not None:
+                    post_install(tmp_dir)
+                store.deduplicate(tmp_dir)
+                os.replace(tmp_dir, version_dir)
+            finally:
+                if tmp_dir.exists():
+                    shutil.rmtree(tmp_dir, ignore_errors=True)
+            gc_thread.join()
+            if activate:
+                packagedir.switch(output_dir, version_dir)
+                installed.add(output_dir, version_dir)
             else:
-                os.makedirs(output_dir.parent, exist_ok=True)
-            shutil.move(tmp_dir, output_dir.parent)
-        save_metadata(output_dir, wheel.metadata)
+                packagedir.keep(version_dir)
+        store.collect_garbage()
+        collect_wheel_cache_garbage()
+        return version_dir
 
-    def _install(self, wheel: Wheel, tmp_dir: Path) -> None:
+    def _install(
+        self, wheel: Wheel, tmp_dir: Path, extras: tuple[str, ...],
+        dependencies: Optional[Sequence[Wheel]],
+    ) -> Optional[Sequence[Wheel]]:
+        """
+        Install the wheel with dependencies into `tmp_dir` and return
+        the installed dependencies or `None` if they are not known
+        """
         raise NotImplementedError
 
+    def download_all(self, wheels: Iterable[Wheel]) -> list[Path]:
+        """
+        Download the wheels concurrently, see :meth:`download`
 
-class BuiltinWheelInstaller(WheelInstaller):
-    # builtin installer cannot install wheel dependencies
-    identifier = 'builtin'
+        Every distinct wheel is downloaded once (a dependency shared by
+        several packages is usually listed several times), the returned
+        paths correspond to `wheels`.
+        """
+        wheels = list(wheels)
+        unique: Dict[tuple[str, str], Wheel] = {}
+        for wheel in wheels:
+            unique.setdefault((wheel.filename, wheel.sha256), wheel)
+        with ThreadPoolExecutor(self.max_workers) as executor:
+            paths = dict(zip(
+                unique, executor.map(self.download, unique.values())))
+        return [paths[(wheel.filename, wheel.sha256)] for wheel in wheels]
 
-    def _install(
-        self, wheel: Wheel, tmp_dir: Path, extras: tuple[str, ...],
-    ) -> None:
-        with self._download(wheel.url, wheel.sha256) as fobj:
-            with zipfile.ZipFile(fobj) as zfobj:
-                zfobj.extractall(tmp_dir)
+    def download(self, wheel: Wheel) -> Path:
+        """
+        Download the wheel to the wheel cache and return its path
+
+        An interrupted download is kept as a `.part` file next to
+        the cached wheels and resumed using the `Range` header, both
+        within the current run (after a dropped connection) and
+        in subsequent runs.
+
+        :raises DownloadError:
+        """
+        if wheel.url.startswith('file:'):
+            return self._get_local_wheel(wheel)
+        cache_dir = get_wheel_cache_dir()
+        path = cache_dir / wheel.filename
+        # the partial file is shared by concurrent downloads of the wheel
+        # (e.g., a common dependency of several packages)
+        with FileLock(cache_dir / f'.{wheel.filename}.lock'):
+            if path.is_file() and _get_file_sha256(path) == wheel.sha256:
+                # the modification time is the last use time,
+                # see `collect_wheel_cache_garbage()`
+                try:
+                    os.utime(path)
+                except OSError:
+                    pass
+                return path
+            return self._download_locked(wheel, path)
 
-    def _download(self, url: str, sha256: str) -> BytesIO:
+    def _download_locked(self, wheel: Wheel, path: Path) -> Path:
+        part_path = path.with_name(f'{path.name}.part')
+        url = wheel.url
+        error: Optional[Exception] = None
+        for _ in range(_DOWNLOAD_ATTEMPTS):
+            try:
+                resumed = self._download_part(url, part_path)
+            except HTTPError as exc:
+                if exc.code != 416:
+                    raise DownloadError(f'{url}: {exc}') from exc
+                # range not satisfiable, most likely the partial file
+                # is already complete, let the checksum decide
+                resumed = True
+            except OSError as exc:
+                error = exc
+                continue
+            hexdigest = _get_file_sha256(part_path)
+            if hexdigest == wheel.sha256:
+                os.replace(part_path, path)
+                return path
+            part_path.unlink()
+            if not resumed:
+                raise DownloadError(
+                    f'{url}: sha256 mismatch: expected {wheel.sha256}, '
+                    f'got {hexdigest}'
+                )
+            # the partial file is stale or corrupted, start from scratch
+            error = None
+        raise DownloadError(f'{url}: {error}') from error
+
+    def _get_local_wheel(self, wheel: Wheel) -> Path:
+        path = file_url_to_path(wheel.url)
         try:
-            with urlopen(url, timeout=_HTTP_TIMEOUT) as response:
-                buffer = BytesIO(response.read())
+            hexdigest = _get_file_sha256(path)
         except OSError as exc:
-            raise DownloadError(f'{url}: {exc}') from exc
-        digest = hashlib.sha256(buffer.getvalue())
-        hexdigest = digest.hexdigest()
-        if hexdigest != sha256:
+            raise DownloadError(f'{path}: {exc}') from exc
+        if hexdigest != wheel.sha256:
             raise DownloadError(
-                f'{url}: sha256 mismatch: expected {sha256}, got {hexdigest}')
-        return buffer
+                f'{path}: sha256 mismatch: expected {wheel.sha256}, '
+                f'got {hexdigest}'
+            )
+        return path
+
+    def _download_part(self, url: str, part_path: Path) -> bool:
+        """
+        Download the rest of the file, return whether the partial file
+        was resumed
+        """
+        try:
+            offset = part_path.stat().st_size
+        except FileNotFoundError:
+            offset = 0
+        headers = {}
+        if offset:
+            headers['Range'] = f'bytes={offset}-'
+        with self.http_client.request(url, headers) as response:
+            if offset and response.status != 206:
+                # the server ignored the range request
+                mode = 'wb'
+            else:
+                mode = 'ab'
+            with open(part_path, mode) as fobj:
+                while chunk := response.read(_DOWNLOAD_CHUNK_SIZE):
+                    fobj.write(chunk)
+        return bool(offset) and mode == 'ab'
+
+
+class BuiltinWheelInstaller(WheelInstaller):
+    # builtin installer resolves dependencies using the package index
+    # and downloads wheels concurrently
+    identifier = 'builtin'
+
+    def _install(
+        self, wheel: Wheel, tmp_dir: Path, extras: tuple[str, ...],
+        dependencies: Optional[Sequence[Wheel]],
+    ) -> Optional[Sequence[Wheel]]:
+        if dependencies is None:
+            from dl_plus.resolver import Resolver
+            resolver = Resolver(
+                self.client.index, self.download, self.max_workers)
+            dependencies = resolver.resolve(wheel, extras)
+        for path in self.download_all([wheel, *dependencies]):
+            extract_wheel(path, tmp_dir)
+        return dependencies
 
 
 class PipWheelInstaller(WheelInstaller):
     # pip installer installs wheel dependencies
     identifier = 'pip'
 
+    def install_many(self, requests: Sequence[InstallRequest]) -> None:
+        """
+        Install several packages with a single pip run
+
+        All packages are installed into a shared staging directory, then
+        every package directory is populated with the distributions
+        required by the package (according to the pip installation report).
+        If pip fails (e.g., the packages have conflicting dependencies
+        or pip is too old to write the report), the packages are installed
+        one by one.
+        """
+        if len(requests) < 2:
+            super().install_many(requests)
+            return
+        os.makedirs(get_data_home(), exist_ok=True)
+        # the staging directory is on the same filesystem, so that files
+        # can be hard linked to package directories
+        staging_dir = Path(
+            tempfile.mkdtemp(prefix='.pip-staging-', dir=get_data_home()))
+        try:
+            try:
+                report = self._pip_install_many(requests, staging_dir)
+            except subprocess.CalledProcessError:
+                super().install_many(requests)
+                return
+            dist_info_dirs = {
+                normalize_name(path.name.partition('-')[0]): path
+                for path in staging_dir.glob('*.dist-info')
+            }
+            for request in requests:
+                names = self._get_distribution_names(request, report)
+                self._install_version(
+                    request.wheel, request.output_dir,
+                    tuple(request.extras or ()),
+                    partial(
+                        self._populate_from_staging,
+                        staging_dir,
+                        [
+                            dist_info_dirs[name] for name in names
+                            if name in dist_info_dirs
+                        ],
+                        request.dependencies,
+                    ),
+                    request.post_install,
+                )
+        finally:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+
+    def _pip_install_many(
+        self, requests: Sequence[InstallRequest], staging_dir: Path,
+    ) -> Dict[str, Dict]:
+        """
+        Install all packages into the staging directory and return
+        the core metadata of installed distributions by normalized names
+        """
+        wheels = []
+        for request in requests:
+            wheels.append((request.wheel, request.extras))
+            wheels.extend(
+                (wheel, None) for wheel in request.dependencies or ())
+        paths = self.download_all(wheel for wheel, _ in wheels)
+        requirements = {}
+        for (wheel, extras), path in zip(wheels, paths):
+            _extras = f'[{",".join(extras)}]' if extras else ''
+            requirements[f'{wheel.name}{_extras}'] = (
+                f'{wheel.name}{_extras} @ {path.as_uri()}'
+                f'#sha256={wheel.sha256}'
+            )
+        report_path = staging_dir / '.report.json'
+        subprocess.check_call([
+            sys.executable, '-m', 'pip', 'install',
+            '--quiet', '--disable-pip-version-check', '--no-compile',
+            '--target', str(staging_dir / 'target'),
+            '--only-binary', ':all:',
+            '--report', str(report_path),
+            *self._get_index_args(),
+            *requirements.values(),
+        ])
+        with open(report_path) as fobj:
+            report = json.load(fobj)
+        for path in (staging_dir / 'target').iterdir():
+            os.replace(path, staging_dir / path.name)
+        return {
+            normalize_name(item['metadata']['name']): item['metadata']
+            for item in report['install']
+        }
+
+    def _get_distribution_names(
+        self, request: InstallRequest, report: Dict[str, Dict],
+    ) -> Set[str]:
+        """
+        Return normalized names of the distributions required
+        by the package: the package itself and its dependency closure
+        """
+        root_name = normalize_name(request.wheel.name)
+        if request.dependencies is not None:
+            return {root_name, *(
+                normalize_name(wheel.name) for wheel in request.dependencies)}
+        environment = default_environment()
+        extras_by_name: Dict[str, FrozenSet[str]] = {}
+        stack = [(root_name, frozenset(
+            map(normalize_name, request.extras or ())))]
+        while stack:
+            name, extras = stack.pop()
+            if name not in report:
+                continue
+            known_extras = extras_by_name.get(name)
+            if known_extras is not None and extras <= known_extras:
+                continue
+            extras = extras_by_name[name] = extras | (
+                known_extras or frozenset())
+            for requirement_string in report[name].get('requires_dist', []):
+                requirement = Requirement(requirement_string)
+                if requirement.is_applicable(extras, environment):
+                    stack.append(
+                        (requirement.normalized_name, requirement.extras))
+        return set(extras_by_name)
+
+    def _populate_from_staging(
+        self, staging_dir: Path, dist_info_dirs: list[Path],
+        dependencies: Optional[Sequence[Wheel]], tmp_dir: Path,
+    ) -> Optional[Sequence[Wheel]]:
+        for dist_info_dir in dist_info_dirs:
+            for path in store.read_record(dist_info_dir) or ():
+                source = staging_dir / path
+                if not source.is_file():
+                    continue
+                target = tmp_dir / path
+                target.parent.mkdir(parents=True, exist_ok=True)
+                try:
+                    os.link(source, target)
+                except OSError:
+                    shutil.copy2(source, target)
+        return dependencies
+
     def _install(
         self, wheel: Wheel, tmp_dir: Path, extras: tuple[str, ...],
-    ) -> None:
+        dependencies: Optional[Sequence[Wheel]],
+    ) -> Optional[Sequence[Wheel]]:
+        if dependencies is not None:
+            # the exact set is known, there is nothing to resolve
+            paths = self.download_all([wheel, *dependencies])
+            subprocess.check_call([
+                sys.executable, '-m', 'pip', 'install',
+                '--quiet', '--disable-pip-version-check', '--no-compile',
+                '--target', str(tmp_dir),
+                '--no-deps', '--no-index',
+                *map(str, paths),
+            ])
+            return dependencies
         if extras:
             _extras = f'[{",".join(extras)}]'
         else:
             _extras = ''
+        # dependencies are downloaded (and cached) by pip itself
+        wheel_url = self.download(wheel).as_uri()
         subprocess.check_call([
             sys.executable, '-m', 'pip', 'install',
-            '--quiet', '--disable-pip-version-check',
+            '--quiet', '--disable-pip-version-check', '--no-compile',
             '--target', str(tmp_dir),
             '--only-binary', ':all:',
-            f'{wheel.name}{_extras} @ {wheel.url}#sha256={wheel.sha256}',
+            *self._get_index_args(),
+            f'{wheel.name}{_extras} @ {wheel_url}#sha256={wheel.sha256}',
         ])
+        return None
+
+    def _get_index_args(self) -> list[str]:
+        """Return pip options making pip use the same package index."""
+        index = self.client.index
+        if isinstance(index, SimplePackageIndex):
+            return ['--index-url', index.base_url]
+        if isinstance(index, LocalPackageIndex):
+            if any(index.path.glob('*.whl')):
+                return ['--no-index', '--find-links', str(index.path)]
+            return ['--index-url', index.path.as_uri()]
+        # pip does not support the JSON API, use its own configuration
+        return []
+
+
+WHEEL_INSTALLERS: Dict[str, type[WheelInstaller]] = {
+    installer.identifier: installer
+    for installer in (BuiltinWheelInstaller, PipWheelInstaller)
+}
+
+DEFAULT_WHEEL_INSTALLER = BuiltinWheelInstaller.identifier
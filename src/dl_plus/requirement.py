@@ -0,0 +1,438 @@
+"""
+Dependency specifiers (PEP 508): requirements, version specifiers
+(PEP 440) and environment markers
+
+Only the parts required by the builtin wheel installer are implemented.
+"""
+
+from __future__ import annotations
+
+import os
+import platform
+import re
+import sys
+from typing import Callable, Dict, FrozenSet, List, Optional, Tuple, Union
+
+from dl_plus.version import Version, parse_version
+
+
+class InvalidRequirement(ValueError):
+
+    pass
+
+
+def normalize_name(name: str) -> str:
+    # https://packaging.python.org/en/latest/specifications/name-normalization/
+    return re.sub(r'[-_.]+', '-', name).lower()
+
+
+# version specifiers
+
+
+SPECIFIER_REGEX = re.compile(
+    r'^\s*(?P<operator>~=|===|==|!=|<=|>=|<|>)\s*(?P<version>[^\s,;)]+)\s*$')
+
+
+class Specifier:
+    """A single version clause, e.g., `>=1.0` or `==2.*`"""
+
+    __slots__ = ('operator', 'version', '_version', '_prefix')
+
+    def __init__(self, specifier: str) -> None:
+        match = SPECIFIER_REGEX.fullmatch(specifier)
+        if not match:
+            raise InvalidRequirement(f'invalid specifier: {specifier}')
+        self.operator = match['operator']
+        self.version = match['version']
+        self._prefix = False
+        version = self.version
+        if self.operator in ('==', '!=') and version.endswith('.*'):
+            self._prefix = True
+            version = version[:-2]
+        self._version: Optional[Version] = None
+        if self.operator != '===':
+            parsed = parse_version(version)
+            if parsed is None:
+                raise InvalidRequirement(f'invalid specifier: {specifier}')
+            self._version = parsed
+
+    def __str__(self) -> str:
+        return f'{self.operator}{self.version}'
+
+    def __repr__(self) -> str:
+        return f'<Specifier: {self}>'
+
+    @property
+    def allows_prereleases(self) -> bool:
+        return bool(
+            self._version and self._version.is_prerelease
+            and self.operator in ('==', '~=', '>=', '<=', '===')
+        )
+
+    def contains(self, version: Union[str, Version]) -> bool:
+        if self.operator == '===':
+            return str(version) == self.version
+        if isinstance(version, str):
+            _version = parse_version(version)
+            if _version is None:
+                return False
+            version = _version
+        spec = self._version
+        assert spec is not None
+        operator = self.operator
+        if operator in ('==', '!='):
+            if self._prefix:
+                release = _pad(version.release, len(spec.release))
+                matches = (
+                    version.epoch == spec.epoch
+                    and release[:len(spec.release)] == spec.release
+                )
+            elif spec.local is None:
+                matches = Version(version.public) == spec
+            else:
+                matches = version == spec
+            return matches if operator == '==' else not matches
+        if operator == '~=':
+            prefix = Specifier(f'=={spec.base_version.rsplit(".", 1)[0]}.*')
+            return version >= spec and prefix.contains(version)
+        public = Version(version.public)
+        if operator == '<=':
+            return public <= spec
+        if operator == '>=':
+            return public >= spec
+        if operator == '<':
+            if not public < spec:
+                return False
+            # <V does not match pre-releases of V unless V is a pre-release
+            return spec.is_prerelease or not (
+                version.is_prerelease
+                and Version(version.base_version) == Version(spec.base_version)
+            )
+        if operator == '>':
+            if not public > spec:
+                return False
+            # >V does not match post-releases of V unless V is a post-release
+            return spec.post is not None or not (
+                version.post is not None
+                and Version(version.base_version) == Version(spec.base_version)
+            )
+        raise AssertionError(operator)
+
+
+def _pad(release: Tuple[int, ...], length: int) -> Tuple[int, ...]:
+    return release + (0,) * (length - len(release))
+
+
+class SpecifierSet:
+    """A comma-separated list of version clauses, e.g., `>=1.0,!=1.3`"""
+
+    __slots__ = ('specifiers',)
+
+    def __init__(self, specifiers: str = '') -> None:
+        specifiers = specifiers.strip()
+        if specifiers.startswith('(') and specifiers.endswith(')'):
+            specifiers = specifiers[1:-1]
+        self.specifiers = tuple(
+            Specifier(specifier) for specifier in specifiers.split(',')
+            if specifier.strip()
+        )
+
+    def __str__(self) -> str:
+        return ','.join(map(str, self.specifiers))
+
+    def __repr__(self) -> str:
+        return f'<SpecifierSet: {self}>'
+
+    def __bool__(self) -> bool:
+        return bool(self.specifiers)
+
+    def __and__(self, other: SpecifierSet) -> SpecifierSet:
+        combined = SpecifierSet()
+        combined.specifiers = self.specifiers + other.specifiers
+        return combined
+
+    def contains(
+        self, version: Union[str, Version], prereleases: bool = False,
+    ) -> bool:
+        if isinstance(version, str):
+            _version = parse_version(version)
+            if _version is None:
+                return False
+            version = _version
+        if version.is_prerelease and not prereleases and not any(
+                spec.allows_prereleases for spec in self.specifiers):
+            return False
+        return all(spec.contains(version) for spec in self.specifiers)
+
+
+# environment markers
+
+
+MARKER_TOKEN_REGEX = re.compile(r"""
+    \s*(?:
+        (?P<string>'[^']*'|"[^"]*")
+        | (?P<operator>===|==|!=|<=|>=|~=|<|>|not\s+in\b|in\b)
+        | (?P<boolean>and\b|or\b)
+        | (?P<paren>[()])
+        | (?P<variable>[a-z_.]+)
+    )
+""", re.VERBOSE)
+
+MARKER_VARIABLES = frozenset([
+    'implementation_name', 'implementation_version', 'os_name',
+    'platform_machine', 'platform_release', 'platform_system',
+    'platform_version', 'python_full_version', 'python_version',
+    'platform_python_implementation', 'sys_platform', 'extra',
+    # legacy aliases
+    'os.name', 'sys.platform', 'platform.version', 'platform.machine',
+    'platform.python_implementation', 'python_implementation',
+])
+
+_VERSION_VARIABLES = frozenset([
+    'implementation_version', 'python_full_version', 'python_version',
+])
+
+
+Environment = Dict[str, str]
+_Evaluator = Callable[[Environment], bool]
+
+
+def _format_full_version(info: 'sys._version_info') -> str:
+    version = f'{info.major}.{info.minor}.{info.micro}'
+    if info.releaselevel != 'final':
+        version += f'{info.releaselevel[0]}{info.serial}'
+    return version
+
+
+def default_environment() -> Environment:
+    return {
+        'implementation_name': sys.implementation.name,
+        'implementation_version': _format_full_version(
+            sys.implementation.version),
+        'os_name': os.name,
+        'platform_machine': platform.machine(),
+        'platform_release': platform.release(),
+        'platform_system': platform.system(),
+        'platform_version': platform.version(),
+        'python_full_version': platform.python_version(),
+        'platform_python_implementation': platform.python_implementation(),
+        'python_version': '.'.join(platform.python_version_tuple()[:2]),
+        'sys_platform': sys.platform,
+    }
+
+
+class Marker:
+    """An environment marker, e.g., `python_version >= "3.9"`"""
+
+    __slots__ = ('marker', '_evaluator')
+
+    def __init__(self, marker: str) -> None:
+        self.marker = marker.strip()
+        self._evaluator = _MarkerParser(self.marker).parse()
+
+    def __str__(self) -> str:
+        return self.marker
+
+    def __repr__(self) -> str:
+        return f'<Marker: {self}>'
+
+    def evaluate(self, environment: Optional[Environment] = None) -> bool:
+        if environment is None:
+            environment = default_environment()
+        return self._evaluator(environment)
+
+
+class _MarkerParser:
+
+    def __init__(self, marker: str) -> None:
+        self.marker = marker
+        self.tokens: List[Tuple[str, str]] = []
+        position = 0
+        while position < len(marker):
+            if marker[position:].isspace():
+                break
+            match = MARKER_TOKEN_REGEX.match(marker, position)
+            if not match or not match.lastgroup:
+                raise InvalidRequirement(f'invalid marker: {marker}')
+            kind = match.lastgroup
+            value = match[kind]
+            if kind == 'variable' and value not in MARKER_VARIABLES:
+                raise InvalidRequirement(
+                    f'invalid marker: {marker}: unknown variable {value}')
+            self.tokens.append((kind, value))
+            position = match.end()
+        self.position = 0
+
+    def _peek(self) -> Optional[Tuple[str, str]]:
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return None
+
+    def _next(self, kind: str) -> str:
+        token = self._peek()
+        if token is None or token[0] != kind:
+            raise InvalidRequirement(f'invalid marker: {self.marker}')
+        self.position += 1
+        return token[1]
+
+    def parse(self) -> _Evaluator:
+        evaluator = self._parse_or()
+        if self._peek() is not None:
+            raise InvalidRequirement(f'invalid marker: {self.marker}')
+        return evaluator
+
+    def _parse_or(self) -> _Evaluator:
+        evaluators = [self._parse_and()]
+        while self._peek() == ('boolean', 'or'):
+            self.position += 1
+            evaluators.append(self._parse_and())
+        if len(evaluators) == 1:
+            return evaluators[0]
+        return lambda env: any(evaluator(env) for evaluator in evaluators)
+
+    def _parse_and(self) -> _Evaluator:
+        evaluators = [self._parse_expression()]
+        while self._peek() == ('boolean', 'and'):
+            self.position += 1
+            evaluators.append(self._parse_expression())
+        if len(evaluators) == 1:
+            return evaluators[0]
+        return lambda env: all(evaluator(env) for evaluator in evaluators)
+
+    def _parse_expression(self) -> _Evaluator:
+        if self._peek() == ('paren', '('):
+            self.position += 1
+            evaluator = self._parse_or()
+            self._next('paren')
+            return evaluator
+        lhs = self._parse_value()
+        operator = ' '.join(self._next('operator').split())
+        rhs = self._parse_value()
+        return partial_compare(lhs, operator, rhs)
+
+    def _parse_value(self) -> Tuple[bool, str]:
+        """Return (is_variable, value) pair."""
+        token = self._peek()
+        if token is None or token[0] not in ('string', 'variable'):
+            raise InvalidRequirement(f'invalid marker: {self.marker}')
+        self.position += 1
+        kind, value = token
+        if kind == 'string':
+            return False, value[1:-1]
+        return True, value.replace('.', '_')
+
+
+def _resolve(value: Tuple[bool, str], environment: Environment) -> str:
+    is_variable, _value = value
+    if not is_variable:
+        return _value
+    if _value == 'python_implementation':
+        _value = 'platform_python_implementation'
+    return environment.get(_value, '')
+
+
+def partial_compare(
+    lhs: Tuple[bool, str], operator: str, rhs: Tuple[bool, str],
+) -> _Evaluator:
+    variables = {value for is_variable, value in (lhs, rhs) if is_variable}
+    is_extra = 'extra' in variables
+    is_version = bool(variables & _VERSION_VARIABLES)
+
+    def evaluate(environment: Environment) -> bool:
+        left = _resolve(lhs, environment)
+        right = _resolve(rhs, environment)
+        if is_extra:
+            left, right = normalize_name(left), normalize_name(right)
+        if operator == 'in':
+            return left in right
+        if operator == 'not in':
+            return left not in right
+        if is_version or operator not in ('==', '!='):
+            try:
+                return Specifier(f'{operator}{right}').contains(left)
+            except InvalidRequirement:
+                pass
+        if operator == '==':
+            return left == right
+        if operator == '!=':
+            return left != right
+        raise InvalidRequirement(
+            f'cannot compare {left!r} and {right!r} with {operator}')
+
+    return evaluate
+
+
+# requirements
+
+
+REQUIREMENT_REGEX = re.compile(r"""
+    ^\s*
+    (?P<name>[A-Za-z0-9](?:[A-Za-z0-9._-]*[A-Za-z0-9])?)
+    \s*
+    (?:\[(?P<extras>[^\]]*)\])?
+    \s*
+    (?:
+        @\s*(?P<url>[^\s;]+)
+        | (?P<specifier>[^;]*)
+    )
+    \s*
+    (?:;\s*(?P<marker>.+))?
+    $
+""", re.VERBOSE)
+
+
+class Requirement:
+    """A dependency specifier, e.g., `requests[socks]>=2.32; os_name=="nt"`"""
+
+    __slots__ = ('name', 'extras', 'specifier', 'url', 'marker')
+
+    def __init__(self, requirement: str) -> None:
+        match = REQUIREMENT_REGEX.fullmatch(requirement)
+        if not match:
+            raise InvalidRequirement(f'invalid requirement: {requirement}')
+        self.name: str = match['name']
+        self.extras: FrozenSet[str] = frozenset(
+            normalize_name(extra.strip())
+            for extra in (match['extras'] or '').split(',') if extra.strip()
+        )
+        self.url: Optional[str] = match['url']
+        self.specifier = SpecifierSet(match['specifier'] or '')
+        self.marker: Optional[Marker] = None
+        if match['marker']:
+            self.marker = Marker(match['marker'])
+
+    def __str__(self) -> str:
+        parts = [self.name]
+        if self.extras:
+            parts.append(f'[{",".join(sorted(self.extras))}]')
+        if self.url:
+            parts.append(f' @ {self.url}')
+        else:
+            parts.append(str(self.specifier))
+        if self.marker:
+            parts.append(f'; {self.marker}')
+        return ''.join(parts)
+
+    def __repr__(self) -> str:
+        return f'<Requirement: {self}>'
+
+    @property
+    def normalized_name(self) -> str:
+        return normalize_name(self.name)
+
+    def is_applicable(
+        self, extras: FrozenSet[str] = frozenset(),
+        environment: Optional[Environment] = None,
+    ) -> bool:
+        """
+        Evaluate the marker for the given set of extras requested
+        for the dependent project
+        """
+        if self.marker is None:
+            return True
+        if environment is None:
+            environment = default_environment()
+        for extra in ('', *extras):
+            if self.marker.evaluate({**environment, 'extra': extra}):
+                return True
+        return False
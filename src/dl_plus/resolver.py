@@ -0,0 +1,182 @@
+"""
+Builtin dependency resolver
+
+The resolver is greedy: every project is pinned to the latest version
+with an installable wheel satisfying the requirements known at the moment
+the project is first encountered, there is no backtracking. That is enough
+for dependency trees of backends and extractor plugins, a conflict is
+reported as an error rather than resolved into incompatible versions.
+
+Projects discovered at the same depth of the dependency tree are looked up
+concurrently.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional
+
+from dl_plus.pypi import (
+    PackageIndex, ProjectNotFound, PyPIClientError, RequestError, Wheel,
+    parse_core_metadata, read_wheel_core_metadata, select_wheel_release,
+)
+from dl_plus.requirement import (
+    Environment, InvalidRequirement, Requirement, SpecifierSet,
+    default_environment, normalize_name,
+)
+from dl_plus.version import parse_version
+
+
+DEFAULT_MAX_WORKERS = 4
+
+
+class ResolutionError(PyPIClientError):
+
+    pass
+
+
+class Resolver:
+
+    def __init__(
+        self, index: PackageIndex, download: Callable[[Wheel], Path],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        environment: Optional[Environment] = None,
+    ) -> None:
+        self.index = index
+        self.download = download
+        self.max_workers = max_workers
+        if environment is None:
+            environment = default_environment()
+        self.environment = environment
+
+    def resolve(
+        self, root: Wheel, extras: Iterable[str] = (),
+    ) -> List[Wheel]:
+        """
+        Return wheels of all (direct and transitive) dependencies of
+        the root wheel, the root wheel itself is not included
+
+        :raises ResolutionError:
+        """
+        root_name = normalize_name(root.name)
+        selected: Dict[str, Wheel] = {root_name: root}
+        requested_extras: Dict[str, FrozenSet[str]] = {
+            root_name: frozenset(map(normalize_name, extras))}
+        requirements: Dict[str, List[Requirement]] = {
+            root_name: self._get_requirements(root)}
+        specifiers: Dict[str, SpecifierSet] = {}
+        pending = self._filter_applicable(
+            requirements[root_name], requested_extras[root_name])
+        with ThreadPoolExecutor(self.max_workers) as executor:
+            while pending:
+                new_names: List[str] = []
+                extended_names: List[str] = []
+                for requirement in pending:
+                    name = requirement.normalized_name
+                    if requirement.url:
+                        raise ResolutionError(
+                            f'{requirement}: direct URL requirements '
+                            f'are not supported'
+                        )
+                    specifiers[name] = (
+                        specifiers.get(name, SpecifierSet())
+                        & requirement.specifier
+                    )
+                    if name in selected:
+                        self._check_selected(selected[name], requirement)
+                    elif name not in new_names:
+                        new_names.append(name)
+                    extras = requested_extras.get(name, frozenset())
+                    if not requirement.extras <= extras:
+                        requested_extras[name] = extras | requirement.extras
+                        if name in selected and name not in extended_names:
+                            extended_names.append(name)
+                new_wheels = list(executor.map(
+                    lambda name: self._select(name, specifiers[name]),
+                    new_names,
+                ))
+                selected.update(zip(new_names, new_wheels))
+                requirements.update(zip(
+                    new_names,
+                    executor.map(self._get_requirements, new_wheels),
+                ))
+                pending = []
+                for name in (*new_names, *extended_names):
+                    pending.extend(self._filter_applicable(
+                        requirements[name], requested_extras.get(name)))
+        del selected[root_name]
+        return list(selected.values())
+
+    def _filter_applicable(
+        self, requirements: List[Requirement],
+        extras: Optional[FrozenSet[str]],
+    ) -> List[Requirement]:
+        return [
+            requirement for requirement in requirements
+            if requirement.is_applicable(
+                extras or frozenset(), self.environment)
+        ]
+
+    def _check_selected(self, wheel: Wheel, requirement: Requirement) -> None:
+        if not requirement.specifier.contains(
+                wheel.version, prereleases=True):
+            raise ResolutionError(
+                f'{requirement} is required, but {wheel.name} '
+                f'{wheel.version} is already selected'
+            )
+
+    def _select(self, name: str, specifier: SpecifierSet) -> Wheel:
+        try:
+            releases = self.index.fetch_releases(name)
+        except ProjectNotFound as exc:
+            raise ResolutionError(f'{name}: not found') from exc
+        except RequestError as exc:
+            raise ResolutionError(f'{name}: unexpected error: {exc}') from exc
+        versions = []
+        for version, files in releases.items():
+            parsed_version = parse_version(version)
+            if parsed_version is not None:
+                versions.append((parsed_version, version, files))
+        versions.sort(key=lambda item: item[0], reverse=True)
+        # pre-releases are only considered if no final release matches
+        for prereleases in (False, True):
+            for parsed_version, version, files in versions:
+                if not specifier.contains(parsed_version, prereleases):
+                    continue
+                if select_wheel_release(files) is None:
+                    continue
+                return self._fetch_wheel(name, version)
+        raise ResolutionError(f'{name}{specifier}: no compatible wheel found')
+
+    def _fetch_wheel(self, name: str, version: str) -> Wheel:
+        try:
+            metadata = self.index.fetch_metadata(name, version)
+        except RequestError as exc:
+            raise ResolutionError(
+                f'{name} {version}: unexpected error: {exc}') from exc
+        release = select_wheel_release(metadata.urls)
+        if release is None:
+            raise ResolutionError(
+                f'{name} {version}: no compatible wheel found')
+        return Wheel(
+            name=metadata.name,
+            version=metadata.version,
+            metadata=metadata,
+            filename=release['filename'],
+            url=release['url'],
+            sha256=release['digests']['sha256'],
+        )
+
+    def _get_requirements(self, wheel: Wheel) -> List[Requirement]:
+        requires_dist = wheel.metadata.requires_dist
+        if requires_dist is None:
+            # the index does not provide the core metadata,
+            # read it from the wheel itself
+            core_metadata = read_wheel_core_metadata(self.download(wheel))
+            requires_dist = parse_core_metadata(core_metadata)['requires_dist']
+        try:
+            return [Requirement(requirement) for requirement in requires_dist]
+        except InvalidRequirement as exc:
+            raise ResolutionError(
+                f'{wheel.name} {wheel.version}: {exc}') from exc
@@ -0,0 +1,366 @@
+"""
+Extraction result cache
+
+If enabled by the `results` option of the `[cache]` config section,
+info dicts returned by extractors are stored (compressed) in
+`$DL_PLUS_DATA_HOME/cache/results`, so that repeated runs for the same URL
+(e.g., a media player seeking or reloading a stream) skip the extraction.
+
+An entry is stored for `results-ttl` seconds (or `DLP_RESULT_CACHE_TTL`
+seconds of the extractor plugin) but no longer than the earliest
+expiration time found in the URLs of the info dict (signed media URLs
+usually carry it in `expire`-like query parameters), minus a safety
+margin. Results that cannot be stored as JSON (e.g., lazy playlists) are
+not cached.
+
+If enabled by the `failures` option, extraction failures of the classes
+listed in the `failure-classes` option (see `get_failure_class()`) are
+stored in `$DL_PLUS_DATA_HOME/cache/failures` for `failures-ttl` seconds,
+so that repeated runs for a known unsupported URL fail without fetching
+the page.
+
+Both caches are keyed by the extractor, the normalized URL, and
+the backend options affecting extraction. The caches are disabled by
+the `--no-cache-dir` backend option.
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import re
+import time
+import urllib.parse
+import zlib
+from calendar import timegm
+from pathlib import Path
+from typing import Any, Callable, Collection, Dict, Iterator, Optional
+
+from dl_plus import ytdl
+from dl_plus.config import ConfigValue, get_data_home
+from dl_plus.diskcache import DiskCache
+
+
+MAX_SIZE = 64 * 1024 * 1024
+FAILURE_CACHE_MAX_SIZE = 4 * 1024 * 1024
+
+# entries expire this number of seconds before the URLs
+EXPIRY_MARGIN = 60
+
+# backend params affecting extraction results
+_RELEVANT_PARAMS = (
+    'age_limit',
+    'allsubtitles',
+    'compat_opts',
+    'cookiefile',
+    'cookiesfrombrowser',
+    'extract_flat',
+    'extractor_args',
+    'geo_bypass_country',
+    'geo_bypass_ip_block',
+    'getcomments',
+    'http_headers',
+    'listsubtitles',
+    'noplaylist',
+    'password',
+    'playlist_items',
+    'playlistend',
+    'playliststart',
+    'subtitleslangs',
+    'username',
+    'usenetrc',
+    'writeautomaticsub',
+    'writesubtitles',
+    'youtube_include_dash_manifest',
+    'youtube_include_hls_manifest',
+)
+
+_URL_KEYS = ('url', 'manifest_url', 'fragment_base_url')
+
+# query parameters containing an expiration unix time
+_EXPIRY_PARAMS = ('expire', 'expires', 'exp')
+# query parameters containing a token with an 'exp=' field (Akamai)
+_TOKEN_PARAMS = ('hdnts', 'hdnea', '__token__')
+# signature date and lifetime query parameters (AWS S3, Google Cloud)
+_SIGNATURE_PREFIXES = ('x-amz', 'x-goog')
+_SIGNATURE_DATE_FORMAT = '%Y%m%dT%H%M%SZ'
+
+_EXPIRY_PATH_REGEX = re.compile(r'/expire/(\d+)(?:/|$)')
+
+# 2001-09-09 -- 5138-11-16, smaller numbers are not unix times
+_MIN_TIMESTAMP = 10 ** 9
+_MAX_TIMESTAMP = 10 ** 11
+
+_NOT_FOUND_STATUSES = (404, 410)
+
+FailureClass = ConfigValue.FailureClass
+
+_DEFAULT_PORTS = {'http': ':80', 'https': ':443'}
+
+_installed = False
+
+
+def get_cache_dir() -> Path:
+    return get_data_home() / 'cache' / 'results'
+
+
+def get_cache() -> DiskCache:
+    return DiskCache(get_cache_dir(), MAX_SIZE)
+
+
+def get_failure_cache_dir() -> Path:
+    return get_data_home() / 'cache' / 'failures'
+
+
+def get_failure_cache() -> DiskCache:
+    return DiskCache(get_failure_cache_dir(), FAILURE_CACHE_MAX_SIZE)
+
+
+def _parse_timestamp(value: str) -> Optional[int]:
+    if not value.isdigit():
+        return None
+    timestamp = int(value)
+    if not _MIN_TIMESTAMP <= timestamp < _MAX_TIMESTAMP:
+        return None
+    return timestamp
+
+
+def _iter_url_expiry(url: str) -> Iterator[Optional[float]]:
+    parsed = urllib.parse.urlsplit(url)
+    query = {
+        name.lower(): value for name, value
+        in urllib.parse.parse_qsl(parsed.query)
+    }
+    for name in _EXPIRY_PARAMS:
+        if name in query:
+            yield _parse_timestamp(query[name])
+    for name in _TOKEN_PARAMS:
+        for field in query.get(name, '').split('~'):
+            field_name, _, value = field.partition('=')
+            if field_name == 'exp':
+                yield _parse_timestamp(value)
+    for prefix in _SIGNATURE_PREFIXES:
+        date = query.get(f'{prefix}-date')
+        lifetime = query.get(f'{prefix}-expires')
+        if not date or not lifetime or not lifetime.isdigit():
+            continue
+        try:
+            signed_at = time.strptime(date, _SIGNATURE_DATE_FORMAT)
+        except ValueError:
+            continue
+        yield timegm(signed_at) + int(lifetime)
+    for match in _EXPIRY_PATH_REGEX.finditer(parsed.path):
+        yield _parse_timestamp(match[1])
+
+
+def get_url_expiry(url: str) -> Optional[float]:
+    """
+    Return the expiration unix time of the (signed) URL or `None`
+    if the URL does not seem to expire
+    """
+    expiry = [_expiry for _expiry in _iter_url_expiry(url) if _expiry]
+    return min(expiry) if expiry else None
+
+
+def _iter_urls(obj: Any) -> Iterator[str]:
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            if key in _URL_KEYS and isinstance(value, str):
+                yield value
+            elif isinstance(value, (dict, list)):
+                yield from _iter_urls(value)
+    elif isinstance(obj, list):
+        for item in obj:
+            yield from _iter_urls(item)
+
+
+def get_info_expiry(info: Dict[str, Any]) -> Optional[float]:
+    """Return the earliest expiration unix time of the info dict URLs."""
+    expiry = [
+        _expiry for _expiry in map(get_url_expiry, _iter_urls(info))
+        if _expiry
+    ]
+    return min(expiry) if expiry else None
+
+
+def get_ttl(info: Dict[str, Any], max_ttl: float) -> float:
+    expiry = get_info_expiry(info)
+    if expiry is None:
+        return max_ttl
+    return min(max_ttl, expiry - EXPIRY_MARGIN - time.time())
+
+
+def normalize_url(url: str) -> str:
+    """
+    Lowercase the scheme and the host, drop the default port and the
+    fragment, sort query parameters
+    """
+    parsed = urllib.parse.urlsplit(url)
+    scheme = parsed.scheme.lower()
+    netloc = parsed.netloc.lower()
+    port = _DEFAULT_PORTS.get(scheme)
+    if port and netloc.endswith(port):
+        netloc = netloc[:-len(port)]
+    query = urllib.parse.urlencode(sorted(
+        urllib.parse.parse_qsl(parsed.query, keep_blank_values=True)))
+    return urllib.parse.urlunsplit(
+        (scheme, netloc, parsed.path or '/', query, ''))
+
+
+def _get_param(params: Dict[str, Any], name: str) -> Any:
+    value = params.get(name)
+    if name == 'http_headers' and value:
+        # yt-dlp picks a random user agent per run
+        value = {
+            header: header_value for header, header_value in value.items()
+            if header.lower() != 'user-agent'
+        }
+    return value
+
+
+def _json_default(obj: Any) -> Any:
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj, key=repr)
+    return repr(obj)
+
+
+def _get_key(ie, url: str) -> str:
+    params = ie._downloader.params
+    return json.dumps([
+        ie.ie_key(),
+        normalize_url(url),
+        [_get_param(params, name) for name in _RELEVANT_PARAMS],
+    ], default=_json_default)
+
+
+def _dump(info: Dict[str, Any]) -> Optional[bytes]:
+    try:
+        data = json.dumps(info, allow_nan=False)
+    except (TypeError, ValueError):
+        return None
+    return zlib.compress(data.encode())
+
+
+def _load(data: bytes) -> Optional[Dict[str, Any]]:
+    try:
+        info = json.loads(zlib.decompress(data))
+    except (zlib.error, ValueError):
+        return None
+    return info if isinstance(info, dict) else None
+
+
+def get_failure_class(exc: Exception) -> Optional[FailureClass]:
+    """Return the failure class of the extractor error."""
+    UnsupportedError, GeoRestrictedError = ytdl.import_from(
+        'utils', ['UnsupportedError', 'GeoRestrictedError'])
+    if isinstance(exc, UnsupportedError):
+        return FailureClass.UNSUPPORTED
+    if isinstance(exc, GeoRestrictedError):
+        return FailureClass.GEO_RESTRICTED
+    cause = getattr(exc, 'cause', None)
+    if cause is None:
+        # network errors are expected as well but have causes
+        if getattr(exc, 'expected', False):
+            return FailureClass.UNAVAILABLE
+        return None
+    # yt-dlp networking errors have 'status', urllib errors have 'code'
+    status = getattr(cause, 'status', None) or getattr(cause, 'code', None)
+    if status in _NOT_FOUND_STATUSES:
+        return FailureClass.NOT_FOUND
+    return None
+
+
+class _CachedExtract:
+
+    def __init__(
+        self, extract: Callable, results_ttl: Optional[int],
+        failures_ttl: Optional[int], failure_classes: Collection[str],
+    ) -> None:
+        self.extract = extract
+        self.results_ttl = results_ttl
+        self.failures_ttl = failures_ttl or None
+        self.failure_classes = frozenset(failure_classes)
+        self.error_class = ytdl.import_from('utils', 'ExtractorError')
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        return functools.partial(self, instance)
+
+    def __call__(self, ie, url):
+        if ie._downloader is None or (
+                ie._downloader.params.get('cachedir') is False):
+            return self.extract(ie, url)
+        key = _get_key(ie, url)
+        if self.failures_ttl:
+            self.raise_cached_failure(ie, key)
+        results_ttl = self.results_ttl
+        # the extractor TTL only applies if results are cached at all
+        if results_ttl is not None:
+            extractor_ttl = getattr(ie, 'DLP_RESULT_CACHE_TTL', None)
+            if extractor_ttl is not None:
+                results_ttl = extractor_ttl
+        if results_ttl:
+            info = self.get_cached_result(ie, url, key)
+            if info is not None:
+                return info
+        try:
+            info = self.extract(ie, url)
+        except self.error_class as exc:
+            if self.failures_ttl:
+                self.store_failure(key, exc)
+            raise
+        if results_ttl and isinstance(info, dict):
+            data = _dump(info)
+            if data is not None:
+                get_cache().set(key, data, get_ttl(info, results_ttl))
+        return info
+
+    def get_cached_result(self, ie, url: str, key: str) -> Optional[Dict]:
+        cache = get_cache()
+        data = cache.get(key)
+        if data is None:
+            return None
+        info = _load(data)
+        if info is None:
+            cache.delete(key)
+            return None
+        ie.to_screen(f'Using cached result: {url}')
+        return info
+
+    def raise_cached_failure(self, ie, key: str) -> None:
+        data = get_failure_cache().get(key)
+        if data is None:
+            return
+        message = data.decode(errors='replace')
+        raise self.error_class(f'{message} (cached failure)', expected=True)
+
+    def store_failure(self, key: str, exc: Exception) -> None:
+        if get_failure_class(exc) not in self.failure_classes:
+            return
+        # yt-dlp prefixes the message with the extractor name and the id
+        message = getattr(exc, 'orig_msg', None) or str(exc)
+        get_failure_cache().set(key, message.encode(), self.failures_ttl)
+
+
+def install(
+    results_ttl: Optional[int], failures_ttl: Optional[int] = None,
+    failure_classes: Collection[str] = (),
+) -> None:
+    """
+    Patch `InfoExtractor.extract()` of the backend to cache results
+    and failures
+
+    :param results_ttl: the maximum number of seconds results are cached
+        for or `None` if results are not cached.
+    :param failures_ttl: the number of seconds failures of
+        `failure_classes` (see `get_failure_class()`) are cached for
+        or `None` if failures are not cached.
+    """
+    global _installed
+    if _installed:
+        return
+    _installed = True
+    InfoExtractor = ytdl.import_from('extractor.common', 'InfoExtractor')
+    InfoExtractor.extract = _CachedExtract(
+        InfoExtractor.extract, results_ttl, failures_ttl, failure_classes)
@@ -0,0 +1,121 @@
+"""
+Snapshots of derived data
+
+Parsing configuration files and similar work is done on every run although
+the inputs rarely change. A snapshot stores the result (marshalled builtin
+types) along with a key describing the inputs: file paths, modification
+times and sizes (see `get_file_stamp()`), environment variables, etc.
+The snapshot is used as long as the key matches.
+
+Snapshots are best effort: any error results in a miss, and nothing is
+stored unless the data home already exists.
+"""
+
+from __future__ import annotations
+
+import marshal
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Hashable, Optional, Tuple
+
+from dl_plus.config import get_data_home
+from dl_plus.const import DL_PLUS_VERSION
+
+
+FileStamp = Tuple[str, int, int]
+
+_SNAPSHOT_VERSION = 1
+_SUFFIX = '.marshal'
+
+# files modified this recently may be modified again without changing
+# their stamps (mtime resolution of some file systems is 1-2 seconds),
+# snapshots of such files are not stored
+_RACY_PERIOD = 2
+
+
+def get_file_stamp(path: Optional[Path]) -> Optional[FileStamp]:
+    """
+    Return the (path, mtime in nanoseconds, size) triple
+    or `None` if `path` is `None` or does not exist
+    """
+    if path is None:
+        return None
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (str(path), stat.st_mtime_ns, stat.st_size)
+
+
+def is_racy(stamp: Optional[FileStamp]) -> bool:
+    if stamp is None:
+        return False
+    return time.time_ns() - stamp[1] < _RACY_PERIOD * 1_000_000_000
+
+
+def get_snapshot_dir() -> Path:
+    return get_data_home() / 'cache' / 'snapshots'
+
+
+def _get_path(name: str) -> Path:
+    return get_snapshot_dir() / (name + _SUFFIX)
+
+
+def load(name: str, key: Hashable) -> Optional[Any]:
+    """
+    Return the snapshot value or `None` if there is no snapshot
+    or its key does not match `key`
+    """
+    try:
+        with open(_get_path(name), 'rb') as fobj:
+            version, dl_plus_version, stored_key, value = marshal.load(fobj)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if (
+        version != _SNAPSHOT_VERSION
+        or dl_plus_version != DL_PLUS_VERSION
+        or stored_key != key
+    ):
+        return None
+    return value
+
+
+def save(
+    name: str, key: Hashable, value: Any,
+    stamps: Tuple[Optional[FileStamp], ...] = (),
+) -> None:
+    """
+    Store the snapshot
+
+    :param stamps: the stamps of the input files, the snapshot is not
+        stored if any of the files was modified too recently.
+    """
+    if any(map(is_racy, stamps)):
+        return
+    try:
+        if not get_data_home().is_dir():
+            return
+        directory = get_snapshot_dir()
+        directory.mkdir(parents=True, exist_ok=True)
+        data = marshal.dumps(
+            (_SNAPSHOT_VERSION, DL_PLUS_VERSION, key, value))
+        fd, tmp_path = tempfile.mkstemp(
+            prefix=f'.{name}-', suffix='.tmp', dir=directory)
+        try:
+            with os.fdopen(fd, 'wb') as fobj:
+                fobj.write(data)
+            os.replace(tmp_path, _get_path(name))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except (OSError, ValueError):
+        pass
+
+
+def invalidate(name: str) -> None:
+    try:
+        os.unlink(_get_path(name))
+    except OSError:
+        pass
@@ -0,0 +1,161 @@
+"""
+Content-addressed distribution store
+
+Backends and extractor plugins are installed into separate directories,
+so the same dependency (e.g., `requests` or `certifi`) is usually installed
+several times. After a package is installed, every distribution found in
+its directory is moved to the store, `store/<dist-info name>-<digest>`,
+where the digest is the hash of the distribution `RECORD` file (which
+contains hashes of all installed files), and the files in the package
+directory are replaced with hard links to the store copies. Thus, each
+distribution is stored on disk (and cached in memory) only once, no matter
+how many packages depend on it.
+
+A store entry is removed by the garbage collector once its files are not
+linked from any package directory.
+"""
+
+from __future__ import annotations
+
+import csv
+import hashlib
+import os
+import shutil
+from pathlib import Path
+from typing import List, Optional
+
+from dl_plus.config import get_data_home
+from dl_plus.utils import FileLock
+
+
+_TMP_SUFFIX = '.tmp'
+_DIGEST_LENGTH = 16
+
+
+def get_store_dir() -> Path:
+    return get_data_home() / 'store'
+
+
+def get_lock() -> FileLock:
+    """Return the lock serializing modifications of the store."""
+    return FileLock(get_store_dir() / '.lock')
+
+
+def read_record(dist_info_dir: Path) -> Optional[List[str]]:
+    """
+    Return paths (relative to the installation directory) of files
+    listed in the distribution `RECORD` file
+    """
+    try:
+        with open(dist_info_dir / 'RECORD', newline='') as fobj:
+            rows = list(csv.reader(fobj))
+    except (OSError, csv.Error):
+        return None
+    paths = []
+    for row in rows:
+        if not row or not row[0]:
+            continue
+        path = row[0]
+        top, _, rest = path.partition('/')
+        if top.endswith('.data'):
+            # `purelib` and `platlib` files are installed into the root,
+            # see `dl_plus.pypi.extract_wheel`
+            scheme, _, rest = rest.partition('/')
+            if scheme not in ('purelib', 'platlib'):
+                continue
+            path = rest
+        if not path or os.path.isabs(path) or '..' in path.split('/'):
+            # e.g., scripts installed outside of the target directory
+            continue
+        paths.append(path)
+    return paths
+
+
+def _get_entry_name(dist_info_dir: Path) -> str:
+    digest = hashlib.sha256((dist_info_dir / 'RECORD').read_bytes())
+    name = dist_info_dir.name[:-len('.dist-info')]
+    return f'{name}-{digest.hexdigest()[:_DIGEST_LENGTH]}'
+
+
+def _create_entry(entry_dir: Path, tree_dir: Path, paths: List[str]) -> None:
+    tmp_dir = entry_dir.with_name(
+        f'.{entry_dir.name}.{os.getpid()}{_TMP_SUFFIX}')
+    if tmp_dir.exists():
+        shutil.rmtree(tmp_dir)
+    try:
+        for path in paths:
+            source = tree_dir / path
+            if not source.is_file() or source.is_symlink():
+                continue
+            target = tmp_dir / path
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.link(source, target)
+        os.replace(tmp_dir, entry_dir)
+    finally:
+        if tmp_dir.exists():
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def _link_entry(entry_dir: Path, tree_dir: Path, paths: List[str]) -> None:
+    for path in paths:
+        source = entry_dir / path
+        target = tree_dir / path
+        try:
+            if not target.is_file() or os.path.samefile(source, target):
+                continue
+        except FileNotFoundError:
+            # not stored, e.g., a symlink
+            continue
+        tmp_target = target.with_name(f'.{target.name}{_TMP_SUFFIX}')
+        os.link(source, tmp_target)
+        os.replace(tmp_target, target)
+
+
+def deduplicate(tree_dir: Path) -> None:
+    """
+    Move distributions installed into the directory to the store and
+    replace their files with hard links to the store copies
+
+    Distributions without `RECORD` are left intact. The store is not
+    used at all if the filesystem does not support hard links.
+    """
+    store_dir = get_store_dir()
+    os.makedirs(store_dir, exist_ok=True)
+    with get_lock():
+        for dist_info_dir in sorted(tree_dir.glob('*.dist-info')):
+            paths = read_record(dist_info_dir)
+            if not paths:
+                continue
+            entry_dir = store_dir / _get_entry_name(dist_info_dir)
+            try:
+                if not entry_dir.is_dir():
+                    _create_entry(entry_dir, tree_dir, paths)
+                else:
+                    _link_entry(entry_dir, tree_dir, paths)
+            except OSError:
+                # hard links are not supported, cross-device link, etc.
+                return
+
+
+def _is_orphaned(entry_dir: Path) -> bool:
+    for root, _, files in os.walk(entry_dir):
+        for name in files:
+            if os.lstat(os.path.join(root, name)).st_nlink > 1:
+                return False
+    return True
+
+
+def collect_garbage() -> None:
+    """Remove store entries not linked from any package directory."""
+    store_dir = get_store_dir()
+    if not store_dir.is_dir():
+        return
+    with get_lock():
+        for entry_dir in store_dir.iterdir():
+            if entry_dir.name.startswith('.'):
+                if entry_dir.name.endswith(_TMP_SUFFIX):
+                    # leftovers of interrupted installs
+                    shutil.rmtree(entry_dir, ignore_errors=True)
+                continue
+            if entry_dir.is_dir() and _is_orphaned(entry_dir):
+                shutil.rmtree(entry_dir, ignore_errors=True)
@@ -0,0 +1,206 @@
+"""
+Platform compatibility tags (PEP 425) of the running interpreter
+"""
+
+from __future__ import annotations
+
+import functools
+import glob
+import os
+import platform
+import re
+import subprocess
+import sys
+import sysconfig
+from typing import Dict, FrozenSet, Iterator, List, Optional, Tuple
+
+
+Tag = Tuple[str, str, str]
+
+_LEGACY_MANYLINUX = {
+    (2, 17): 'manylinux2014',
+    (2, 12): 'manylinux2010',
+    (2, 5): 'manylinux1',
+}
+
+
+def _normalize_platform(name: str) -> str:
+    return name.replace('-', '_').replace('.', '_')
+
+
+def _get_glibc_version() -> Optional[Tuple[int, int]]:
+    try:
+        # e.g., 'glibc 2.35'
+        version = os.confstr('CS_GNU_LIBC_VERSION')
+    except (AttributeError, OSError, ValueError):
+        return None
+    match = version and re.search(r'(\d+)\.(\d+)', version)
+    if not match:
+        return None
+    return int(match[1]), int(match[2])
+
+
+def _get_musl_version() -> Optional[Tuple[int, int]]:
+    loaders = glob.glob('/lib/ld-musl-*.so.1')
+    if not loaders:
+        return None
+    try:
+        # the dynamic loader prints its version to stderr when called
+        # without arguments
+        output = subprocess.run(
+            [loaders[0]], stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+            text=True,
+        ).stderr
+    except OSError:
+        return None
+    match = re.search(r'^Version (\d+)\.(\d+)', output, re.MULTILINE)
+    if not match:
+        return None
+    return int(match[1]), int(match[2])
+
+
+def _linux_platforms() -> Iterator[str]:
+    arch = _normalize_platform(sysconfig.get_platform().partition('-')[2])
+    if sys.maxsize <= 2 ** 32:
+        # 32-bit interpreter on a 64-bit kernel
+        arch = {'x86_64': 'i686', 'aarch64': 'armv7l'}.get(arch, arch)
+    glibc = _get_glibc_version()
+    if glibc and glibc[0] == 2:
+        for minor in range(glibc[1], 4, -1):
+            yield f'manylinux_2_{minor}_{arch}'
+            legacy = _LEGACY_MANYLINUX.get((2, minor))
+            if legacy:
+                yield f'{legacy}_{arch}'
+    else:
+        musl = _get_musl_version()
+        if musl and musl[0] == 1:
+            for minor in range(musl[1], -1, -1):
+                yield f'musllinux_1_{minor}_{arch}'
+    yield f'linux_{arch}'
+
+
+def _macos_platforms() -> Iterator[str]:
+    release = platform.mac_ver()[0]
+    major, _, minor = release.partition('.')
+    version = (int(major), int(minor.partition('.')[0] or 0))
+    arch = platform.machine()
+    if arch == 'x86_64':
+        formats = ['x86_64', 'intel', 'fat64', 'fat32', 'universal2',
+                   'universal']
+    else:
+        formats = [arch, 'universal2']
+    versions: List[Tuple[int, int]] = []
+    if version[0] >= 11:
+        versions.extend((_major, 0) for _major in range(version[0], 10, -1))
+        min_minor = 16
+    else:
+        min_minor = version[1]
+    if arch != 'x86_64':
+        # only universal2 wheels built for macOS 10.x support arm64
+        formats_10 = ['universal2']
+    else:
+        formats_10 = formats
+    for _major, _minor in versions:
+        for _format in formats:
+            yield f'macosx_{_major}_{_minor}_{_format}'
+    for _minor in range(min_minor, 3, -1):
+        for _format in formats_10:
+            yield f'macosx_10_{_minor}_{_format}'
+
+
+def get_platforms() -> List[str]:
+    if sys.platform.startswith('linux'):
+        return list(_linux_platforms())
+    if sys.platform == 'darwin':
+        return list(_macos_platforms())
+    return [_normalize_platform(sysconfig.get_platform())]
+
+
+def _get_interpreter() -> str:
+    name = {
+        'cpython': 'cp', 'pypy': 'pp', 'ironpython': 'ip', 'jython': 'jy',
+    }.get(sys.implementation.name, sys.implementation.name)
+    return f'{name}{sys.version_info.major}{sys.version_info.minor}'
+
+
+def _get_abi(interpreter: str) -> str:
+    soabi = sysconfig.get_config_var('SOABI')
+    if soabi and soabi.startswith('cpython-'):
+        # e.g., cpython-313t-x86_64-linux-gnu -> cp313t
+        return 'cp' + soabi.split('-')[1]
+    if soabi:
+        # e.g., pypy310-pp73-x86_64-linux-gnu -> pypy310_pp73
+        return _normalize_platform('-'.join(soabi.split('-')[:2]))
+    ext_suffix = sysconfig.get_config_var('EXT_SUFFIX') or ''
+    # Windows: .cp312-win_amd64.pyd -> cp312
+    match = re.match(r'^\.(cp\d+[a-z]*)-', ext_suffix)
+    if match:
+        return match[1]
+    return interpreter
+
+
+@functools.lru_cache(maxsize=None)
+def get_supported_tags() -> Tuple[Tag, ...]:
+    """
+    Return the tags supported by the running interpreter, most preferred
+    first, in the same order as `packaging.tags.sys_tags()` does
+    """
+    major, minor = sys.version_info[:2]
+    interpreter = _get_interpreter()
+    platforms = get_platforms()
+    tags: List[Tag] = []
+    abi = _get_abi(interpreter)
+    abis = [abi]
+    if interpreter.startswith('cp'):
+        if not abi.endswith('t'):
+            # the stable ABI is not supported by free-threaded builds
+            abis.append('abi3')
+    abis.append('none')
+    for _abi in abis:
+        tags.extend((interpreter, _abi, plat) for plat in platforms)
+    if 'abi3' in abis:
+        for _minor in range(minor - 1, 1, -1):
+            tags.extend(
+                (f'cp{major}{_minor}', 'abi3', plat) for plat in platforms)
+    python_versions = [f'py{major}{minor}', f'py{major}']
+    python_versions.extend(f'py{major}{_minor}' for _minor in range(
+        minor - 1, -1, -1))
+    for version in python_versions:
+        tags.extend((version, 'none', plat) for plat in platforms)
+    tags.append((interpreter, 'none', 'any'))
+    tags.extend((version, 'none', 'any') for version in python_versions)
+    return tuple(dict.fromkeys(tags))
+
+
+@functools.lru_cache(maxsize=None)
+def _get_tag_priorities() -> Dict[Tag, int]:
+    return {tag: index for index, tag in enumerate(get_supported_tags())}
+
+
+def parse_wheel_tags(
+    python: str, abi: str, platform_: str,
+) -> FrozenSet[Tag]:
+    """Expand compressed tag sets, e.g., `py2.py3-none-any`."""
+    return frozenset(
+        (_python, _abi, _platform)
+        for _python in python.split('.')
+        for _abi in abi.split('.')
+        for _platform in platform_.split('.')
+    )
+
+
+def get_wheel_priority(
+    python: str, abi: str, platform_: str,
+) -> Optional[int]:
+    """
+    Return the priority of the wheel with the given tags (the lower
+    the better) or `None` if the wheel is not supported
+    """
+    priorities = _get_tag_priorities()
+    supported = [
+        priorities[tag] for tag in parse_wheel_tags(python, abi, platform_)
+        if tag in priorities
+    ]
+    if not supported:
+        return None
+    return min(supported)
@@ -0,0 +1,109 @@
+"""
+Extractor usage statistics
+
+If enabled by the `record-extractor-usage` option of the `[main]` config
+section, names of extractors used by the backend (the ones that matched
+URLs or were delegated to by other extractors) are recorded per run and
+merged into `extractor-usage.json` in the data home directory on exit.
+The statistics are used by the `extractor optimize` command to build
+the minimal `[extractors]` config section.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Optional, Set
+
+from dl_plus import ytdl
+from dl_plus.config import get_data_home
+from dl_plus.utils import FileLock
+
+
+DB_VERSION = 1
+
+
+Record = Dict
+
+
+# extractor classes used in the current run, the names are resolved
+# on exit to keep recording cheap
+_used: Optional[Set[type]] = None
+
+
+def get_db_path() -> Path:
+    return get_data_home() / 'extractor-usage.json'
+
+
+def _get_lock() -> FileLock:
+    return FileLock(get_data_home() / '.extractor-usage.lock')
+
+
+def _read() -> Dict[str, Record]:
+    try:
+        with open(get_db_path()) as fobj:
+            data = json.load(fobj)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get('version') != DB_VERSION:
+        return {}
+    return data['extractors']
+
+
+def _write(extractors: Dict[str, Record]) -> None:
+    path = get_db_path()
+    tmp_path = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    with open(tmp_path, 'w') as fobj:
+        json.dump({'version': DB_VERSION, 'extractors': extractors}, fobj)
+    os.replace(tmp_path, path)
+
+
+def load() -> Dict[str, Record]:
+    """
+    Return usage records (`count` of runs and the `last_used` timestamp)
+    keyed by extractor names
+    """
+    return _read()
+
+
+def enable() -> None:
+    """Start recording, the records are saved on exit."""
+    global _used
+    if _used is None:
+        _used = set()
+        atexit.register(save)
+
+
+def record(extractor: type) -> None:
+    if _used is not None:
+        _used.add(extractor)
+
+
+def save() -> None:
+    if not _used:
+        return
+    names = set(map(ytdl.get_extractor_name, _used))
+    now = int(time.time())
+    try:
+        with _get_lock():
+            extractors = _read()
+            for name in names:
+                _record = extractors.setdefault(name, {'count': 0})
+                _record['count'] += 1
+                _record['last_used'] = now
+            _write(extractors)
+    except OSError:
+        # statistics are not worth failing the run
+        pass
+    _used.clear()
+
+
+def clear() -> None:
+    with _get_lock():
+        try:
+            os.unlink(get_db_path())
+        except FileNotFoundError:
+            pass
@@ -1,4 +1,14 @@
+import os
+import sys
 from enum import Enum
+from pathlib import Path
+from typing import IO, Optional
+
+
+if sys.platform == 'win32':
+    import msvcrt
+else:
+    import fcntl
 
 
 class NotSet(Enum):
@@ -10,3 +20,56 @@ class NotSet(Enum):
 
 
 NOTSET = NotSet.NOTSET
+
+
+class FileLock:
+    """
+    An exclusive inter-process lock based on an OS-level file lock
+
+    The lock is released automatically if the process dies.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._fobj: Optional[IO[bytes]] = None
+
+    def acquire(self) -> None:
+        os.makedirs(self.path.parent, exist_ok=True)
+        fobj = open(self.path, 'a+b')
+        try:
+            if sys.platform == 'win32':
+                fobj.seek(0)
+                while True:
+                    try:
+                        # blocks for ~10 seconds, then raises OSError
+                        msvcrt.locking(fobj.fileno(), msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:
+                        continue
+            else:
+                fcntl.flock(fobj.fileno(), fcntl.LOCK_EX)
+        except BaseException:
+            fobj.close()
+            raise
+        self._fobj = fobj
+
+    def release(self) -> None:
+        fobj = self._fobj
+        if fobj is None:
+            return
+        self._fobj = None
+        try:
+            if sys.platform == 'win32':
+                fobj.seek(0)
+                msvcrt.locking(fobj.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(fobj.fileno(), fcntl.LOCK_UN)
+        finally:
+            fobj.close()
+
+    def __enter__(self) -> 'FileLock':
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.release()
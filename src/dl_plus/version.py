@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import re
+from typing import Optional, Tuple, Union
+
+
+# PEP 440, Appendix B
+VERSION_REGEX = re.compile(
+    r"""
+    v?
+    (?:(?P<epoch>[0-9]+)!)?
+    (?P<release>[0-9]+(?:\.[0-9]+)*)
+    (?P<pre>
+        [-_.]?
+        (?P<pre_l>alpha|a|beta|b|preview|pre|c|rc)
+        [-_.]?
+        (?P<pre_n>[0-9]+)?
+    )?
+    (?P<post>
+        (?:-(?P<post_n1>[0-9]+))
+        |
+        (?:
+            [-_.]?
+            (?P<post_l>post|rev|r)
+            [-_.]?
+            (?P<post_n2>[0-9]+)?
+        )
+    )?
+    (?P<dev>
+        [-_.]?
+        (?P<dev_l>dev)
+        [-_.]?
+        (?P<dev_n>[0-9]+)?
+    )?
+    (?:\+(?P<local>[a-z0-9]+(?:[-_.][a-z0-9]+)*))?
+    """,
+    re.VERBOSE | re.IGNORECASE,
+)
+
+_PRE_LABELS = {
+    'alpha': 'a', 'a': 'a',
+    'beta': 'b', 'b': 'b',
+    'preview': 'rc', 'pre': 'rc', 'c': 'rc', 'rc': 'rc',
+}
+_PRE_LABEL_ORDER = {'a': 0, 'b': 1, 'rc': 2}
+
+# comparison keys are built of numbers only, these are used as sentinels
+_INFINITY = float('inf')
+_NEGATIVE_INFINITY = float('-inf')
+
+
+_LocalPart = Tuple[Tuple[int, Union[int, str]], ...]
+
+
+class InvalidVersion(ValueError):
+
+    pass
+
+
+class Version:
+    """
+    A PEP 440 version
+
+    Only the parts required to compare and order versions are implemented.
+    """
+
+    __slots__ = ('epoch', 'release', 'pre', 'post', 'dev', 'local', '_key')
+
+    def __init__(self, version: str) -> None:
+        match = VERSION_REGEX.fullmatch(version.strip())
+        if not match:
+            raise InvalidVersion(f'invalid version: {version}')
+        self.epoch = int(match['epoch'] or 0)
+        self.release = tuple(map(int, match['release'].split('.')))
+        self.pre: Optional[Tuple[str, int]] = None
+        if match['pre_l']:
+            self.pre = (
+                _PRE_LABELS[match['pre_l'].lower()], int(match['pre_n'] or 0))
+        self.post: Optional[int] = None
+        if match['post']:
+            self.post = int(match['post_n1'] or match['post_n2'] or 0)
+        self.dev: Optional[int] = None
+        if match['dev']:
+            self.dev = int(match['dev_n'] or 0)
+        self.local: Optional[str] = None
+        if match['local']:
+            self.local = match['local'].lower().replace('-', '.').replace(
+                '_', '.')
+        self._key = self._build_key()
+
+    def _build_key(self) -> tuple:
+        release = list(self.release)
+        while len(release) > 1 and release[-1] == 0:
+            release.pop()
+        pre: tuple
+        if self.pre is None and self.post is None and self.dev is not None:
+            # 1.0.dev0 < 1.0a0
+            pre = (_NEGATIVE_INFINITY,)
+        elif self.pre is None:
+            pre = (_INFINITY,)
+        else:
+            pre = (_PRE_LABEL_ORDER[self.pre[0]], self.pre[1])
+        post = (_NEGATIVE_INFINITY,) if self.post is None else (self.post,)
+        dev = (_INFINITY,) if self.dev is None else (self.dev,)
+        local: _LocalPart = ()
+        if self.local is not None:
+            local = tuple(
+                (1, int(part)) if part.isdigit() else (0, part)
+                for part in self.local.split('.')
+            )
+        return (self.epoch, tuple(release), pre, post, dev, local)
+
+    @property
+    def is_prerelease(self) -> bool:
+        return self.pre is not None or self.dev is not None
+
+    @property
+    def public(self) -> str:
+        return str(self).partition('+')[0]
+
+    @property
+    def base_version(self) -> str:
+        base = '.'.join(map(str, self.release))
+        if self.epoch:
+            base = f'{self.epoch}!{base}'
+        return base
+
+    def __str__(self) -> str:
+        parts = [self.base_version]
+        if self.pre is not None:
+            parts.append(f'{self.pre[0]}{self.pre[1]}')
+        if self.post is not None:
+            parts.append(f'.post{self.post}')
+        if self.dev is not None:
+            parts.append(f'.dev{self.dev}')
+        if self.local is not None:
+            parts.append(f'+{self.local}')
+        return ''.join(parts)
+
+    def __repr__(self) -> str:
+        return f'<Version: {self}>'
+
+    def __hash__(self) -> int:
+        return hash(self._key)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Version):
+            return NotImplemented
+        return self._key == other._key
+
+    def __lt__(self, other: Version) -> bool:
+        return self._key < other._key
+
+    def __le__(self, other: Version) -> bool:
+        return self._key <= other._key
+
+    def __gt__(self, other: Version) -> bool:
+        return self._key > other._key
+
+    def __ge__(self, other: Version) -> bool:
+        return self._key >= other._key
+
+
+def parse_version(version: str) -> Optional[Version]:
+    """Return the parsed version or `None` if the version is invalid."""
+    try:
+        return Version(version)
+    except InvalidVersion:
+        return None
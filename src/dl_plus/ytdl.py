@@ -1,7 +1,12 @@
 import importlib
+import json
+import shutil
 import sys
+from fnmatch import fnmatchcase
 from io import StringIO
+from pathlib import Path
 
+from . import snapshot
 from .exceptions import DLPlusException
 
 
@@ -20,6 +25,14 @@ class UnknownBuiltinExtractor(YoutubeDLError):
 
 
 _NAME_PART_SURROGATE = '_'
+_GLOB_CHARS = frozenset('*?[')
+
+# the index of built-in extractors prebuilt at install time, see
+# `build_extractor_index()`, it is stored next to the backend package
+EXTRACTOR_INDEX_FILENAME = 'extractor-index.json'
+_EXTRACTOR_INDEX_VERSION = 1
+
+_HELP_SNAPSHOT_NAME = 'help'
 
 
 _NOT_SET = object()
@@ -29,6 +42,7 @@ _ytdl_module = _NOT_SET
 _ytdl_module_name = _NOT_SET
 
 _extractors = _NOT_SET
+_extractors_by_key = _NOT_SET
 _extractors_registry = _NOT_SET
 
 _lazy_load_extractor_base = _NOT_SET
@@ -82,6 +96,25 @@ def get_ytdl_module_version():
 
 def get_help():
     _check_initialized()
+    global _ytdl_module
+    global _ytdl_module_name
+    try:
+        version = get_ytdl_module_version()
+    except ImportError:
+        return _get_help()
+    # the options are wrapped to the terminal width
+    key = (
+        _ytdl_module_name, _ytdl_module.__file__, version,
+        shutil.get_terminal_size().columns,
+    )
+    help_text = snapshot.load(_HELP_SNAPSHOT_NAME, key)
+    if help_text is None:
+        help_text = _get_help()
+        snapshot.save(_HELP_SNAPSHOT_NAME, key, help_text)
+    return help_text
+
+
+def _get_help():
     global _ytdl_module
     with StringIO() as buffer:
         stdout, stderr = sys.stdout, sys.stderr
@@ -153,7 +186,110 @@ def _get_extractor_name(extractor):
     return ie_name
 
 
+def get_extractor_name(extractor):
+    """
+    Return the name of the extractor as used in the `[extractors]`
+    config section, lazy extractors are resolved
+    """
+    return _get_extractor_name(_get_real_extractor(extractor))
+
+
+def build_extractor_index():
+    """
+    Return the index of built-in extractors: keys and names
+
+    All extractor modules are imported, so the index is built once
+    per backend version at install time.
+    """
+    _check_initialized()
+    global _ytdl_module_name
+    extractors = []
+    for extractor in get_all_extractors(include_generic=True):
+        key = extractor.ie_key()
+        extractor = _get_real_extractor(extractor)
+        extractors.append({
+            'key': key,
+            'name': _get_extractor_name(extractor),
+        })
+    return {
+        'version': _EXTRACTOR_INDEX_VERSION,
+        'import_name': _ytdl_module_name,
+        'backend_version': get_ytdl_module_version(),
+        'extractors': extractors,
+    }
+
+
+def get_extractor_index_path():
+    _check_initialized()
+    global _ytdl_module
+    return Path(_ytdl_module.__file__).parent.parent / EXTRACTOR_INDEX_FILENAME
+
+
+def load_extractor_index():
+    """
+    Return the list of indexed extractors of the initialized backend
+    or `None` if the index does not exist or is outdated
+    """
+    global _ytdl_module
+    global _ytdl_module_name
+    try:
+        # the loader reads the file from the zip archive in case
+        # of bundles, see `dl_plus.bundle`
+        index = json.loads(_ytdl_module.__loader__.get_data(
+            str(get_extractor_index_path())))
+        if (
+            index['version'] != _EXTRACTOR_INDEX_VERSION
+            or index['import_name'] != _ytdl_module_name
+            or index['backend_version'] != get_ytdl_module_version()
+        ):
+            return None
+        return index['extractors']
+    except (
+        OSError, ValueError, TypeError, KeyError, AttributeError,
+        ImportError, YoutubeDLError,
+    ):
+        return None
+
+
+def _get_extractors_by_key():
+    global _extractors_by_key
+    if _extractors_by_key is _NOT_SET:
+        _extractors_by_key = {
+            extractor.ie_key(): extractor
+            for extractor in get_all_extractors(include_generic=True)
+        }
+    return _extractors_by_key
+
+
+def _build_extractors_registry_from_index(index):
+    # the registry stores extractor keys, extractors are resolved lazily
+    # by `_resolve_extractor()`, so that only the requested extractors
+    # are imported (in case of lazy extractors)
+    if {item['key'] for item in index} != _get_extractors_by_key().keys():
+        return None
+    registry = {}
+    for item in index:
+        name_parts = item['name'].split(':')
+        name_parts.reverse()
+        _store_extractor_in_registry(item['key'], name_parts, registry)
+    return registry
+
+
+def _resolve_extractor(extractor):
+    if isinstance(extractor, str):
+        return _get_real_extractor(_get_extractors_by_key()[extractor])
+    return extractor
+
+
 def _build_extractors_registry():
+    index = load_extractor_index()
+    if index is not None:
+        try:
+            registry = _build_extractors_registry_from_index(index)
+        except (TypeError, KeyError, AttributeError, YoutubeDLError):
+            registry = None
+        if registry is not None:
+            return registry
     registry = {}
     for extractor in get_all_extractors(include_generic=True):
         extractor = _get_real_extractor(extractor)
@@ -192,19 +328,43 @@ def _flatten_registry_gen(registry):
             yield from _flatten_registry_gen(value)
 
 
-def _get_extractors_from_registry(name_parts, registry):
-    name_part = name_parts.pop()
-    stored = registry[name_part]
-    if not name_parts:
-        if not isinstance(stored, dict):
-            return [stored]
-        return list(_flatten_registry_gen(stored))
-    if not isinstance(stored, dict):
-        raise KeyError(name_part)
-    return _get_extractors_from_registry(name_parts, stored)
+def is_glob(name):
+    return any(char in name for char in _GLOB_CHARS)
 
 
-def get_extractors_by_name(name):
+def _get_extractors_from_registry(name_parts, registry, strict=True):
+    # name parts can be glob patterns matching registry keys of the same
+    # level (the surrogate key is never matched by patterns), KeyError
+    # is raised only if exact name parts are not found
+    name_part = name_parts.pop()
+    if is_glob(name_part):
+        strict = False
+        stored_items = [
+            stored for key, stored in registry.items()
+            if key != _NAME_PART_SURROGATE and fnmatchcase(key, name_part)
+        ]
+    elif name_part in registry:
+        stored_items = [registry[name_part]]
+    elif strict:
+        raise KeyError(name_part)
+    else:
+        return []
+    extractors = []
+    for stored in stored_items:
+        if not name_parts:
+            if not isinstance(stored, dict):
+                extractors.append(stored)
+            else:
+                extractors.extend(_flatten_registry_gen(stored))
+        elif isinstance(stored, dict):
+            extractors.extend(_get_extractors_from_registry(
+                list(name_parts), stored, strict))
+        elif strict and not any(map(is_glob, name_parts)):
+            raise KeyError(name_part)
+    return extractors
+
+
+def _get_registry_items(name):
     _check_initialized()
     global _extractors_registry
     if _extractors_registry is _NOT_SET:
@@ -217,11 +377,62 @@ def get_extractors_by_name(name):
         raise UnknownBuiltinExtractor(name)
 
 
-def patch_extractors(extractors):
-    extractor_module = import_module('extractor')
-    extractor_module.gen_extractor_classes = lambda: extractors
-    ie_keys_extractors_map = {
-        extractor.ie_key(): extractor for extractor in extractors}
-    extractor_module.get_info_extractor = (
-        lambda ie_key: ie_keys_extractors_map[ie_key])
-    importlib.reload(import_module('YoutubeDL'))
+def get_extractors_by_name(name):
+    """
+    Return built-in extractors matching the name
+
+    The name is either an exact colon-separated name prefix, e.g.,
+    'youtube' matches 'youtube', 'youtube:tab', etc. ('youtube:_' matches
+    'youtube' only), or a glob pattern matched against name parts
+    of the same level, e.g., 'youtube:*', '*:playlist'.
+
+    :raises UnknownBuiltinExtractor: if the exact name is not found.
+    """
+    return [
+        _resolve_extractor(extractor)
+        for extractor in _get_registry_items(name)
+    ]
+
+
+def get_extractor_keys_by_name(name):
+    """
+    The same as `get_extractors_by_name()`, but return extractor keys,
+    the extractors are not imported
+    """
+    return [
+        extractor if isinstance(extractor, str) else extractor.ie_key()
+        for extractor in _get_registry_items(name)
+    ]
+
+
+def patch_extractors(extractors, on_use=None):
+    """
+    Make the backend use the extractors instead of the built-in ones
+
+    The backend registers extractor classes and instantiates them lazily
+    via `get_info_extractor()`, so neither the classes nor the map of
+    extractor keys are materialized until they are requested.
+
+    :param on_use: a callback called with the extractor class every time
+        the backend requests an extractor instance.
+    """
+    ie_keys_extractors_map = None
+
+    def gen_extractor_classes():
+        return extractors
+
+    def get_info_extractor(ie_key):
+        nonlocal ie_keys_extractors_map
+        if ie_keys_extractors_map is None:
+            ie_keys_extractors_map = {
+                extractor.ie_key(): extractor for extractor in extractors}
+        extractor = ie_keys_extractors_map[ie_key]
+        if on_use is not None:
+            on_use(extractor)
+        return extractor
+
+    # YoutubeDL imports the functions by name, rebinding them there
+    # is equivalent to reloading the module, but much cheaper
+    for module in (import_module('extractor'), import_module('YoutubeDL')):
+        module.gen_extractor_classes = gen_extractor_classes
+        module.get_info_extractor = get_info_extractor
@@ -0,0 +1,85 @@
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from dl_plus import backend, ytdl
+from dl_plus.backend import Backend
+
+
+@pytest.fixture(autouse=True)
+def data_home(tmp_path, monkeypatch):
+    _data_home = tmp_path / 'data'
+    _data_home.mkdir()
+    monkeypatch.setattr('dl_plus.config._data_home', _data_home)
+    return _data_home
+
+
+@pytest.fixture(autouse=True)
+def sys_path(tmp_path, monkeypatch):
+    path_entry = tmp_path / 'site-packages'
+    path_entry.mkdir()
+    # make the entry old enough to be snapshotted
+    mtime = time.time() - 60
+    os.utime(path_entry, (mtime, mtime))
+    monkeypatch.setattr(sys, 'path', [str(path_entry)])
+    return path_entry
+
+
+@pytest.fixture(autouse=True)
+def known_backends(monkeypatch):
+    monkeypatch.setattr('dl_plus.backend._known_backends', {
+        'foo': Backend('foo', 'foo_mod', 'foo', []),
+        'bar': Backend('bar', 'bar_mod', 'bar', []),
+    })
+
+
+@pytest.fixture(autouse=True)
+def modules(monkeypatch):
+    _modules = SimpleNamespace(importable={'bar_mod'}, imported=[])
+
+    def init(import_name):
+        _modules.imported.append(import_name)
+        if import_name not in _modules.importable:
+            raise ytdl.YoutubeDLError('failed to initialize')
+
+    monkeypatch.setattr('dl_plus.ytdl.init', init)
+    monkeypatch.setattr(
+        'dl_plus.ytdl.get_ytdl_module_name', lambda: _modules.imported[-1])
+    return _modules
+
+
+def test_cached(modules):
+    assert backend._autodetect_backend() == ('bar', None)
+    assert modules.imported == ['foo_mod', 'bar_mod']
+    modules.imported.clear()
+    assert backend._autodetect_backend() == ('bar', None)
+    assert modules.imported == ['bar_mod']
+
+
+def test_invalidate(modules):
+    backend._autodetect_backend()
+    backend.invalidate_autodetect_cache()
+    modules.imported.clear()
+    assert backend._autodetect_backend() == ('bar', None)
+    assert modules.imported == ['foo_mod', 'bar_mod']
+
+
+def test_sys_path_entry_modified(modules, sys_path):
+    backend._autodetect_backend()
+    modules.importable.add('foo_mod')
+    (sys_path / 'foo_mod').mkdir()
+    modules.imported.clear()
+    assert backend._autodetect_backend() == ('foo', None)
+    assert modules.imported == ['foo_mod']
+
+
+def test_cached_backend_fails(modules):
+    backend._autodetect_backend()
+    modules.importable.discard('bar_mod')
+    modules.imported.clear()
+    with pytest.raises(backend.AutodetectFailed):
+        backend._autodetect_backend()
+    assert modules.imported == ['bar_mod', 'foo_mod', 'bar_mod']
@@ -0,0 +1,29 @@
+import threading
+
+import pytest
+
+from dl_plus.backend import BackendError, BackgroundBackendInit
+
+
+def test_result(monkeypatch):
+    threads = []
+
+    def init_backend(backend_string):
+        threads.append(threading.current_thread())
+        return backend_string
+
+    monkeypatch.setattr('dl_plus.backend.init_backend', init_backend)
+    assert BackgroundBackendInit('foo').result() == 'foo'
+    assert threads != [threading.current_thread()]
+
+
+def test_error(monkeypatch):
+
+    def init_backend(backend_string):
+        raise BackendError(f'{backend_string} is not installed')
+
+    monkeypatch.setattr('dl_plus.backend.init_backend', init_backend)
+    backend_init = BackgroundBackendInit('foo')
+    backend_init.join()
+    with pytest.raises(BackendError, match='foo is not installed'):
+        backend_init.result()
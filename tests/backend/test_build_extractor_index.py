@@ -0,0 +1,27 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+from dl_plus import ytdl
+from dl_plus.backend import build_extractor_index
+
+
+def test_frozen(tmp_path, monkeypatch):
+    def run(*args, **kwargs):
+        raise AssertionError('must not be called')
+
+    monkeypatch.setattr(sys, 'frozen', True, raising=False)
+    monkeypatch.setattr(subprocess, 'run', run)
+    build_extractor_index(tmp_path, 'yt_dlp')
+    assert not list(tmp_path.iterdir())
+
+
+def test_build(tmp_path):
+    pytest.importorskip('yt_dlp')
+    build_extractor_index(tmp_path, 'yt_dlp')
+    with open(tmp_path / ytdl.EXTRACTOR_INDEX_FILENAME) as fobj:
+        index = json.load(fobj)
+    assert index['import_name'] == 'yt_dlp'
+    assert {'key': 'Generic', 'name': 'generic'} in index['extractors']
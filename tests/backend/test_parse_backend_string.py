@@ -0,0 +1,67 @@
+import pytest
+
+from dl_plus import packagedir
+from dl_plus.backend import (
+    BackendError, get_backend_dir, parse_backend_string, split_backend_string,
+)
+
+
+@pytest.fixture(autouse=True)
+def data_home(tmp_path, monkeypatch):
+    monkeypatch.setattr('dl_plus.config._data_home', tmp_path / 'data')
+    return tmp_path / 'data'
+
+
+@pytest.fixture
+def backend_dir():
+    package_dir = get_backend_dir('yt-dlp')
+    for version in ['2024.10.22', '2024.11.04']:
+        version_dir = packagedir.get_new_version_dir(package_dir, version)
+        version_dir.mkdir(parents=True)
+    packagedir.activate(
+        package_dir, packagedir.get_version_dir(package_dir, '2024.11.04'))
+    return package_dir
+
+
+@pytest.mark.parametrize('backend_string,expected', [
+    ('yt-dlp', ('yt-dlp', None)),
+    ('yt-dlp@2024.10.22', ('yt-dlp', '2024.10.22')),
+    ('foo/bar@1.0', ('foo/bar', '1.0')),
+])
+def test_split_backend_string(backend_string, expected):
+    assert split_backend_string(backend_string) == expected
+
+
+@pytest.mark.parametrize('backend_string', ['yt-dlp@', '@1.0'])
+def test_split_backend_string_invalid(backend_string):
+    with pytest.raises(BackendError):
+        split_backend_string(backend_string)
+
+
+def test_active_version(backend_dir):
+    is_alias, version_dir, import_name = parse_backend_string('yt-dlp')
+    assert not is_alias
+    assert version_dir.name == 'yt_dlp@2024.11.04'
+    assert import_name == 'yt_dlp'
+
+
+def test_specific_version(backend_dir):
+    _, version_dir, import_name = parse_backend_string('yt-dlp@2024.10.22')
+    assert version_dir.name == 'yt_dlp@2024.10.22'
+    assert import_name == 'yt_dlp'
+    _, version_dir, import_name = parse_backend_string(
+        'yt-dlp/yt_dlp@2024.10.22')
+    assert version_dir.name == 'yt_dlp@2024.10.22'
+
+
+def test_version_not_installed(backend_dir):
+    with pytest.raises(BackendError, match='not installed'):
+        parse_backend_string('yt-dlp@2023.01.01')
+
+
+def test_bundle_mode(backend_dir, monkeypatch):
+    monkeypatch.setattr('dl_plus.backend._bundle_mode', True)
+    assert parse_backend_string('yt-dlp') == (False, None, 'yt_dlp')
+    assert parse_backend_string('foo/bar-baz') == (False, None, 'bar_baz')
+    with pytest.raises(BackendError, match='not bundled'):
+        parse_backend_string('yt-dlp@2024.10.22')
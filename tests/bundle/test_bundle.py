@@ -0,0 +1,64 @@
+import subprocess
+import sys
+import zipfile
+
+import pytest
+
+from dl_plus.bundle import build_bundle
+
+
+@pytest.fixture
+def backend_dir(tmp_path):
+    _dir = tmp_path / 'backends' / 'foo@1.0'
+    (_dir / 'foo').mkdir(parents=True)
+    (_dir / 'foo' / '__init__.py').write_text('VALUE = 42\n')
+    (_dir / 'foo' / '__pycache__').mkdir()
+    (_dir / 'foo' / '__pycache__' / '__init__.cpython-39.pyc').write_bytes(
+        b'')
+    (_dir / 'metadata.json').write_text('{}')
+    return _dir
+
+
+@pytest.fixture
+def plugin_dir(tmp_path):
+    _dir = tmp_path / 'extractors' / 'ns-plugin@1.0'
+    plugin_package_dir = _dir / 'dl_plus' / 'extractors' / 'ns' / 'plugin'
+    plugin_package_dir.mkdir(parents=True)
+    (plugin_package_dir / '__init__.py').write_text('')
+    return _dir
+
+
+@pytest.mark.parametrize('compressed', [True, False])
+def test_build_bundle(tmp_path, backend_dir, plugin_dir, compressed):
+    target = tmp_path / 'dist' / 'dl-plus'
+    build_bundle(
+        target, backend_dir, 'foo',
+        {'dl_plus.extractors.ns.plugin': plugin_dir}, compressed=compressed,
+    )
+    with zipfile.ZipFile(target) as zfile:
+        names = set(zfile.namelist())
+        compress_types = {info.compress_type for info in zfile.infolist()}
+    assert {
+        '__main__.py', '__main__.pyc',
+        'foo/__init__.py', 'foo/__init__.pyc',
+        'dl_plus/cli/__init__.py', 'dl_plus/cli/__init__.pyc',
+        'dl_plus/extractors/ns/plugin/__init__.pyc',
+        'dl_plus/extractors/plugins.json',
+    } <= names
+    assert 'metadata.json' not in names
+    assert not any('__pycache__' in name for name in names)
+    if compressed:
+        assert zipfile.ZIP_DEFLATED in compress_types
+    else:
+        assert compress_types == {zipfile.ZIP_STORED}
+
+    output = subprocess.check_output([
+        sys.executable, '-I', '-c',
+        'import sys; sys.path.insert(0, sys.argv[1]); '
+        'import foo; '
+        'from dl_plus.extractor import machinery; '
+        'print(foo.VALUE, list(machinery.discover_extractor_plugins_gen()))',
+        str(target),
+    ], text=True)
+    assert output.split(maxsplit=1) == [
+        '42', "['dl_plus.extractors.ns.plugin']\n"]
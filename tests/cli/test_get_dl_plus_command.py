@@ -0,0 +1,33 @@
+import sys
+import types
+
+import pytest
+
+from dl_plus.cli.commands.backend.bench import get_dl_plus_command
+
+
+@pytest.fixture
+def main_module(monkeypatch):
+    module = types.ModuleType('__main__')
+    monkeypatch.setitem(sys.modules, '__main__', module)
+    monkeypatch.setattr(sys, 'executable', '/path/to/python')
+    return module
+
+
+def test_frozen(monkeypatch, main_module):
+    monkeypatch.setattr(sys, 'frozen', True, raising=False)
+    assert get_dl_plus_command() == ['/path/to/python']
+
+
+def test_module(main_module):
+    main_module.__spec__ = types.SimpleNamespace(name='dl_plus.__main__')
+    assert get_dl_plus_command() == ['/path/to/python', '-m', 'dl_plus']
+
+
+@pytest.mark.parametrize('argv0', [
+    '/path/to/bin/dl-plus', '/path/to/dl-plus.pyz',
+])
+def test_script(monkeypatch, main_module, argv0):
+    main_module.__spec__ = None
+    monkeypatch.setattr(sys, 'argv', [argv0])
+    assert get_dl_plus_command() == ['/path/to/python', argv0]
@@ -0,0 +1,33 @@
+import pytest
+
+from dl_plus.cli.commands.outdated import _Result
+
+
+def _result(installed_version, latest_version, error=None):
+    return _Result(
+        name='yt-dlp',
+        kind='backend',
+        installed_version=installed_version,
+        latest_version=latest_version,
+        error=error,
+    )
+
+
+@pytest.mark.parametrize('installed_version,latest_version,expected', [
+    ('2024.1.1', '2024.1.1', 'up to date'),
+    ('2024.01.01', '2024.1.1', 'up to date'),
+    ('2024.1.1', '2024.2.1', 'outdated'),
+    ('2024.1.1', '2024.1.1.post1', 'outdated'),
+    ('2024.1.1', '2024.10.1', 'outdated'),
+    # installed from a newer pre-release or a side index
+    ('2024.2.1.dev0', '2024.1.1', 'up to date'),
+    ('2024.2.1', '2024.1.1', 'up to date'),
+    ('foo', 'foo', 'up to date'),
+    ('foo', '2024.1.1', 'unknown'),
+])
+def test_status(installed_version, latest_version, expected):
+    assert _result(installed_version, latest_version).status == expected
+
+
+def test_status_error():
+    assert _result('2024.1.1', None, 'not found').status == 'error'
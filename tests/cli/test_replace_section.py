@@ -0,0 +1,27 @@
+import pytest
+
+from dl_plus.cli.commands.extractor.optimize import _replace_section
+
+
+NAMES = ('extractors', 'extractors.enable')
+SECTION = '[extractors]\nfoo\ngeneric\n'
+
+
+@pytest.mark.parametrize('content,expected', [
+    ('', SECTION),
+    (
+        '[main]\nbackend = yt-dlp\n',
+        f'[main]\nbackend = yt-dlp\n\n{SECTION}',
+    ),
+    (
+        '[extractors]\n:builtins:\n\n[main]\nbackend = yt-dlp\n',
+        f'{SECTION}\n[main]\nbackend = yt-dlp\n',
+    ),
+    (
+        '# comment\n[extractors.enable]\nbar\n\n[main]\n# keep\nbackend = x\n'
+        '[extractors]\nbaz\n',
+        f'# comment\n{SECTION}\n[main]\n# keep\nbackend = x\n',
+    ),
+])
+def test_replace_section(content, expected):
+    assert _replace_section(content, NAMES, SECTION) == expected
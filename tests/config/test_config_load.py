@@ -1,6 +1,6 @@
 import pytest
 
-from dl_plus.config import Config
+from dl_plus.config import Config, ConfigError
 
 
 @pytest.fixture
@@ -93,3 +93,78 @@ class TestConfigLoad:
         monkeypatch.setenv('DL_PLUS_BACKEND', 'environ')
         self.config.load(False, False)
         assert self.config.backend == self.DEFAULT_BACKEND
+
+
+class TestResultsCacheTTL:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, config, config_home):
+        self.config = config
+        self.path = config_home / 'config.ini'
+
+    def load(self, content):
+        self.path.write_text(content)
+        self.config.load(self.path, environ=False)
+
+    def test_default(self):
+        assert self.config.results_cache_ttl is None
+
+    @pytest.mark.parametrize('content,expected', [
+        ('[cache]\nresults = yes\n', 3600),
+        ('[cache]\nresults = yes\nresults-ttl = 60\n', 60),
+        ('[cache]\nresults = no\nresults-ttl = 60\n', None),
+    ])
+    def test_load(self, content, expected):
+        self.load(content)
+        assert self.config.results_cache_ttl == expected
+
+    @pytest.mark.parametrize('content', [
+        '[cache]\nresults = foo\n',
+        '[cache]\nresults = yes\nresults-ttl = foo\n',
+        '[cache]\nresults = yes\nresults-ttl = -1\n',
+    ])
+    def test_invalid(self, content):
+        self.load(content)
+        with pytest.raises(ConfigError):
+            self.config.results_cache_ttl
+
+
+class TestFailuresCache:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, config, config_home):
+        self.config = config
+        self.path = config_home / 'config.ini'
+
+    def load(self, content):
+        self.path.write_text(content)
+        self.config.load(self.path, environ=False)
+
+    def test_default(self):
+        assert self.config.failures_cache_ttl is None
+        assert self.config.failure_classes == ['unsupported']
+
+    def test_load(self):
+        self.load(
+            '[cache]\nfailures = yes\nfailures-ttl = 60\n'
+            'failure-classes = not-found\n  unavailable\n'
+        )
+        assert self.config.failures_cache_ttl == 60
+        assert self.config.failure_classes == ['not-found', 'unavailable']
+
+    def test_invalid_failure_class(self):
+        self.load('[cache]\nfailure-classes = foo\n')
+        with pytest.raises(ConfigError, match='failure-classes'):
+            self.config.failure_classes
+
+
+@pytest.mark.parametrize('content,expected', [
+    ('', None),
+    ('[cache]\npages = yes\n', 32 * 1024 * 1024),
+    ('[cache]\npages = yes\npages-max-size = 1\n', 1024 * 1024),
+])
+def test_page_cache_max_size(config, config_home, content, expected):
+    path = config_home / 'config.ini'
+    path.write_text(content)
+    config.load(path, environ=False)
+    assert config.page_cache_max_size == expected
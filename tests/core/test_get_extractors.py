@@ -1,6 +1,9 @@
 import pytest
 
-from dl_plus.core import get_extractors
+from dl_plus import packagedir
+from dl_plus.core import (
+    get_extractor_plugin_dir, get_extractor_search_paths, get_extractors,
+)
 
 from tests.testlib import ExtractorMock as EM
 
@@ -16,6 +19,12 @@ def mock_ytdl_get_extractors_by_name(name):
     return [EM(name)]
 
 
+def mock_ytdl_get_extractor_keys_by_name(name):
+    if name == '*:sub':
+        return ['foo:sub', 'bar:sub']
+    return [name]
+
+
 def mock_machinery_load_all_extractors():
     return [EM('ns1/plugin:foo'), EM('ns1/plugin:bar'), EM('ns2/plugin')]
 
@@ -35,6 +44,10 @@ def mock_loaders(monkeypatch):
         'dl_plus.ytdl.get_extractors_by_name',
         mock_ytdl_get_extractors_by_name,
     )
+    monkeypatch.setattr(
+        'dl_plus.ytdl.get_extractor_keys_by_name',
+        mock_ytdl_get_extractor_keys_by_name,
+    )
     monkeypatch.setattr(
         'dl_plus.extractor.machinery.load_all_extractors',
         mock_machinery_load_all_extractors,
@@ -58,3 +71,41 @@ def mock_loaders(monkeypatch):
 ])
 def test(mock_loaders, names, expected):
     assert get_extractors(names) == expected
+
+
+@pytest.fixture
+def keyed_extractors(monkeypatch):
+    monkeypatch.setattr(
+        EM, 'ie_key', lambda extractor: extractor.IE_NAME, raising=False)
+
+
+@pytest.mark.parametrize('names,expected', [
+    ([':builtins:', '!bar'], [EM('foo'), EM('baz')]),
+    (['!bar', ':builtins:', 'generic'], [EM('foo'), EM('baz'), EM('generic')]),
+    (['foo:sub', 'bar:sub', 'baz', '!*:sub'], [EM('baz')]),
+    ([':plugins:', '!ns1/plugin'], [EM('ns2/plugin')]),
+    ([':plugins:', '!ns1/plugin:foo'], [
+        EM('ns1/plugin:bar'), EM('ns2/plugin')]),
+    ([':plugins:', '!*/plugin'], []),
+    (['ns1/*', 'foo'], [
+        EM('ns1/plugin:foo'), EM('ns1/plugin:bar'), EM('foo')]),
+    (['*/plugin:bar'], [EM('ns1/plugin:bar')]),
+])
+def test_patterns(mock_loaders, keyed_extractors, names, expected):
+    assert get_extractors(names, search_paths=[]) == expected
+
+
+def test_get_extractor_search_paths(tmp_path, monkeypatch):
+    monkeypatch.setattr('dl_plus.config._data_home', tmp_path)
+    plugin_dirs = {}
+    for ns, plugin in [('ns1', 'plugin'), ('ns2', 'plugin')]:
+        plugin_dir = get_extractor_plugin_dir(ns, plugin)
+        version_dir = packagedir.get_new_version_dir(plugin_dir, '1.0')
+        version_dir.mkdir(parents=True)
+        packagedir.activate(plugin_dir, version_dir)
+        plugin_dirs[f'{ns}/{plugin}'] = str(version_dir.resolve())
+    assert get_extractor_search_paths(['ns2/plugin', 'foo']) == [
+        plugin_dirs['ns2/plugin']]
+    assert get_extractor_search_paths(['ns2/plugin', ':plugins:']) == [
+        plugin_dirs['ns2/plugin'], plugin_dirs['ns1/plugin']]
+    assert get_extractor_search_paths(['ns3/plugin']) == []
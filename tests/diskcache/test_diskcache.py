@@ -0,0 +1,100 @@
+import os
+
+import pytest
+
+from dl_plus.diskcache import DiskCache
+
+
+@pytest.fixture
+def now(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr('time.time', lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return DiskCache(tmp_path / 'cache', 1000)
+
+
+def _get_entry_names(cache):
+    return {
+        name for name in os.listdir(cache.directory)
+        if not name.startswith('.')
+    }
+
+
+def test_get_missing(cache):
+    assert cache.get('foo') is None
+
+
+def test_set_get(cache):
+    cache.set('foo', b'bar', 10)
+    assert cache.get('foo') == b'bar'
+    cache.delete('foo')
+    assert cache.get('foo') is None
+
+
+def test_expired(cache, now):
+    cache.set('foo', b'bar', 10)
+    now[0] += 10
+    assert cache.get('foo') is None
+    assert not _get_entry_names(cache)
+
+
+@pytest.mark.parametrize('ttl', [0, -1])
+def test_not_stored(cache, ttl):
+    cache.set('foo', b'bar', ttl)
+    assert cache.get('foo') is None
+
+
+def test_too_large(cache):
+    cache.set('foo', b'x' * 1000, 10)
+    assert cache.get('foo') is None
+
+
+def test_key_not_stored(cache):
+    cache.set('password=secret', b'bar', 10)
+    [name] = _get_entry_names(cache)
+    assert b'secret' not in (cache.directory / name).read_bytes()
+    assert cache.get('password=secret') == b'bar'
+
+
+def test_corrupted(cache):
+    cache.set('foo', b'bar', 10)
+    [name] = _get_entry_names(cache)
+    (cache.directory / name).write_bytes(b'DLP')
+    assert cache.get('foo') is None
+
+
+def test_lru_eviction(tmp_path):
+    cache = DiskCache(tmp_path / 'cache', 1000, evict_interval=1)
+    for i, key in enumerate(['foo', 'bar', 'baz']):
+        cache.set(key, b'x' * 280, 10)
+        os.utime(cache._get_path(key), (i, i))
+    # 'foo' becomes the most recently used one
+    assert cache.get('foo') is not None
+    cache.set('qux', b'x' * 280, 10)
+    assert cache.get('bar') is None
+    assert cache.get('baz') is not None
+    assert cache.get('foo') is not None
+    assert cache.get('qux') is not None
+
+
+def test_periodic_eviction(tmp_path):
+    cache = DiskCache(tmp_path / 'cache', 1000, evict_interval=3)
+    for key in ['foo', 'bar']:
+        cache.set(key, b'x' * 600, 10)
+    assert len(_get_entry_names(cache)) == 2
+    cache.set('baz', b'x' * 600, 10)
+    assert len(_get_entry_names(cache)) == 1
+    # the write counter is reset by eviction
+    cache.set('qux', b'x' * 600, 10)
+    assert len(_get_entry_names(cache)) == 2
+
+
+def test_clear(cache):
+    cache.set('foo', b'bar', 10)
+    cache.set('baz', b'qux', 10)
+    cache.clear()
+    assert not _get_entry_names(cache)
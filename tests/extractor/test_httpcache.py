@@ -0,0 +1,121 @@
+from email.message import Message
+
+import pytest
+
+from dl_plus import ytdl
+from dl_plus.extractor import Extractor
+from dl_plus.extractor.httpcache import get_ttl, make_response
+
+
+def _make_headers(**headers):
+    message = Message()
+    for name, value in headers.items():
+        message[name.replace('_', '-')] = value
+    return message
+
+
+@pytest.mark.parametrize('headers,declared_ttl,expected', [
+    ({}, None, None),
+    ({}, 10, 10),
+    ({'Cache_Control': 'public, max-age=60'}, None, 60),
+    ({'Cache_Control': 'max-age="60"', 'Age': '15'}, None, 45),
+    ({'Cache_Control': 'max-age=60', 'Age': '60'}, None, None),
+    ({'Cache_Control': 'max-age=60'}, 10, 10),
+    ({'Cache_Control': 'no-cache'}, None, None),
+    ({'Cache_Control': 'no-cache'}, 10, 10),
+    ({'Cache_Control': 'No-Store'}, 10, None),
+    ({'Cache_Control': 'max-age=60', 'Set_Cookie': 'foo=bar'}, 10, None),
+    ({'Cache_Control': 'max-age=foo'}, None, None),
+])
+def test_get_ttl(headers, declared_ttl, expected):
+    assert get_ttl(_make_headers(**headers), declared_ttl) == expected
+
+
+class TestDownloadWebpageHandle:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path, monkeypatch):
+        monkeypatch.setattr('dl_plus.config._data_home', tmp_path)
+        self.requests = []
+        self.status = 200
+        self.headers = [('Cache-Control', 'max-age=60')]
+
+        def download_webpage_handle(
+            ie, url_or_request, video_id, note=None, errnote=None,
+            fatal=True, encoding=None, data=None, headers={}, query={},
+            expected_status=None, impersonate=None,
+            require_impersonation=False,
+        ):
+            self.requests.append(url_or_request)
+            return (
+                f'content of {url_or_request}',
+                make_response(
+                    url_or_request + '?final', self.status, self.headers),
+            )
+
+        InfoExtractor = ytdl.import_from('extractor.common', 'InfoExtractor')
+        monkeypatch.setattr(
+            InfoExtractor, '_download_webpage_handle',
+            download_webpage_handle)
+
+    def create_extractor(self, **attrs):
+        attrs.setdefault('DLP_HTTP_CACHE', True)
+        attrs.setdefault('IE_NAME', 'foo/bar')
+        return type('TestExtractor', (Extractor,), attrs)()
+
+    def test_cached(self):
+        ie = self.create_extractor()
+        content, urlh = ie._download_webpage_handle('http://foo/1', '1')
+        assert content == 'content of http://foo/1'
+        content, urlh = ie._download_webpage_handle(
+            'http://foo/1#bar', '1', note='Downloading')
+        assert content == 'content of http://foo/1'
+        assert urlh.url == 'http://foo/1?final'
+        assert urlh.headers['Cache-Control'] == 'max-age=60'
+        assert ie._download_webpage('http://foo/1', '1') == content
+        assert self.requests == ['http://foo/1']
+
+    def test_disabled(self):
+        ie = self.create_extractor(DLP_HTTP_CACHE=False)
+        ie._download_webpage_handle('http://foo/1', '1')
+        ie._download_webpage_handle('http://foo/1', '1')
+        assert len(self.requests) == 2
+
+    @pytest.mark.parametrize('kwargs', [
+        {'data': b'foo'},
+        {'headers': {'X-Foo': 'bar'}},
+        {'query': {'foo': 'bar'}},
+        {'encoding': 'latin-1'},
+        {'impersonate': 'chrome'},
+    ])
+    def test_key(self, kwargs):
+        ie = self.create_extractor()
+        ie._download_webpage_handle('http://foo/1', '1')
+        ie._download_webpage_handle('http://foo/1', '1', **kwargs)
+        assert len(self.requests) == 2
+
+    def test_per_extractor(self):
+        self.create_extractor()._download_webpage_handle('http://foo/1', '1')
+        self.create_extractor(IE_NAME='foo/baz')._download_webpage_handle(
+            'http://foo/1', '1')
+        assert len(self.requests) == 2
+
+    @pytest.mark.parametrize('status,headers', [
+        (404, [('Cache-Control', 'max-age=60')]),
+        (200, [('Cache-Control', 'no-store')]),
+        (200, []),
+    ])
+    def test_not_stored(self, status, headers):
+        self.status = status
+        self.headers = headers
+        ie = self.create_extractor()
+        ie._download_webpage_handle('http://foo/1', '1')
+        ie._download_webpage_handle('http://foo/1', '1')
+        assert len(self.requests) == 2
+
+    def test_declared_ttl(self):
+        self.headers = []
+        ie = self.create_extractor(DLP_HTTP_CACHE_TTL=60)
+        ie._download_webpage_handle('http://foo/1', '1')
+        ie._download_webpage_handle('http://foo/1', '1')
+        assert len(self.requests) == 1
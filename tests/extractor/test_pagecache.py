@@ -0,0 +1,111 @@
+import pytest
+
+from dl_plus import ytdl
+from dl_plus.extractor import Extractor, pagecache
+from dl_plus.extractor.httpcache import make_response
+
+
+def _page(content):
+    return (content, 'https://foo.com/', 200, [])
+
+
+def test_page_cache_lru():
+    cache = pagecache.PageCache(10)
+    cache.set('foo', _page(b'xxxx'))
+    cache.set('bar', _page(b'xxxx'))
+    # 'foo' becomes the most recently used one
+    assert cache.get('foo') == _page(b'xxxx')
+    cache.set('baz', _page(b'xxxx'))
+    assert cache.get('bar') is None
+    assert cache.get('foo') is not None
+    assert cache.get('baz') is not None
+    assert cache.size == 8
+
+
+def test_page_cache_too_large():
+    cache = pagecache.PageCache(10)
+    cache.set('foo', _page(b'x' * 11))
+    assert cache.get('foo') is None
+    cache.set('foo', _page(b'x' * 10))
+    assert cache.size == 10
+    cache.set('foo', _page(b'x'))
+    assert cache.size == 1
+
+
+class TestInstall:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, monkeypatch):
+        monkeypatch.setattr('dl_plus.extractor.pagecache._cache', None)
+        self.requests = []
+        self.status = 200
+        self.content = None
+
+        def request_webpage(
+            ie, url_or_request, video_id, note=None, errnote=None,
+            fatal=True, data=None, headers=None, query=None,
+            expected_status=None, impersonate=None,
+            require_impersonation=False,
+        ):
+            self.requests.append(url_or_request)
+            content = self.content or f'content of {url_or_request}'.encode()
+            return make_response(url_or_request, self.status, [], content)
+
+        InfoExtractor = ytdl.import_from('extractor.common', 'InfoExtractor')
+        monkeypatch.setattr(
+            InfoExtractor, '_request_webpage', request_webpage)
+        pagecache.install(1000)
+
+    def create_extractor(self, name):
+        return type('TestExtractor', (Extractor,), {'IE_NAME': name})()
+
+    def test_shared(self):
+        foo = self.create_extractor('foo/foo')
+        bar = self.create_extractor('foo/bar')
+        content, urlh = foo._download_webpage_handle('https://foo.com/', '1')
+        assert bar._download_webpage('https://foo.com/#bar', '1') == content
+        # the generic extractor peeks at the response first
+        urlh = bar._request_webpage('https://foo.com/', '1')
+        assert (urlh.read(7) + urlh.read()).decode() == content
+        assert self.requests == ['https://foo.com/']
+
+    def test_read_in_chunks(self):
+        ie = self.create_extractor('foo/foo')
+        urlh = ie._request_webpage('https://foo.com/', '1')
+        while urlh.read(7):
+            pass
+        content, _ = ie._download_webpage_handle('https://foo.com/', '1')
+        assert content == 'content of https://foo.com/'
+        assert len(self.requests) == 1
+
+    def test_not_read_to_end(self):
+        ie = self.create_extractor('foo/foo')
+        ie._request_webpage('https://foo.com/', '1').read(7)
+        ie._download_webpage_handle('https://foo.com/', '1')
+        assert len(self.requests) == 2
+
+    @pytest.mark.parametrize('kwargs', [
+        {'data': b'foo'},
+        {'headers': {'X-Foo': 'bar'}},
+        {'query': {'foo': 'bar'}},
+        {'impersonate': 'chrome'},
+    ])
+    def test_key(self, kwargs):
+        ie = self.create_extractor('foo/foo')
+        ie._download_webpage_handle('https://foo.com/', '1')
+        ie._download_webpage_handle('https://foo.com/', '1', **kwargs)
+        assert len(self.requests) == 2
+
+    def test_not_stored(self):
+        self.status = 404
+        ie = self.create_extractor('foo/foo')
+        ie._download_webpage_handle('https://foo.com/', '1')
+        ie._download_webpage_handle('https://foo.com/', '1')
+        assert len(self.requests) == 2
+
+    def test_too_large(self):
+        self.content = b'x' * 1001
+        ie = self.create_extractor('foo/foo')
+        ie._download_webpage_handle('https://foo.com/', '1')
+        ie._download_webpage_handle('https://foo.com/', '1')
+        assert len(self.requests) == 2
@@ -191,3 +191,25 @@ def get_all_extractors_two_named_extractors(plugin):
     extractor_2 = plugin.register(create_extractor(), name='quuz')
     assert sorted(plugin.get_all_extractors()) == sorted(
         [extractor_1, extractor_2])
+
+
+def test_suitable_url_matcher(monkeypatch):
+    from dl_plus.extractor import extractor as extractor_module
+
+    foo = create_extractor(_VALID_URL=r'https?://foo\.com/(?P<id>\d+)')
+    bar = create_extractor(_VALID_URL=(
+        r'https?://bar\.com/v/(?P<id>\d+)',
+        r'https?://foo\.com/(?P<id>\w+)',
+    ))
+    baz = create_extractor(
+        _VALID_URL=r'https?://(?P<host>baz)\.com/(?P=host)')
+    monkeypatch.setattr(extractor_module, '_url_matcher', None)
+    extractor_module.install_url_matcher([foo, bar, baz])
+    assert foo.suitable('https://foo.com/1')
+    assert bar.suitable('https://foo.com/1')
+    assert not foo.suitable('https://foo.com/a')
+    assert bar.suitable('https://foo.com/a')
+    assert bar.suitable('https://bar.com/v/1')
+    assert not foo.suitable('https://baz.com/baz')
+    assert baz.suitable('https://baz.com/baz')
+    assert bar._match_id('https://bar.com/v/1') == '1'
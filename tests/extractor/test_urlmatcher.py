@@ -0,0 +1,48 @@
+import pytest
+
+from dl_plus.extractor.urlmatcher import URLMatcher, compile_valid_url
+
+
+@pytest.mark.parametrize('url,expected', [
+    ('https://foo.com/123', 'foo'),
+    ('https://bar.com/video/123', 'bar'),
+    ('https://bar.com/playlist/123', 'bar'),
+    ('https://BAZ.com/123', 'baz'),
+    ('https://qux.com/123', None),
+    # the first owner wins
+    ('https://foo.com/bar', 'foo-any'),
+])
+def test_match(url, expected):
+    matcher = URLMatcher([
+        ('foo', r'https?://foo\.com/(?P<id>\d+)'),
+        ('bar', (
+            r'https?://bar\.com/video/(?P<id>\d+)',
+            r'https?://bar\.com/playlist/(?P<id>\d+)',
+        )),
+        ('baz', r'''(?ix)
+            https?://baz\.com/
+            (?P<id>\d+)  # a comment'''),
+        ('foo-any', r'https?://foo\.com/(?P<id>.+)'),
+    ])
+    assert matcher.match(url) == expected
+
+
+@pytest.mark.parametrize('valid_url', [
+    r'https?://(?P<host>foo)\.com/(?P=host)',
+    r'https?://(foo)\.com/\1',
+    False,
+    None,
+    r'https?://foo\.com/(?P<id',
+])
+def test_not_combinable(valid_url):
+    matcher = URLMatcher([('foo', valid_url)])
+    assert 'foo' not in matcher
+    assert matcher.match('https://foo.com/foo') is None
+
+
+def test_compile_valid_url():
+    assert [
+        regex.pattern for regex in compile_valid_url(('foo', 'bar'))
+    ] == ['foo', 'bar']
+    with pytest.raises(TypeError):
+        compile_valid_url(False)
@@ -0,0 +1,128 @@
+import pytest
+
+from dl_plus import installed, packagedir
+from dl_plus.httpclient import HTTPClient
+from dl_plus.pypi import BuiltinWheelInstaller, PyPIClient
+
+from tests.pypi.test_package_index import make_wheel
+
+
+@pytest.fixture(autouse=True)
+def data_home(tmp_path, monkeypatch):
+    monkeypatch.setattr('dl_plus.config._data_home', tmp_path / 'data')
+    return tmp_path / 'data'
+
+
+@pytest.fixture
+def client(tmp_path):
+    _dir = tmp_path / 'wheels'
+    make_wheel(_dir, 'foo', '1.0')
+    make_wheel(_dir, 'foo', '2.0')
+    with HTTPClient(timeout=5) as http_client:
+        yield PyPIClient(http_client, str(_dir))
+
+
+_PLUGIN = 'plugin = ExtractorPlugin(__name__)\n'
+
+
+@pytest.mark.parametrize('source,expected', [
+    (
+        _PLUGIN + '@plugin.register\nclass Extractor: pass\n',
+        [None],
+    ),
+    (
+        _PLUGIN + "@plugin.register('foo')\nclass Foo: pass\n"
+        "@plugin.register('bar')\nclass Bar: pass\n",
+        ['foo', 'bar'],
+    ),
+    (
+        _PLUGIN + "plugin.register(Extractor, name='foo')\n",
+        ['foo'],
+    ),
+    (
+        'plugin = extractor.ExtractorPlugin(__name__)\n'
+        'plugin.register(Extractor)\n',
+        [None],
+    ),
+    (
+        _PLUGIN + 'for name in NAMES:\n'
+        '    plugin.register(Extractor, name=name)\n',
+        None,
+    ),
+    (
+        _PLUGIN + "atexit.register(cleanup)\nregistry.register('foo')\n",
+        [],
+    ),
+    (
+        'from .base import plugin\n@plugin.register\nclass Extractor: pass\n',
+        None,
+    ),
+    (
+        'x = 1\n',
+        [],
+    ),
+])
+def test_get_registered_names(source, expected):
+    assert installed._get_registered_names(source) == expected
+
+
+def test_scan_extractor_names(tmp_path):
+    plugin_dir = tmp_path / 'dl_plus' / 'extractors' / 'ns' / 'plugin'
+    plugin_dir.mkdir(parents=True)
+    (plugin_dir / '__init__.py').write_text(
+        _PLUGIN + "@plugin.register('foo')\nclass Foo: pass\n")
+    (plugin_dir / 'extra.py').write_text(
+        'from . import plugin as _plugin\n'
+        "@_plugin.register('bar')\nclass Bar: pass\n")
+    assert installed.scan_extractor_names(
+        tmp_path, 'ns', 'plugin') == ['foo', 'bar']
+    assert installed.scan_extractor_names(tmp_path, 'ns', 'missing') is None
+
+
+def test_install_uninstall(data_home, client):
+    package_dir = data_home / 'backends' / 'foo'
+    installer = BuiltinWheelInstaller(client)
+    installer.install(client.fetch_wheel_info('foo', '1.0'), package_dir)
+    records = installed.get_packages(installed.BACKENDS)
+    assert len(records) == 1
+    record = records[0]
+    assert record['name'] == 'foo'
+    assert record['version'] == '1.0'
+    assert record['sha256']
+    assert record['version_dir'] == 'foo@1.0'
+
+    installer.install(client.fetch_wheel_info('foo'), package_dir)
+    records = installed.get_packages(installed.BACKENDS)
+    assert [record['version'] for record in records] == ['2.0']
+
+    with packagedir.get_lock(package_dir):
+        packagedir.remove(package_dir)
+        installed.remove(package_dir)
+    assert installed.get_packages(installed.BACKENDS) == []
+
+
+def test_rebuild(data_home, client):
+    package_dir = data_home / 'backends' / 'foo'
+    installer = BuiltinWheelInstaller(client)
+    installer.install(client.fetch_wheel_info('foo'), package_dir)
+    installed.get_db_path().unlink()
+    records = installed.get_packages(installed.BACKENDS)
+    assert [record['version'] for record in records] == ['2.0']
+    assert installed.get_db_path().is_file()
+    assert installed.get_packages(installed.EXTRACTORS) == []
+
+
+def test_no_data_home(data_home):
+    assert installed.get_packages(installed.BACKENDS) == []
+    assert not data_home.exists()
+
+
+def test_rebuild_stale(data_home, client):
+    package_dir = data_home / 'backends' / 'foo'
+    installer = BuiltinWheelInstaller(client)
+    installer.install(client.fetch_wheel_info('foo', '1.0'), package_dir)
+    assert len(installed.get_packages(installed.BACKENDS)) == 1
+    # removed by hand
+    with packagedir.get_lock(package_dir):
+        packagedir.remove(package_dir)
+    assert installed.get_packages(installed.BACKENDS) == []
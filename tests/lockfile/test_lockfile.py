@@ -0,0 +1,82 @@
+import io
+import shutil
+
+import pytest
+
+from dl_plus import lockfile, packagedir
+from dl_plus.httpclient import HTTPClient
+from dl_plus.pypi import BuiltinWheelInstaller, PyPIClient
+
+from tests.pypi.test_package_index import make_wheel
+
+
+@pytest.fixture(autouse=True)
+def data_home(tmp_path, monkeypatch):
+    monkeypatch.setattr('dl_plus.config._data_home', tmp_path / 'data')
+    return tmp_path / 'data'
+
+
+@pytest.fixture
+def index_dir(tmp_path):
+    _dir = tmp_path / 'wheels'
+    make_wheel(_dir, 'foo', '1.0', requires=['bar'])
+    make_wheel(_dir, 'bar', '1.0')
+    return _dir
+
+
+def make_installer(index_url):
+    return BuiltinWheelInstaller(PyPIClient(HTTPClient(timeout=5), index_url))
+
+
+def test_lock_sync(tmp_path, data_home, index_dir):
+    installer = make_installer(str(index_dir))
+    package_dir = data_home / 'backends' / 'foo'
+    installer.install(installer.client.fetch_wheel_info('foo'), package_dir)
+
+    packages = lockfile.get_installed_packages()
+    assert [(p.kind, p.dir_name, p.wheel.version) for p in packages] == [
+        ('backends', 'foo', '1.0')]
+    assert [wheel.name for wheel in packages[0].dependencies] == ['bar']
+    assert lockfile.is_installed(packages[0])
+    buffer = io.StringIO()
+    lockfile.dump(packages, buffer)
+
+    shutil.rmtree(data_home)
+    buffer.seek(0)
+    locked_packages = lockfile.load(buffer)
+    package = locked_packages[0]
+    assert not lockfile.is_installed(package)
+    # the index must not be queried, the wheels are fetched by URLs
+    installer = make_installer(str(tmp_path / 'nonexistent'))
+    installer.install(
+        package.wheel, package.package_dir, package.extras,
+        package.dependencies,
+    )
+    active_dir = packagedir.get_active_dir(package_dir)
+    assert (active_dir / 'foo' / '__init__.py').is_file()
+    assert (active_dir / 'bar' / '__init__.py').is_file()
+    assert lockfile.is_installed(package)
+
+
+def test_installed_without_dependencies_record(data_home, index_dir):
+    installer = make_installer(str(index_dir))
+    package_dir = data_home / 'backends' / 'foo'
+    installer.install(installer.client.fetch_wheel_info('foo'), package_dir)
+    [package] = lockfile.get_installed_packages()
+    # installed by an older dl-plus version
+    (packagedir.get_active_dir(package_dir) / 'dependencies.json').unlink()
+    [guessed_package] = lockfile.get_installed_packages()
+    assert guessed_package.wheel.sha256 == package.wheel.sha256
+    assert guessed_package.dependencies is None
+    assert not lockfile.is_installed(package)
+
+
+@pytest.mark.parametrize('content', [
+    '{',
+    '{"version": 2, "packages": []}',
+    '{"version": 1}',
+    '{"version": 1, "packages": [{"kind": "backends", "dir": "../foo"}]}',
+])
+def test_load_invalid(content):
+    with pytest.raises(lockfile.LockfileError):
+        lockfile.load(io.StringIO(content))
@@ -0,0 +1,130 @@
+import os
+
+import pytest
+
+from dl_plus import packagedir
+from dl_plus.pypi import save_metadata
+
+
+@pytest.fixture
+def package_dir(tmp_path):
+    return tmp_path / 'backends' / 'foo'
+
+
+@pytest.fixture(params=['symlink', 'pointer'])
+def link_mode(request, monkeypatch):
+    if request.param == 'pointer':
+        def symlink(*args, **kwargs):
+            raise OSError('symlinks are not supported')
+        monkeypatch.setattr(os, 'symlink', symlink)
+    return request.param
+
+
+def make_version_dir(package_dir, version):
+    version_dir = packagedir.get_new_version_dir(package_dir, version)
+    version_dir.mkdir(parents=True)
+    save_metadata(version_dir, {'info': {'name': 'foo', 'version': version}})
+    return version_dir
+
+
+def test_not_installed(package_dir):
+    assert packagedir.get_active_dir(package_dir) is None
+    assert packagedir.iter_package_dirs(package_dir.parent) == []
+
+
+def test_switch(package_dir, link_mode):
+    version_dir_1 = make_version_dir(package_dir, '1.0')
+    packagedir.switch(package_dir, version_dir_1)
+    assert packagedir.get_active_dir(package_dir) == version_dir_1
+    version_dir_2 = make_version_dir(package_dir, '2.0')
+    packagedir.switch(package_dir, version_dir_2)
+    assert packagedir.get_active_dir(package_dir) == version_dir_2
+    assert packagedir.iter_package_dirs(package_dir.parent) == [package_dir]
+    assert packagedir.get_version_dirs(package_dir) == [
+        version_dir_1, version_dir_2]
+
+
+def test_new_version_dir_for_reinstall(package_dir):
+    version_dir = make_version_dir(package_dir, '1.0')
+    assert version_dir.name == 'foo@1.0'
+    reinstall_dir = packagedir.get_new_version_dir(package_dir, '1.0')
+    assert reinstall_dir.name == 'foo@1.0~1'
+    assert packagedir.get_version_from_dir_name(reinstall_dir) == '1.0'
+
+
+def test_legacy_dir(package_dir):
+    package_dir.mkdir(parents=True)
+    save_metadata(package_dir, {'info': {'name': 'foo', 'version': '0.9'}})
+    assert packagedir.get_active_dir(package_dir) == package_dir
+    version_dir = make_version_dir(package_dir, '1.0')
+    packagedir.switch(package_dir, version_dir)
+    assert packagedir.get_active_dir(package_dir) == version_dir
+    assert (package_dir.parent / 'foo@0.9' / 'metadata.json').is_file()
+
+
+def test_collect_garbage(package_dir, link_mode):
+    version_dir_1 = make_version_dir(package_dir, '1.0')
+    packagedir.switch(package_dir, version_dir_1)
+    version_dir_2 = make_version_dir(package_dir, '2.0')
+    packagedir.switch(package_dir, version_dir_2)
+    packagedir.collect_garbage(package_dir)
+    # the grace period is not expired yet
+    assert version_dir_1.exists()
+    packagedir.collect_garbage(package_dir, grace_period=-1)
+    assert not version_dir_1.exists()
+    assert packagedir.get_active_dir(package_dir) == version_dir_2
+
+
+def test_collect_garbage_tmp_dirs(package_dir):
+    package_dir.parent.mkdir(parents=True)
+    tmp_dir = package_dir.with_name('.foo.123.tmp')
+    other_tmp_dir = package_dir.with_name('.foo.bar.123.tmp')
+    for path in (tmp_dir, other_tmp_dir):
+        path.mkdir()
+    packagedir.collect_garbage(package_dir, grace_period=-1)
+    assert not tmp_dir.exists()
+    assert other_tmp_dir.exists()
+
+
+def test_keep(package_dir, link_mode):
+    version_dir_1 = make_version_dir(package_dir, '1.0')
+    version_dir_2 = make_version_dir(package_dir, '2.0')
+    packagedir.switch(package_dir, version_dir_2)
+    packagedir.keep(version_dir_1)
+    packagedir.collect_garbage(package_dir, grace_period=-1)
+    assert version_dir_1.exists()
+    assert packagedir.is_kept(version_dir_1)
+    assert packagedir.get_active_dir(package_dir) == version_dir_2
+
+
+def test_get_version_dir(package_dir, link_mode):
+    version_dir_1 = make_version_dir(package_dir, '1.0')
+    reinstall_dir_1 = make_version_dir(package_dir, '1.0')
+    version_dir_2 = make_version_dir(package_dir, '2.0')
+    packagedir.switch(package_dir, version_dir_2)
+    assert packagedir.get_version_dir(package_dir, '2.0') == version_dir_2
+    assert packagedir.get_version_dir(package_dir, '1.0') == reinstall_dir_1
+    assert packagedir.get_version_dir(package_dir, '3.0') is None
+    packagedir.switch(package_dir, version_dir_1)
+    assert packagedir.get_version_dir(package_dir, '1.0') == version_dir_1
+
+
+def test_remove_version(package_dir, link_mode):
+    version_dir_1 = make_version_dir(package_dir, '1.0')
+    version_dir_2 = make_version_dir(package_dir, '2.0')
+    packagedir.switch(package_dir, version_dir_2)
+    assert not packagedir.remove_version(package_dir, '2.0')
+    assert packagedir.remove_version(package_dir, '1.0')
+    assert not version_dir_1.exists()
+    assert packagedir.get_active_dir(package_dir) == version_dir_2
+
+
+def test_remove(package_dir, link_mode):
+    version_dir_1 = make_version_dir(package_dir, '1.0')
+    version_dir_2 = make_version_dir(package_dir, '2.0')
+    packagedir.switch(package_dir, version_dir_2)
+    packagedir.remove(package_dir)
+    assert packagedir.get_active_dir(package_dir) is None
+    assert not version_dir_1.exists()
+    assert not version_dir_2.exists()
+    assert packagedir.iter_package_dirs(package_dir.parent) == []
@@ -0,0 +1,196 @@
+import hashlib
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from dl_plus.httpclient import HTTPClient
+from dl_plus.pypi import (
+    WHEEL_CACHE_MAX_AGE, BuiltinWheelInstaller, DownloadError, Metadata,
+    PyPIClient, Wheel, collect_wheel_cache_garbage, get_wheel_cache_dir,
+)
+
+
+BLOB = bytes(range(256)) * 1024
+FILENAME = 'foo-1.0-py3-none-any.whl'
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        server.ranges.append(self.headers.get('Range'))
+        start = 0
+        if match := re.fullmatch(r'bytes=(\d+)-', self.headers['Range'] or ''):
+            start = int(match.group(1))
+        if start >= len(BLOB):
+            self.send_response(416)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        body = BLOB[start:]
+        self.send_response(206 if start else 200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if server.drops:
+            server.drops -= 1
+            self.wfile.write(body[:len(body) // 2])
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def data_home(tmp_path, monkeypatch):
+    monkeypatch.setattr('dl_plus.config._data_home', tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def server():
+    _server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    _server.ranges = []
+    _server.drops = 0
+    thread = threading.Thread(target=_server.serve_forever, daemon=True)
+    thread.start()
+    yield _server
+    _server.shutdown()
+    _server.server_close()
+
+
+@pytest.fixture
+def installer():
+    with HTTPClient(timeout=5) as http_client:
+        yield BuiltinWheelInstaller(PyPIClient(http_client))
+
+
+def make_wheel(server, sha256=None):
+    host, port = server.server_address
+    return Wheel(
+        name='foo', version='1.0', metadata=Metadata(), filename=FILENAME,
+        url=f'http://{host}:{port}/{FILENAME}',
+        sha256=sha256 or hashlib.sha256(BLOB).hexdigest(),
+    )
+
+
+def test_download(server, installer):
+    path = installer.download(make_wheel(server))
+    assert path == get_wheel_cache_dir() / FILENAME
+    assert path.read_bytes() == BLOB
+    assert server.ranges == [None]
+
+
+def test_cached(server, installer):
+    installer.download(make_wheel(server))
+    installer.download(make_wheel(server))
+    assert server.ranges == [None]
+
+
+def test_resume_after_dropped_connection(server, installer):
+    server.drops = 2
+    path = installer.download(make_wheel(server))
+    assert path.read_bytes() == BLOB
+    half = len(BLOB) // 2
+    quarter = half + (len(BLOB) - half) // 2
+    assert server.ranges == [None, f'bytes={half}-', f'bytes={quarter}-']
+
+
+def test_resume_partial_file_from_previous_run(server, installer):
+    cache_dir = get_wheel_cache_dir()
+    cache_dir.mkdir(parents=True)
+    (cache_dir / f'{FILENAME}.part').write_bytes(BLOB[:1000])
+    path = installer.download(make_wheel(server))
+    assert path.read_bytes() == BLOB
+    assert server.ranges == ['bytes=1000-']
+
+
+def test_complete_partial_file(server, installer):
+    cache_dir = get_wheel_cache_dir()
+    cache_dir.mkdir(parents=True)
+    (cache_dir / f'{FILENAME}.part').write_bytes(BLOB)
+    assert installer.download(make_wheel(server)).read_bytes() == BLOB
+
+
+def test_restart_stale_partial_file(server, installer):
+    cache_dir = get_wheel_cache_dir()
+    cache_dir.mkdir(parents=True)
+    (cache_dir / f'{FILENAME}.part').write_bytes(b'x' * 1000)
+    path = installer.download(make_wheel(server))
+    assert path.read_bytes() == BLOB
+    assert server.ranges == ['bytes=1000-', None]
+
+
+def test_sha256_mismatch(server, installer):
+    with pytest.raises(DownloadError, match='sha256 mismatch'):
+        installer.download(make_wheel(server, sha256='0' * 64))
+    assert not [
+        path for path in get_wheel_cache_dir().iterdir()
+        if not path.name.endswith('.lock')
+    ]
+    assert server.ranges == [None]
+
+
+def test_concurrent_downloads(server, installer):
+    wheel = make_wheel(server)
+    paths = []
+
+    def download():
+        paths.append(installer.download(wheel))
+
+    threads = [threading.Thread(target=download) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert paths == [get_wheel_cache_dir() / FILENAME] * 4
+    assert paths[0].read_bytes() == BLOB
+    assert server.ranges == [None]
+
+
+def test_download_all_deduplicates(server, installer):
+    wheel = make_wheel(server)
+    paths = installer.download_all([wheel, wheel])
+    assert paths == [get_wheel_cache_dir() / FILENAME] * 2
+    assert server.ranges == [None]
+
+
+def _age(path, seconds):
+    mtime = time.time() - seconds
+    os.utime(path, (mtime, mtime))
+
+
+def test_collect_wheel_cache_garbage():
+    cache_dir = get_wheel_cache_dir()
+    cache_dir.mkdir(parents=True)
+    old = cache_dir / 'old-1.0-py3-none-any.whl'
+    old_part = cache_dir / 'old-2.0-py3-none-any.whl.part'
+    new = cache_dir / 'new-1.0-py3-none-any.whl'
+    lock = cache_dir / '.old-1.0-py3-none-any.whl.lock'
+    for path in (old, old_part, new, lock):
+        path.write_bytes(b'')
+    for path in (old, old_part, lock):
+        _age(path, WHEEL_CACHE_MAX_AGE + 60)
+    collect_wheel_cache_garbage()
+    assert sorted(path.name for path in cache_dir.iterdir()) == sorted([
+        new.name, lock.name, '.old-2.0-py3-none-any.whl.lock'])
+
+
+def test_cached_wheel_use_is_recorded(server, installer):
+    path = installer.download(make_wheel(server))
+    _age(path, WHEEL_CACHE_MAX_AGE + 60)
+    installer.download(make_wheel(server))
+    collect_wheel_cache_garbage()
+    assert path.is_file()
+    assert server.ranges == [None]
+
+
+def test_collect_wheel_cache_garbage_no_cache_dir():
+    collect_wheel_cache_garbage()
+    assert not get_wheel_cache_dir().exists()
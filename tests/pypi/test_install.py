@@ -0,0 +1,72 @@
+import pytest
+
+from dl_plus import packagedir
+from dl_plus.httpclient import HTTPClient
+from dl_plus.pypi import BuiltinWheelInstaller, PyPIClient, load_metadata
+
+from tests.pypi.test_package_index import make_wheel
+
+
+@pytest.fixture(autouse=True)
+def data_home(tmp_path, monkeypatch):
+    monkeypatch.setattr('dl_plus.config._data_home', tmp_path / 'data')
+    return tmp_path / 'data'
+
+
+@pytest.fixture
+def index_dir(tmp_path):
+    _dir = tmp_path / 'wheels'
+    make_wheel(_dir, 'foo', '1.0')
+    make_wheel(_dir, 'foo', '2.0')
+    return _dir
+
+
+@pytest.fixture
+def client(index_dir):
+    with HTTPClient(timeout=5) as http_client:
+        yield PyPIClient(http_client, str(index_dir))
+
+
+def test_install_update(data_home, client):
+    package_dir = data_home / 'backends' / 'foo'
+    installer = BuiltinWheelInstaller(client)
+    installer.install(client.fetch_wheel_info('foo', '1.0'), package_dir)
+    active_dir = packagedir.get_active_dir(package_dir)
+    assert active_dir.name == 'foo@1.0'
+    assert (active_dir / 'foo' / '__init__.py').is_file()
+    assert load_metadata(active_dir).version == '1.0'
+    # modules are compiled before activation
+    assert list((active_dir / 'foo' / '__pycache__').glob('__init__.*.pyc'))
+
+    installer.install(client.fetch_wheel_info('foo'), package_dir)
+    active_dir = packagedir.get_active_dir(package_dir)
+    assert active_dir.name == 'foo@2.0'
+    # the previous version is kept for running processes
+    assert (package_dir.parent / 'foo@1.0').is_dir()
+
+
+def test_reinstall_same_version(data_home, client):
+    package_dir = data_home / 'backends' / 'foo'
+    installer = BuiltinWheelInstaller(client)
+    wheel = client.fetch_wheel_info('foo')
+    installer.install(wheel, package_dir)
+    installer.install(wheel, package_dir)
+    assert packagedir.get_active_dir(package_dir).name == 'foo@2.0~1'
+
+
+def test_post_install(data_home, client):
+    package_dir = data_home / 'backends' / 'foo'
+    installer = BuiltinWheelInstaller(client)
+    populated_dirs = []
+
+    def post_install(version_dir):
+        assert (version_dir / 'foo' / '__init__.py').is_file()
+        assert not packagedir.get_active_dir(package_dir)
+        populated_dirs.append(version_dir)
+
+    installer.install(
+        client.fetch_wheel_info('foo'), package_dir,
+        post_install=post_install,
+    )
+    assert len(populated_dirs) == 1
+    assert packagedir.get_active_dir(package_dir).name == 'foo@2.0'
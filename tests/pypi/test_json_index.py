@@ -0,0 +1,98 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from dl_plus.httpclient import HTTPClient
+from dl_plus.pypi import JSONPackageIndex
+
+
+ETAG = '"v1"'
+
+METADATA = {
+    'info': {'name': 'foo', 'version': '1.0'},
+    'urls': [{
+        'packagetype': 'bdist_wheel',
+        'filename': 'foo-1.0-py3-none-any.whl',
+        'url': '../../files/foo-1.0-py3-none-any.whl',
+        'digests': {'sha256': '0' * 64},
+    }],
+}
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.server.requests.append(self.headers.get('If-None-Match'))
+        if self.headers.get('If-None-Match') == ETAG:
+            self.send_response(304)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        body = json.dumps(METADATA).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('ETag', ETAG)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    _server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    _server.requests = []
+    thread = threading.Thread(target=_server.serve_forever, daemon=True)
+    thread.start()
+    yield _server
+    _server.shutdown()
+    _server.server_close()
+
+
+@pytest.fixture
+def base_url(server):
+    host, port = server.server_address
+    return f'http://{host}:{port}/pypi'
+
+
+@pytest.fixture
+def http_client():
+    with HTTPClient(timeout=5) as _client:
+        yield _client
+
+
+def test_conditional_request(base_url, http_client, tmp_path):
+    cache_dir = tmp_path / 'cache'
+    index = JSONPackageIndex(base_url, http_client, cache_dir)
+    metadata = index.fetch_metadata('foo')
+    assert metadata.version == '1.0'
+    assert len(list(cache_dir.iterdir())) == 1
+
+    # a new index instance, as in another process
+    index = JSONPackageIndex(base_url, http_client, cache_dir)
+    metadata = index.fetch_metadata('foo')
+    assert metadata.version == '1.0'
+    # relative file URLs are resolved against the cached response URL
+    assert metadata.urls[0]['url'] == (
+        f'{base_url.rpartition("/")[0]}/files/foo-1.0-py3-none-any.whl')
+
+
+def test_conditional_request_headers(
+    server, base_url, http_client, tmp_path,
+):
+    index = JSONPackageIndex(base_url, http_client, tmp_path / 'cache')
+    index.fetch_metadata('foo')
+    index.fetch_metadata('foo')
+    assert server.requests == [None, ETAG]
+
+
+def test_no_cache_dir(server, base_url, http_client):
+    index = JSONPackageIndex(base_url, http_client)
+    index.fetch_metadata('foo')
+    index.fetch_metadata('foo')
+    assert server.requests == [None, None]
@@ -0,0 +1,164 @@
+import hashlib
+import threading
+import zipfile
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from dl_plus.httpclient import HTTPClient
+from dl_plus.pypi import (
+    DownloadError, JSONPackageIndex, LocalPackageIndex, ProjectNotFound,
+    PyPIClient, SimplePackageIndex, get_package_index,
+)
+
+
+def make_wheel(directory, name, version, extras=(), requires=(), data=False):
+    directory.mkdir(parents=True, exist_ok=True)
+    dist_name = name.replace('-', '_')
+    path = directory / f'{dist_name}-{version}-py3-none-any.whl'
+    metadata = [
+        'Metadata-Version: 2.1', f'Name: {name}', f'Version: {version}']
+    metadata.extend(f'Provides-Extra: {extra}' for extra in extras)
+    metadata.extend(f'Requires-Dist: {req}' for req in requires)
+    with zipfile.ZipFile(path, 'w') as zfobj:
+        if data:
+            zfobj.writestr(
+                f'{dist_name}-{version}.data/purelib/{dist_name}/__init__.py',
+                '',
+            )
+            zfobj.writestr(
+                f'{dist_name}-{version}.data/scripts/{dist_name}', '')
+        else:
+            zfobj.writestr(f'{dist_name}/__init__.py', '')
+        zfobj.writestr(
+            f'{dist_name}-{version}.dist-info/METADATA',
+            '\n'.join(metadata) + '\n',
+        )
+        zfobj.writestr(
+            f'{dist_name}-{version}.dist-info/WHEEL',
+            'Wheel-Version: 1.0\nRoot-Is-Purelib: true\nTag: py3-none-any\n',
+        )
+        record = ''.join(f'{member},,\n' for member in zfobj.namelist())
+        zfobj.writestr(
+            f'{dist_name}-{version}.dist-info/RECORD',
+            f'{record}{dist_name}-{version}.dist-info/RECORD,,\n',
+        )
+    return path
+
+
+def sha256(path):
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+@pytest.fixture
+def flat_dir(tmp_path):
+    _dir = tmp_path / 'wheels'
+    make_wheel(_dir, 'foo-bar', '1.0', extras=['baz'])
+    make_wheel(_dir, 'foo-bar', '1.1')
+    make_wheel(_dir, 'foo-bar', '2.0b1')
+    make_wheel(_dir, 'other', '3.0')
+    return _dir
+
+
+@pytest.fixture
+def simple_dir(tmp_path):
+    _dir = tmp_path / 'simple'
+    make_wheel(_dir / 'foo-bar', 'foo-bar', '1.0')
+    wheel = make_wheel(_dir / 'foo-bar', 'foo-bar', '1.1')
+    (_dir / 'foo-bar' / 'index.html').write_text(
+        f'<html><body>'
+        f'<a href="{wheel.name}#sha256={sha256(wheel)}">{wheel.name}</a>'
+        f'</body></html>'
+    )
+    make_wheel(_dir / 'other', 'other', '3.0')
+    return _dir
+
+
+@pytest.fixture
+def http_client():
+    with HTTPClient(timeout=5) as client:
+        yield client
+
+
+@pytest.mark.parametrize('index_url,expected_cls', [
+    ('https://pypi.org/pypi', JSONPackageIndex),
+    ('http://localhost:8080/root/pypi/', JSONPackageIndex),
+    ('http://localhost:8080/simple/', SimplePackageIndex),
+    ('file:///srv/wheels', LocalPackageIndex),
+    ('/srv/wheels', LocalPackageIndex),
+])
+def test_get_package_index(http_client, index_url, expected_cls):
+    assert isinstance(get_package_index(index_url, http_client), expected_cls)
+
+
+class TestLocalFlat:
+
+    def test_latest_final_version(self, flat_dir):
+        metadata = LocalPackageIndex(flat_dir).fetch_metadata('Foo_Bar')
+        assert metadata.name == 'foo-bar'
+        assert metadata.version == '1.1'
+        [release] = metadata.urls
+        assert release['filename'] == 'foo_bar-1.1-py3-none-any.whl'
+        path = flat_dir / release['filename']
+        assert release['url'] == path.as_uri()
+        assert release['digests']['sha256'] == sha256(path)
+
+    def test_specific_version(self, flat_dir):
+        metadata = LocalPackageIndex(flat_dir).fetch_metadata('foo-bar', '1.0')
+        assert metadata.version == '1.0'
+        assert metadata.extras == ['baz']
+
+    def test_prerelease_version(self, flat_dir):
+        metadata = LocalPackageIndex(flat_dir).fetch_metadata(
+            'foo-bar', '2.0b1')
+        assert metadata.version == '2.0b1'
+
+    def test_not_found(self, flat_dir):
+        index = LocalPackageIndex(flat_dir)
+        with pytest.raises(ProjectNotFound):
+            index.fetch_metadata('missing')
+        with pytest.raises(ProjectNotFound):
+            index.fetch_metadata('foo-bar', '3.0')
+
+
+class TestLocalSimple:
+
+    def test_index_html(self, simple_dir):
+        metadata = LocalPackageIndex(simple_dir).fetch_metadata('foo-bar')
+        # 1.0 is not listed in index.html
+        assert metadata.version == '1.1'
+
+    def test_no_index_html(self, simple_dir):
+        metadata = LocalPackageIndex(simple_dir).fetch_metadata('other')
+        assert metadata.version == '3.0'
+
+
+def test_simple_http(simple_dir, http_client):
+    server = ThreadingHTTPServer(
+        ('127.0.0.1', 0),
+        partial(SimpleHTTPRequestHandler, directory=str(simple_dir)),
+    )
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        host, port = server.server_address
+        index = SimplePackageIndex(f'http://{host}:{port}/', http_client)
+        metadata = index.fetch_metadata('foo-bar')
+        with pytest.raises(ProjectNotFound):
+            index.fetch_metadata('missing')
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert metadata.version == '1.1'
+    [release] = metadata.urls
+    assert release['url'] == (
+        f'http://{host}:{port}/foo-bar/foo_bar-1.1-py3-none-any.whl')
+
+
+def test_client_fetch_wheel_info(flat_dir, http_client):
+    client = PyPIClient(http_client, flat_dir.as_uri())
+    wheel = client.fetch_wheel_info('foo-bar')
+    assert (wheel.name, wheel.version) == ('foo-bar', '1.1')
+    with pytest.raises(DownloadError, match='missing: not found'):
+        client.fetch_wheel_info('missing')
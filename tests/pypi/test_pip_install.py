@@ -0,0 +1,73 @@
+import subprocess
+import sys
+
+import pytest
+
+from dl_plus import packagedir
+from dl_plus.httpclient import HTTPClient
+from dl_plus.pypi import InstallRequest, PipWheelInstaller, PyPIClient
+
+from tests.pypi.test_package_index import make_wheel
+
+
+pytestmark = pytest.mark.skipif(
+    subprocess.call(
+        [sys.executable, '-m', 'pip', '--version'],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    ) != 0,
+    reason='pip is not available',
+)
+
+
+@pytest.fixture(autouse=True)
+def data_home(tmp_path, monkeypatch):
+    monkeypatch.setattr('dl_plus.config._data_home', tmp_path / 'data')
+    return tmp_path / 'data'
+
+
+@pytest.fixture
+def index_dir(tmp_path):
+    _dir = tmp_path / 'wheels'
+    make_wheel(_dir, 'foo', '1.0', requires=['shared'])
+    make_wheel(
+        _dir, 'bar', '1.0', extras=['baz'],
+        requires=['shared', 'baz; extra == "baz"'],
+    )
+    make_wheel(_dir, 'shared', '1.0')
+    make_wheel(_dir, 'baz', '1.0')
+    return _dir
+
+
+@pytest.fixture
+def client(index_dir):
+    with HTTPClient(timeout=5) as http_client:
+        yield PyPIClient(http_client, str(index_dir))
+
+
+def test_install_many_runs_pip_once(data_home, client, monkeypatch):
+    calls = []
+    check_call = subprocess.check_call
+
+    def _check_call(args, *other_args, **kwargs):
+        calls.append(args)
+        return check_call(args, *other_args, **kwargs)
+
+    monkeypatch.setattr(subprocess, 'check_call', _check_call)
+    installer = PipWheelInstaller(client)
+    installer.install_many([
+        InstallRequest(
+            client.fetch_wheel_info('foo'), data_home / 'extractors' / 'foo'),
+        InstallRequest(
+            client.fetch_wheel_info('bar'), data_home / 'extractors' / 'bar',
+            ['baz'],
+        ),
+    ])
+    assert len(calls) == 1
+    foo_dir = packagedir.get_active_dir(data_home / 'extractors' / 'foo')
+    bar_dir = packagedir.get_active_dir(data_home / 'extractors' / 'bar')
+    assert sorted(
+        path.parent.name for path in foo_dir.glob('*/__init__.py')
+    ) == ['foo', 'shared']
+    assert sorted(
+        path.parent.name for path in bar_dir.glob('*/__init__.py')
+    ) == ['bar', 'baz', 'shared']
@@ -0,0 +1,76 @@
+import pytest
+
+from dl_plus.httpclient import HTTPClient
+from dl_plus.pypi import BuiltinWheelInstaller, PyPIClient
+from dl_plus.resolver import ResolutionError, Resolver
+
+from tests.pypi.test_package_index import make_wheel
+
+
+@pytest.fixture(autouse=True)
+def data_home(tmp_path, monkeypatch):
+    monkeypatch.setattr('dl_plus.config._data_home', tmp_path / 'data')
+    return tmp_path / 'data'
+
+
+@pytest.fixture
+def index_dir(tmp_path):
+    _dir = tmp_path / 'wheels'
+    make_wheel(
+        _dir, 'app', '1.0', extras=['extra'],
+        requires=[
+            'lib-a>=1.0',
+            'lib-b; extra == "extra"',
+            'lib-win; sys_platform == "nonexistent"',
+        ],
+    )
+    make_wheel(_dir, 'lib-a', '1.0')
+    make_wheel(_dir, 'lib-a', '1.1', requires=['lib-c<2'])
+    make_wheel(_dir, 'lib-a', '2.0a1')
+    make_wheel(_dir, 'lib-b', '1.0', requires=['lib-a<1.1'])
+    make_wheel(_dir, 'lib-c', '1.5', data=True)
+    make_wheel(_dir, 'lib-c', '2.0')
+    make_wheel(_dir, 'conflict', '1.0', requires=['lib-a<1.0'])
+    return _dir
+
+
+@pytest.fixture
+def client(index_dir):
+    with HTTPClient(timeout=5) as http_client:
+        yield PyPIClient(http_client, str(index_dir))
+
+
+@pytest.fixture
+def installer(client):
+    return BuiltinWheelInstaller(client)
+
+
+def resolve(client, installer, name, extras=()):
+    resolver = Resolver(client.index, installer.download)
+    wheels = resolver.resolve(client.fetch_wheel_info(name), extras)
+    return sorted((wheel.name, wheel.version) for wheel in wheels)
+
+
+def test_resolve(client, installer):
+    assert resolve(client, installer, 'app') == [
+        ('lib-a', '1.1'), ('lib-c', '1.5')]
+
+
+def test_resolve_conflict(client, installer):
+    # lib-a 1.1 is selected before lib-b requiring lib-a<1.1 is encountered
+    with pytest.raises(ResolutionError, match='lib-a<1.1 is required'):
+        resolve(client, installer, 'app', ['extra'])
+
+
+def test_resolve_not_satisfiable(client, installer):
+    with pytest.raises(ResolutionError, match='no compatible wheel'):
+        resolve(client, installer, 'conflict')
+
+
+def test_install_with_dependencies(data_home, client, installer):
+    package_dir = data_home / 'backends' / 'app'
+    installer.install(client.fetch_wheel_info('app'), package_dir)
+    version_dir = package_dir.parent / 'app@1.0'
+    for name in ['app', 'lib_a', 'lib_c']:
+        assert (version_dir / name / '__init__.py').is_file()
+    assert not list(version_dir.glob('*.data'))
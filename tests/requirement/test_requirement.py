@@ -0,0 +1,104 @@
+import pytest
+
+from dl_plus.requirement import (
+    InvalidRequirement, Marker, Requirement, SpecifierSet,
+)
+
+
+ENVIRONMENT = {
+    'implementation_name': 'cpython',
+    'implementation_version': '3.12.1',
+    'os_name': 'posix',
+    'platform_machine': 'x86_64',
+    'platform_release': '6.1.0',
+    'platform_system': 'Linux',
+    'platform_version': '#1 SMP',
+    'python_full_version': '3.12.1',
+    'platform_python_implementation': 'CPython',
+    'python_version': '3.12',
+    'sys_platform': 'linux',
+}
+
+
+@pytest.mark.parametrize('specifier,version,expected', [
+    ('>=1.0', '1.0', True),
+    ('>=1.0', '0.9', False),
+    ('>=1.0,!=1.3', '1.3', False),
+    ('>=1.0,!=1.3', '1.3.1', True),
+    ('==1.*', '1.9', True),
+    ('==1.*', '2.0', False),
+    ('~=1.4.2', '1.4.5', True),
+    ('~=1.4.2', '1.5', False),
+    ('~=1.4', '1.9', True),
+    ('==1.0', '1.0+local', True),
+    ('<2.0', '2.0a1', False),
+    ('>1.0', '1.0.post1', False),
+    ('>=1.0', '2.0b1', False),
+    ('>=2.0b1', '2.0b2', True),
+    ('', '1.0', True),
+    ('(>=1.0)', '1.0', True),
+])
+def test_specifier_set_contains(specifier, version, expected):
+    assert SpecifierSet(specifier).contains(version) is expected
+
+
+def test_specifier_set_contains_prereleases():
+    assert SpecifierSet('>=1.0').contains('2.0b1', prereleases=True)
+
+
+@pytest.mark.parametrize('marker,expected', [
+    ('python_version >= "3.9"', True),
+    ('python_version < "3.10"', False),
+    ('python_full_version >= "3.12.0"', True),
+    ("implementation_name == 'cpython' and os_name != 'nt'", True),
+    ('sys_platform == "win32" or (os_name == "posix" and '
+     'platform_machine == "x86_64")', True),
+    ('"linux" in sys_platform', True),
+    ('platform_system not in "Windows Darwin"', True),
+    ('extra == "default"', False),
+])
+def test_marker_evaluate(marker, expected):
+    assert Marker(marker).evaluate(ENVIRONMENT) is expected
+
+
+@pytest.mark.parametrize('marker', [
+    'python_version >=',
+    'unknown_variable == "1"',
+    '(python_version == "3.9"',
+])
+def test_invalid_marker(marker):
+    with pytest.raises(InvalidRequirement):
+        Marker(marker)
+
+
+def test_requirement():
+    requirement = Requirement(
+        'Requests[Socks, security] >=2.32.2,<3; python_version >= "3.8"')
+    assert requirement.name == 'Requests'
+    assert requirement.normalized_name == 'requests'
+    assert requirement.extras == {'socks', 'security'}
+    assert str(requirement.specifier) == '>=2.32.2,<3'
+    assert requirement.marker.evaluate(ENVIRONMENT)
+    assert requirement.url is None
+
+
+def test_requirement_url():
+    requirement = Requirement('foo @ https://example.com/foo.whl')
+    assert requirement.url == 'https://example.com/foo.whl'
+
+
+@pytest.mark.parametrize('extras,expected', [
+    ((), False),
+    (('default',), True),
+    (('Curl_CFFI',), False),
+])
+def test_requirement_is_applicable(extras, expected):
+    requirement = Requirement(
+        'brotli; implementation_name == "cpython" and extra == "default"')
+    assert requirement.is_applicable(
+        frozenset(extras), ENVIRONMENT) is expected
+
+
+def test_invalid_requirement():
+    with pytest.raises(InvalidRequirement):
+        Requirement('foo >= bar')
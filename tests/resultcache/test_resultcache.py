@@ -0,0 +1,196 @@
+from types import SimpleNamespace
+
+import pytest
+
+from dl_plus import resultcache, ytdl
+from dl_plus.extractor import Extractor
+
+
+UnsupportedError, GeoRestrictedError, ExtractorError = ytdl.import_from(
+    'utils', ['UnsupportedError', 'GeoRestrictedError', 'ExtractorError'])
+
+NOW = 1_700_000_000
+
+
+@pytest.mark.parametrize('url,expected', [
+    ('https://foo.com/video.mp4', None),
+    ('https://foo.com/video.mp4?expire=1700003600&id=1', 1700003600),
+    ('https://foo.com/video.mp4?Expires=1700003600', 1700003600),
+    ('https://foo.com/video.mp4?exp=1700003600&expire=1700001800',
+     1700001800),
+    ('https://foo.com/video.mp4?expire=3600', None),
+    ('https://foo.com/video.mp4?expire=foo', None),
+    ('https://foo.com/video.mp4?hdnts=st=1700000000~exp=1700003600~acl=*',
+     1700003600),
+    ('https://foo.com/video.mp4?X-Amz-Date=20231114T221320Z'
+     '&X-Amz-Expires=3600', 1700003600),
+    ('https://foo.com/video.mp4?X-Amz-Date=foo&X-Amz-Expires=3600', None),
+    ('https://foo.com/videoplayback/expire/1700003600/id/1/manifest.mpd',
+     1700003600),
+])
+def test_get_url_expiry(url, expected):
+    assert resultcache.get_url_expiry(url) == expected
+
+
+@pytest.mark.parametrize('url,expected', [
+    ('https://foo.com/bar', 'https://foo.com/bar'),
+    ('HTTPS://Foo.COM:443/Bar#baz', 'https://foo.com/Bar'),
+    ('http://foo.com:80', 'http://foo.com/'),
+    ('http://foo.com:8080/', 'http://foo.com:8080/'),
+    ('https://foo.com/?b=2&a=1&c=', 'https://foo.com/?a=1&b=2&c='),
+])
+def test_normalize_url(url, expected):
+    assert resultcache.normalize_url(url) == expected
+
+
+def test_get_info_expiry():
+    assert resultcache.get_info_expiry({
+        'url': 'https://foo.com/?expire=1700007200',
+        'formats': [
+            {'url': 'https://foo.com/?expire=1700003600'},
+            {'manifest_url': 'https://foo.com/?expire=1700001800'},
+            {'url': 'https://foo.com/'},
+        ],
+        'thumbnail': 'https://foo.com/?expire=1600000000',
+    }) == 1700001800
+
+
+@pytest.mark.parametrize('info,expected', [
+    ({'url': 'https://foo.com/'}, 3600),
+    ({'url': 'https://foo.com/?expire=1700001860'}, 1800),
+    ({'url': 'https://foo.com/?expire=1700007200'}, 3600),
+])
+def test_get_ttl(monkeypatch, info, expected):
+    monkeypatch.setattr('time.time', lambda: NOW)
+    assert resultcache.get_ttl(info, 3600) == expected
+
+
+@pytest.mark.parametrize('exc,expected', [
+    (lambda: UnsupportedError('https://foo.com/'), 'unsupported'),
+    (lambda: GeoRestrictedError('foo'), 'geo-restricted'),
+    (lambda: ExtractorError('foo', expected=True), 'unavailable'),
+    (lambda: ExtractorError('foo'), None),
+    # yt-dlp networking errors
+    (lambda: ExtractorError('foo', cause=SimpleNamespace(status=404)),
+     'not-found'),
+    # urllib errors
+    (lambda: ExtractorError('foo', cause=SimpleNamespace(code=410)),
+     'not-found'),
+    (lambda: ExtractorError(
+        'foo', cause=SimpleNamespace(status=503), expected=True), None),
+])
+def test_get_failure_class(exc, expected):
+    assert resultcache.get_failure_class(exc()) == expected
+
+
+class TestInstall:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path, monkeypatch):
+        monkeypatch.setattr('dl_plus.config._data_home', tmp_path)
+        monkeypatch.setattr('dl_plus.resultcache._installed', False)
+        self.urls = []
+        self.info = {'id': '1', 'url': 'https://foo.com/1.mp4'}
+        self.error = None
+
+        def extract(ie, url):
+            self.urls.append(url)
+            if self.error:
+                raise self.error
+            return self.info
+
+        InfoExtractor = ytdl.import_from('extractor.common', 'InfoExtractor')
+        monkeypatch.setattr(InfoExtractor, 'extract', extract)
+        self.params = {}
+
+    def create_extractor(self, **attrs):
+        attrs.setdefault('IE_NAME', 'foo/bar')
+        ie = type('TestExtractor', (Extractor,), attrs)()
+        ie._downloader = SimpleNamespace(
+            params=self.params, to_screen=lambda *args, **kwargs: None)
+        return ie
+
+    def test_cached(self):
+        resultcache.install(60, 60)
+        ie = self.create_extractor()
+        assert ie.extract('https://foo.com/1') == self.info
+        assert ie.extract('https://foo.com/1#bar') == self.info
+        assert ie.extract('https://foo.com/2') == self.info
+        assert self.urls == ['https://foo.com/1', 'https://foo.com/2']
+
+    def test_key(self):
+        resultcache.install(60)
+        self.create_extractor().extract('https://foo.com/1')
+        self.params['noplaylist'] = True
+        self.create_extractor().extract('https://foo.com/1')
+        self.create_extractor(IE_NAME='foo/baz').extract('https://foo.com/1')
+        assert len(self.urls) == 3
+
+    def test_key_user_agent(self):
+        resultcache.install(60)
+        self.params['http_headers'] = {'User-Agent': 'foo', 'X-Foo': 'bar'}
+        self.create_extractor().extract('https://foo.com/1')
+        self.params['http_headers'] = {'User-Agent': 'baz', 'X-Foo': 'bar'}
+        self.create_extractor().extract('https://foo.com/1')
+        assert len(self.urls) == 1
+
+    @pytest.mark.parametrize('ttl,extractor_ttl,params', [
+        (0, None, {}),
+        (60, 0, {}),
+        (60, None, {'cachedir': False}),
+        (None, 60, {}),
+    ])
+    def test_disabled(self, ttl, extractor_ttl, params):
+        # failures are cached to make sure results are not
+        resultcache.install(ttl, 60, ['unsupported'])
+        self.params.update(params)
+        ie = self.create_extractor(DLP_RESULT_CACHE_TTL=extractor_ttl)
+        ie.extract('https://foo.com/1')
+        ie.extract('https://foo.com/1')
+        assert len(self.urls) == 2
+
+    def test_expired_url(self):
+        self.info['url'] = 'https://foo.com/1.mp4?expire=1700000000'
+        resultcache.install(60)
+        ie = self.create_extractor()
+        ie.extract('https://foo.com/1')
+        ie.extract('https://foo.com/1')
+        assert len(self.urls) == 2
+
+    def test_not_serializable(self):
+        self.info['entries'] = iter([])
+        resultcache.install(60)
+        ie = self.create_extractor()
+        ie.extract('https://foo.com/1')
+        ie.extract('https://foo.com/1')
+        assert len(self.urls) == 2
+
+    def test_failure_cached(self):
+        self.error = UnsupportedError('https://foo.com/1')
+        resultcache.install(None, 60, ['unsupported'])
+        ie = self.create_extractor()
+        with pytest.raises(UnsupportedError):
+            ie.extract('https://foo.com/1')
+        with pytest.raises(
+                ExtractorError, match=r'Unsupported URL: .+ \(cached'):
+            ie.extract('https://FOO.com/1')
+        assert len(self.urls) == 1
+        # results are not cached
+        self.error = None
+        ie.extract('https://foo.com/2')
+        ie.extract('https://foo.com/2')
+        assert len(self.urls) == 3
+
+    @pytest.mark.parametrize('failures_ttl,failure_classes', [
+        (None, ['unsupported']),
+        (0, ['unsupported']),
+        (60, ['unavailable']),
+    ])
+    def test_failure_not_cached(self, failures_ttl, failure_classes):
+        self.error = UnsupportedError('https://foo.com/1')
+        resultcache.install(60, failures_ttl, failure_classes)
+        ie = self.create_extractor()
+        for _ in range(2):
+            with pytest.raises(UnsupportedError):
+                ie.extract('https://foo.com/1')
+        assert len(self.urls) == 2
@@ -0,0 +1,94 @@
+import os
+import time
+
+import pytest
+
+from dl_plus import backend, snapshot
+
+
+@pytest.fixture(autouse=True)
+def data_home(tmp_path, monkeypatch):
+    _data_home = tmp_path / 'data'
+    _data_home.mkdir()
+    monkeypatch.setattr('dl_plus.config._data_home', _data_home)
+    return _data_home
+
+
+@pytest.fixture
+def config_home(tmp_path, monkeypatch):
+    _config_home = tmp_path / 'config'
+    _config_home.mkdir()
+    monkeypatch.setattr('dl_plus.config._config_home', _config_home)
+    return _config_home
+
+
+def write(path, content):
+    path.write_text(content)
+    # make the file old enough to be snapshotted
+    mtime = time.time() - 60
+    os.utime(path, (mtime, mtime))
+
+
+def test_save_load(data_home):
+    snapshot.save('foo', ('key', 1), {'foo': ['bar', None]})
+    assert snapshot.load('foo', ('key', 1)) == {'foo': ['bar', None]}
+    assert snapshot.load('foo', ('key', 2)) is None
+    assert snapshot.load('bar', ('key', 1)) is None
+
+
+def test_invalidate(data_home):
+    snapshot.save('foo', 'key', 'value')
+    snapshot.invalidate('foo')
+    assert snapshot.load('foo', 'key') is None
+
+
+def test_corrupted(data_home):
+    snapshot.save('foo', 'key', 'value')
+    snapshot.get_snapshot_dir().joinpath('foo.marshal').write_bytes(b'\xff')
+    assert snapshot.load('foo', 'key') is None
+
+
+def test_no_data_home(tmp_path, monkeypatch):
+    monkeypatch.setattr('dl_plus.config._data_home', tmp_path / 'missing')
+    snapshot.save('foo', 'key', 'value')
+    assert not (tmp_path / 'missing').exists()
+
+
+def test_racy_file_is_not_snapshotted(tmp_path):
+    path = tmp_path / 'file'
+    path.write_text('foo')
+    stamp = snapshot.get_file_stamp(path)
+    snapshot.save('foo', stamp, 'value', stamps=(stamp,))
+    assert snapshot.load('foo', stamp) is None
+
+
+def test_file_stamp(tmp_path):
+    path = tmp_path / 'file'
+    assert snapshot.get_file_stamp(path) is None
+    write(path, 'foo')
+    stamp = snapshot.get_file_stamp(path)
+    write(path, 'foobar')
+    assert snapshot.get_file_stamp(path) != stamp
+
+
+@pytest.fixture
+def known_backends(monkeypatch):
+    monkeypatch.setattr('dl_plus.backend._known_backends', None)
+
+
+def test_known_backends_snapshot(config_home, known_backends, monkeypatch):
+    write(config_home / 'backends.ini', (
+        '[foo]\nproject-name = foo\nimport-name = foo_\n'
+        'executable-name = foo-\nextras = bar baz\n'
+    ))
+    expected = backend.get_known_backends()
+    assert expected['foo'] == backend.Backend('foo', 'foo_', 'foo-', [
+        'bar', 'baz'])
+
+    def parse_backends_config(content):
+        raise AssertionError('must not be called')
+
+    monkeypatch.setattr(
+        'dl_plus.backend.parse_backends_config', parse_backends_config)
+    monkeypatch.setattr('dl_plus.backend._known_backends', None)
+    assert backend.get_known_backends() == expected
@@ -0,0 +1,71 @@
+import os
+import shutil
+
+import pytest
+
+from dl_plus import packagedir, store
+from dl_plus.httpclient import HTTPClient
+from dl_plus.pypi import BuiltinWheelInstaller, PyPIClient
+
+from tests.pypi.test_package_index import make_wheel
+
+
+@pytest.fixture(autouse=True)
+def data_home(tmp_path, monkeypatch):
+    monkeypatch.setattr('dl_plus.config._data_home', tmp_path / 'data')
+    return tmp_path / 'data'
+
+
+@pytest.fixture
+def index_dir(tmp_path):
+    _dir = tmp_path / 'wheels'
+    make_wheel(_dir, 'foo', '1.0', requires=['shared'])
+    make_wheel(_dir, 'bar', '1.0', requires=['shared'])
+    make_wheel(_dir, 'shared', '1.0', data=True)
+    return _dir
+
+
+@pytest.fixture
+def installer(index_dir):
+    with HTTPClient(timeout=5) as http_client:
+        client = PyPIClient(http_client, str(index_dir))
+        yield BuiltinWheelInstaller(client)
+
+
+def install(installer, data_home, name):
+    package_dir = data_home / 'backends' / name
+    installer.install(installer.client.fetch_wheel_info(name), package_dir)
+    return packagedir.get_active_dir(package_dir)
+
+
+def test_dependencies_are_shared(data_home, installer):
+    foo_dir = install(installer, data_home, 'foo')
+    bar_dir = install(installer, data_home, 'bar')
+    foo_file = foo_dir / 'shared' / '__init__.py'
+    bar_file = bar_dir / 'shared' / '__init__.py'
+    assert os.path.samefile(foo_file, bar_file)
+    entries = [
+        path.name for path in store.get_store_dir().iterdir()
+        if not path.name.startswith('.')
+    ]
+    assert sorted(entry.rpartition('-')[0] for entry in entries) == [
+        'bar-1.0', 'foo-1.0', 'shared-1.0']
+
+
+def test_collect_garbage(data_home, installer):
+    foo_dir = install(installer, data_home, 'foo')
+    bar_dir = install(installer, data_home, 'bar')
+    shutil.rmtree(foo_dir)
+    store.collect_garbage()
+    entries = sorted(
+        path.name.rpartition('-')[0]
+        for path in store.get_store_dir().iterdir()
+        if not path.name.startswith('.')
+    )
+    assert entries == ['bar-1.0', 'shared-1.0']
+    shutil.rmtree(bar_dir)
+    store.collect_garbage()
+    assert not [
+        path for path in store.get_store_dir().iterdir()
+        if not path.name.startswith('.')
+    ]
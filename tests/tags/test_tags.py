@@ -0,0 +1,24 @@
+import sys
+
+from dl_plus.tags import get_supported_tags, get_wheel_priority
+
+
+def test_pure_python_wheel_is_supported():
+    assert get_wheel_priority('py3', 'none', 'any') is not None
+    assert get_wheel_priority('py2.py3', 'none', 'any') is not None
+
+
+def test_unsupported_wheel():
+    assert get_wheel_priority('py2', 'none', 'any') is None
+    assert get_wheel_priority('cp27', 'cp27mu', 'linux_x86_64') is None
+
+
+def test_platform_wheel_is_preferred():
+    tags = get_supported_tags()
+    interpreter, abi, platform = tags[0]
+    assert interpreter == (
+        f'cp{sys.version_info.major}{sys.version_info.minor}'
+        if sys.implementation.name == 'cpython' else interpreter
+    )
+    assert get_wheel_priority(interpreter, abi, platform) < get_wheel_priority(
+        'py3', 'none', 'any')
@@ -0,0 +1,39 @@
+import pytest
+
+from dl_plus import usage
+
+
+@pytest.fixture(autouse=True)
+def data_home(tmp_path, monkeypatch):
+    monkeypatch.setattr('dl_plus.config._data_home', tmp_path)
+    monkeypatch.setattr('dl_plus.usage._used', set())
+    monkeypatch.setattr(
+        'dl_plus.ytdl.get_extractor_name', lambda extractor: extractor)
+
+
+def test_record_save(monkeypatch):
+    monkeypatch.setattr('time.time', lambda: 1000)
+    usage.record('foo')
+    usage.record('foo')
+    usage.record('bar')
+    usage.save()
+    usage.record('foo')
+    usage.save()
+    assert usage.load() == {
+        'foo': {'count': 2, 'last_used': 1000},
+        'bar': {'count': 1, 'last_used': 1000},
+    }
+
+
+def test_disabled(monkeypatch):
+    monkeypatch.setattr('dl_plus.usage._used', None)
+    usage.record('foo')
+    usage.save()
+    assert usage.load() == {}
+
+
+def test_clear():
+    usage.record('foo')
+    usage.save()
+    usage.clear()
+    assert usage.load() == {}
@@ -0,0 +1,44 @@
+import pytest
+
+from dl_plus.version import InvalidVersion, Version, parse_version
+
+
+def test_ordering():
+    versions = [
+        '1.0.dev0', '1.0a1', '1.0a2.dev1', '1.0b1', '1.0rc1', '1.0',
+        '1.0+local', '1.0.post1.dev0', '1.0.post1', '1.1', '2024.10.22',
+        '2025.1.2', '1!0.1',
+    ]
+    parsed = [Version(version) for version in versions]
+    assert sorted(reversed(parsed)) == parsed
+
+
+@pytest.mark.parametrize('version,expected', [
+    ('1.0', '1.0'),
+    ('v1.0', '1.0'),
+    ('1.0-ALPHA1', '1.0a1'),
+    ('1.0.c2', '1.0rc2'),
+    ('1.0-1', '1.0.post1'),
+    ('1.0dev', '1.0.dev0'),
+    ('1.0+Ubuntu-1', '1.0+ubuntu.1'),
+])
+def test_normalization(version, expected):
+    assert str(Version(version)) == expected
+
+
+def test_equality_ignores_trailing_zeros():
+    assert Version('1.0') == Version('1.0.0')
+    assert hash(Version('1.0')) == hash(Version('1.0.0'))
+
+
+@pytest.mark.parametrize('version,expected', [
+    ('1.0', False), ('1.0a1', True), ('1.0.dev1', True), ('1.0.post1', False),
+])
+def test_is_prerelease(version, expected):
+    assert Version(version).is_prerelease is expected
+
+
+def test_invalid():
+    with pytest.raises(InvalidVersion):
+        Version('not-a-version')
+    assert parse_version('not-a-version') is None
@@ -8,6 +8,7 @@ from tests.testlib import ExtractorMock as EM
 @pytest.fixture(autouse=True)
 def reset_cache():
     ytdl._extractors = ytdl._NOT_SET
+    ytdl._extractors_by_key = ytdl._NOT_SET
     ytdl._extractors_registry = ytdl._NOT_SET
 
 
@@ -118,3 +119,80 @@ def test_get_extractors_by_name(name, expected):
 def test_get_extractors_by_name_error_unknown(name):
     with pytest.raises(ytdl.UnknownBuiltinExtractor, match=name):
         ytdl.get_extractors_by_name(name)
+
+
+def indexed_extractors(*names):
+    extractors = []
+    for name in names:
+        extractor = EM(name)
+        extractor.ie_key = lambda key=name.replace(':', '_'): key
+        extractors.append(extractor)
+    return extractors
+
+
+def build_index(extractors):
+    return [
+        {'key': extractor.ie_key(), 'name': extractor.IE_NAME}
+        for extractor in extractors
+    ]
+
+
+@pytest.mark.parametrize('extractors', [
+    indexed_extractors('foo', 'foo:sub', 'bar'),
+])
+def test_get_extractors_by_name_from_index(extractors, monkeypatch):
+    monkeypatch.setattr(
+        'dl_plus.ytdl.load_extractor_index', lambda: build_index(extractors))
+    assert ytdl._build_extractors_registry() == {
+        'foo': {'_': 'foo', 'sub': 'foo_sub'},
+        'bar': 'bar',
+    }
+    assert ytdl.get_extractors_by_name('foo') == [EM('foo'), EM('foo:sub')]
+
+
+@pytest.mark.parametrize('extractors', [
+    indexed_extractors('foo', 'bar'),
+])
+def test_outdated_index(extractors, monkeypatch):
+    index = build_index(extractors)[:1]
+    monkeypatch.setattr('dl_plus.ytdl.load_extractor_index', lambda: index)
+    assert ytdl._build_extractors_registry() == {
+        'foo': EM('foo'),
+        'bar': EM('bar'),
+    }
+
+
+@pytest.mark.parametrize('name,expected', [
+    ('foo:*', [EM('foo:sub'), EM('foo:sub:subsub1'), EM('foo:sub:subsub2')]),
+    ('foo:sub:*2', [EM('foo:sub:subsub2')]),
+    ('*:sub', [EM('foo:sub'), EM('foo:sub:subsub1'), EM('foo:sub:subsub2')]),
+    ('*:sub?', [EM('bar:sub1'), EM('bar:sub2')]),
+    ('ba?', [EM('bar:sub1'), EM('bar:sub2'), EM('baz')]),
+    ('*:*:*', [EM('foo:sub:subsub1'), EM('foo:sub:subsub2')]),
+    ('baz:*', []),
+    ('qux*', []),
+])
+@extractors_marker
+def test_get_extractors_by_glob(name, expected):
+    assert ytdl.get_extractors_by_name(name) == expected
+
+
+@pytest.mark.parametrize('name', ['qux:*', 'foo:qux:*'])
+@extractors_marker
+def test_get_extractors_by_glob_error_unknown(name):
+    with pytest.raises(ytdl.UnknownBuiltinExtractor, match=name):
+        ytdl.get_extractors_by_name(name)
+
+
+@pytest.mark.parametrize('extractors', [
+    indexed_extractors('foo', 'foo:sub', 'bar'),
+])
+def test_get_extractor_keys_by_name(extractors, monkeypatch):
+    monkeypatch.setattr(
+        'dl_plus.ytdl.load_extractor_index', lambda: build_index(extractors))
+    monkeypatch.setattr(
+        'dl_plus.ytdl._resolve_extractor',
+        lambda extractor: pytest.fail('must not be resolved'),
+    )
+    assert ytdl.get_extractor_keys_by_name('foo') == ['foo', 'foo_sub']
+    assert ytdl.get_extractor_keys_by_name('*:sub') == ['foo_sub']
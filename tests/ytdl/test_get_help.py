@@ -0,0 +1,36 @@
+from types import SimpleNamespace
+
+import pytest
+
+from dl_plus import ytdl
+
+
+@pytest.fixture(autouse=True)
+def data_home(tmp_path, monkeypatch):
+    monkeypatch.setattr('dl_plus.config._data_home', tmp_path)
+
+
+@pytest.fixture
+def ytdl_module(monkeypatch):
+    calls = []
+
+    def main(args):
+        calls.append(args)
+        print('Usage: foo [OPTIONS]\n\nOptions:\n  --foo  Foo.')
+        raise SystemExit(0)
+
+    module = SimpleNamespace(main=main, __file__='/foo/__init__.py')
+    module.calls = calls
+    monkeypatch.setattr('dl_plus.ytdl._ytdl_module', module)
+    monkeypatch.setattr('dl_plus.ytdl._ytdl_module_name', 'foo')
+    monkeypatch.setattr('dl_plus.ytdl.get_ytdl_module_version', lambda: '1.0')
+    return module
+
+
+def test_get_help_cached(ytdl_module, monkeypatch):
+    assert ytdl.get_help() == '\n  --foo  Foo.\n'
+    assert ytdl.get_help() == '\n  --foo  Foo.\n'
+    assert ytdl_module.calls == [['--help']]
+    monkeypatch.setattr('dl_plus.ytdl.get_ytdl_module_version', lambda: '2.0')
+    ytdl.get_help()
+    assert len(ytdl_module.calls) == 2
@@ -0,0 +1,33 @@
+from types import SimpleNamespace
+
+import pytest
+
+from dl_plus import ytdl
+
+from tests.testlib import ExtractorMock as EM
+
+
+@pytest.fixture
+def modules(monkeypatch):
+    _modules = {
+        'extractor': SimpleNamespace(),
+        'YoutubeDL': SimpleNamespace(),
+    }
+    monkeypatch.setattr('dl_plus.ytdl.import_module', _modules.__getitem__)
+    return _modules
+
+
+def keyed(name):
+    extractor = EM(name)
+    extractor.ie_key = lambda: name.capitalize()
+    return extractor
+
+
+def test_patch_extractors(modules):
+    extractors = [keyed('foo'), keyed('bar')]
+    ytdl.patch_extractors(extractors)
+    for module in modules.values():
+        assert module.gen_extractor_classes() == extractors
+        assert module.get_info_extractor('Bar') == EM('bar')
+        with pytest.raises(KeyError):
+            module.get_info_extractor('Baz')